@@ -0,0 +1,87 @@
+"""
+Import-time breakdown for the serving entry points.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the total import time plus the self time spent per top-level
+package (pandas, flask, numpy, sklearn, src, ...), median over repeats.
+
+Usage:
+    python -m benchmarks.imports                       # default entry points
+    python -m benchmarks.imports src.app.asgi --top 5
+    python -m benchmarks.imports --json > imports.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+DEFAULT_MODULES = ["src.inference.predict", "src.app.app", "src.app.asgi"]
+
+
+def _importtime(module: str) -> Dict[str, float]:
+    """One fresh-interpreter run: {"total": ms, "<package>": self ms, ...}."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    per_package: Dict[str, float] = defaultdict(float)
+    total = 0.0
+    for line in out.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[12:].split("|"))
+        per_package[name.strip().split(".")[0]] += int(self_us) / 1000.0
+        if name.strip() == module:
+            total = int(cumulative_us) / 1000.0
+
+    return {"total": total, **per_package}
+
+
+def measure(module: str, repeats: int = 3) -> Dict[str, float]:
+    """Median import time of `module` (ms) and per-package self time."""
+    runs = [_importtime(module) for _ in range(repeats)]
+    keys = set().union(*runs)
+    return {k: float(np.median([r.get(k, 0.0) for r in runs])) for k in keys}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-package import time of entry points.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Packages to list per module")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args(argv)
+
+    results = {module: measure(module, args.repeats) for module in args.modules}
+
+    if args.json:
+        print(json.dumps(results, indent=4, sort_keys=True))
+        return 0
+
+    for module, times in results.items():
+        print(f"{module}: {times['total']:.1f} ms")
+        packages = sorted(
+            ((k, v) for k, v in times.items() if k != "total"), key=lambda kv: -kv[1]
+        )
+        for name, ms in packages[: args.top]:
+            print(f"    {name:<24} {ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""
+Load generator: replays prediction traffic against the app over HTTP.
+
+- payloads: a JSONL file (one request per line, either
+  {"endpoint": "/predict" | "/api/v1/predict", "payload": {...}} or a bare
+  payload object), a CSV of input rows, or synthetic rows (default): real
+  material compositions from data/oxidation.csv with process settings
+  drawn across the ranges in the data
+- endpoint mix: "/predict" form posts and "/api/v1/predict" JSON (--mix),
+  for payloads that do not name their endpoint
+- open loop (--rate R): Poisson arrivals at R requests/s served by up to
+  --concurrency connections. Latency is measured from the scheduled send
+  time, so a server that falls behind shows up as latency instead of
+  quietly lowering the offered load
+- closed loop (--rate 0): --concurrency clients send back to back
+- target: --url of a running app, or a local gunicorn started per
+  (--workers, --threads) combination, so one run sweeps a grid
+
+Reported per endpoint and overall: requests, throughput, error rate
+(status >= 400 or no response) and latency p50/p90/p99/max. The prediction
+cache is disabled on local servers (--cache keeps it) so repeated payloads
+measure real work.
+
+Usage:
+    python -m benchmarks.load --workers 1,2,4 --threads 1,4 --rate 200 --duration 20
+    python -m benchmarks.load --url http://127.0.0.1:8000 --concurrency 16 --duration 10
+    python -m benchmarks.load --payloads recorded.jsonl --mix form=0,json=1
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import http.client
+import itertools
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+
+from src.inference.validator import HARDNESS_FEATURES, OXIDATION_FEATURES
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(THIS_DIR, ".."))
+
+RESULTS_PATH = os.path.join(THIS_DIR, "results", "load.json")
+DATA_PATHS = (
+    os.path.join(PROJECT_ROOT, "data", "oxidation.csv"),
+    os.path.join(PROJECT_ROOT, "data", "hardness.csv"),
+)
+
+ENDPOINTS = {"form": "/predict", "json": "/api/v1/predict"}
+DEFAULT_MIX = "form=0.2,json=0.8"
+ALL_FEATURES = list(dict.fromkeys(OXIDATION_FEATURES + HARDNESS_FEATURES))
+
+# Process settings varied by synthetic payloads; composition comes from a real row
+VARIED_FEATURES = ("Current", "Heat_Input", "Soaking_Time")
+
+
+class Request(NamedTuple):
+    path: str
+    body: bytes
+    content_type: str
+
+
+class Sample(NamedTuple):
+    path: str
+    status: int  # 0 when no response arrived
+    latency_s: float
+
+
+# ---------------------------------------------------------
+# Payloads
+# ---------------------------------------------------------
+
+def _number(value: Any) -> Any:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def load_payloads(path: str) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    """(endpoint or None, payload) pairs from a .jsonl or .csv file."""
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return [
+                (None, {k: _number(v) for k, v in row.items() if k in ALL_FEATURES})
+                for row in csv.DictReader(f)
+            ]
+
+    entries = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "payload" in record:
+                entries.append((record.get("endpoint"), record["payload"]))
+            else:
+                entries.append((None, record))
+    return entries
+
+
+def synthetic_payloads(n: int, seed: int = 0) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+    """Real material compositions with process settings spread over the data ranges."""
+    rows = []
+    for path in DATA_PATHS:
+        with open(path, newline="") as f:
+            rows.extend(csv.DictReader(f))
+
+    ranges = {
+        name: (min(float(r[name]) for r in rows if r.get(name)), max(float(r[name]) for r in rows if r.get(name)))
+        for name in VARIED_FEATURES
+    }
+    bases = [r for r in rows if all(r.get(name) for name in ALL_FEATURES)]
+
+    rng = np.random.default_rng(seed)
+    payloads = []
+    for i in rng.integers(0, len(bases), size=n):
+        payload = {name: _number(bases[i][name]) for name in ALL_FEATURES}
+        for name, (low, high) in ranges.items():
+            payload[name] = round(float(rng.uniform(low, high)), 4)
+        payloads.append((None, payload))
+    return payloads
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """'form=0.2,json=0.8' -> endpoint path -> probability."""
+    weights = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint kind '{kind}' in mix; use {sorted(ENDPOINTS)}")
+        weights[ENDPOINTS[kind.strip()]] = float(weight)
+
+    total = sum(weights.values())
+    if total <= 0 or any(w < 0 for w in weights.values()):
+        raise ValueError(f"Mix weights must be non-negative with a positive sum: '{spec}'")
+    return {path: w / total for path, w in weights.items()}
+
+
+def build_requests(
+    payloads: List[Tuple[Optional[str], Dict[str, Any]]],
+    mix: Dict[str, float],
+    seed: int = 0,
+) -> List[Request]:
+    """Encode every payload once, up front, so the client does no work per send."""
+    rng = np.random.default_rng(seed)
+    paths, probabilities = list(mix), list(mix.values())
+
+    requests = []
+    for endpoint, payload in payloads:
+        path = endpoint or paths[rng.choice(len(paths), p=probabilities)]
+        if path == ENDPOINTS["form"]:
+            body = urlencode({k: "" if v is None else str(v) for k, v in payload.items()})
+            requests.append(Request(path, body.encode(), "application/x-www-form-urlencoded"))
+        else:
+            requests.append(Request(path, json.dumps(payload).encode(), "application/json"))
+    return requests
+
+
+# ---------------------------------------------------------
+# Client
+# ---------------------------------------------------------
+
+def _send(conn: http.client.HTTPConnection, request: Request) -> int:
+    conn.request("POST", request.path, request.body, {"Content-Type": request.content_type})
+    response = conn.getresponse()
+    response.read()
+    return response.status
+
+
+def run_load(
+    url: str,
+    requests: List[Request],
+    duration: float,
+    rate: float = 0.0,
+    concurrency: int = 8,
+    timeout: float = 10.0,
+    seed: int = 0,
+) -> List[Sample]:
+    """
+    Drive `url` for `duration` seconds and return one Sample per request.
+
+    rate > 0: open loop, Poisson arrivals; latency counts from the
+    scheduled send time, and arrivals still unsent `timeout` seconds after
+    their slot are recorded as errors. rate == 0: closed loop,
+    `concurrency` clients sending back to back.
+    """
+    target = urlsplit(url)
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    order = itertools.count()
+
+    arrivals: "queue.Queue[float]" = queue.Queue()
+    if rate > 0:
+        gaps = np.random.default_rng(seed).exponential(1.0 / rate, size=int(rate * duration * 1.5) + 16)
+        for t in np.cumsum(gaps):
+            if t >= duration:
+                break
+            arrivals.put(float(t))
+
+    start = time.perf_counter()
+
+    def client() -> None:
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=timeout)
+        local = []
+        while True:
+            if rate > 0:
+                try:
+                    scheduled = start + arrivals.get_nowait()
+                except queue.Empty:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+                if scheduled - start >= duration:
+                    break
+
+            request = requests[next(order) % len(requests)]
+            if time.perf_counter() - scheduled > timeout:
+                # Backlog older than the timeout: the server cannot keep up with
+                # the offered rate; count it as failed instead of sending it late
+                local.append(Sample(request.path, 0, time.perf_counter() - scheduled))
+                continue
+            try:
+                status = _send(conn, request)
+            except (OSError, http.client.HTTPException):
+                status = 0
+                conn.close()  # reconnects on the next request
+            local.append(Sample(request.path, status, time.perf_counter() - scheduled))
+
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples
+
+
+def summarize(samples: List[Sample], elapsed_s: float) -> Dict[str, Dict[str, float]]:
+    """Per-endpoint (and "all") throughput, error rate and latency percentiles."""
+    groups: Dict[str, List[Sample]] = {"all": samples}
+    for s in samples:
+        groups.setdefault(s.path, []).append(s)
+
+    report = {}
+    for name, group in groups.items():
+        if not group:
+            continue
+        latency_ms = np.array([s.latency_s for s in group]) * 1000.0
+        errors = sum(1 for s in group if s.status == 0 or s.status >= 400)
+        report[name] = {
+            "requests": len(group),
+            "errors": errors,
+            "error_rate": round(errors / len(group), 4),
+            "throughput_per_s": round(len(group) / elapsed_s, 2),
+            "mean_ms": round(float(latency_ms.mean()), 3),
+            "p50_ms": round(float(np.percentile(latency_ms, 50)), 3),
+            "p90_ms": round(float(np.percentile(latency_ms, 90)), 3),
+            "p99_ms": round(float(np.percentile(latency_ms, 99)), 3),
+            "max_ms": round(float(latency_ms.max()), 3),
+        }
+    return report
+
+
+# ---------------------------------------------------------
+# Local server
+# ---------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    target = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode} before becoming ready.")
+        try:
+            conn = http.client.HTTPConnection(target.hostname, target.port, timeout=1.0)
+            conn.request("GET", "/readyz")
+            if conn.getresponse().status == 200:
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} not ready after {timeout:.0f}s.")
+
+
+@contextmanager
+def local_server(workers: int, threads: int, cache: bool = False, ready_timeout: float = 60.0) -> Iterator[str]:
+    """Start gunicorn (repo gunicorn.conf.py) on a free port; yields its base URL."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, MODEL_WATCH_INTERVAL="0")
+    if not cache:
+        env["PREDICTION_CACHE_SIZE"] = "0"
+
+    cmd = [
+        sys.executable, "-m", "gunicorn",
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--bind", f"127.0.0.1:{port}",
+        "src.app.app:create_app()",
+    ]
+    with tempfile.TemporaryFile() as log:
+        process = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            _wait_ready(url, process, ready_timeout)
+            yield url
+        except RuntimeError:
+            log.seek(0)
+            print(log.read().decode(errors="replace")[-2000:])
+            raise
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+# ---------------------------------------------------------
+# Driver
+# ---------------------------------------------------------
+
+def measure(url: str, requests: List[Request], args: argparse.Namespace) -> Dict[str, Any]:
+    if args.warmup > 0:
+        run_load(url, requests, args.warmup, 0.0, args.concurrency, args.timeout)
+
+    start = time.perf_counter()
+    samples = run_load(url, requests, args.duration, args.rate, args.concurrency, args.timeout, args.seed)
+    elapsed = time.perf_counter() - start
+    return {
+        "offered_per_s": args.rate or None,
+        "elapsed_s": round(elapsed, 3),
+        "endpoints": summarize(samples, elapsed),
+    }
+
+
+def _print_table(runs: List[Dict[str, Any]]) -> None:
+    print(f"{'config':<14}{'endpoint':<18}{'requests':>9}{'req/s':>10}{'errors':>8}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for run in runs:
+        for endpoint, s in run["endpoints"].items():
+            print(f"{run['config']:<14}{endpoint:<18}{s['requests']:>9}{s['throughput_per_s']:>10.1f}"
+                  f"{s['error_rate']:>8.1%}{s['p50_ms']:>10.2f}{s['p90_ms']:>10.2f}{s['p99_ms']:>10.2f}")
+
+
+def _int_list(spec: str) -> List[int]:
+    return [int(v) for v in spec.split(",") if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay prediction traffic against the app.")
+    parser.add_argument("--url", default=None, help="Running app to target (default: start gunicorn locally)")
+    parser.add_argument("--workers", default="1", help="Comma-separated gunicorn worker counts to sweep")
+    parser.add_argument("--threads", default="1", help="Comma-separated gunicorn thread counts to sweep")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of measured load per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured closed-loop load first")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Open-loop arrivals per second (0: closed loop)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client connections")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Endpoint mix, e.g. form=0.2,json=0.8")
+    parser.add_argument("--payloads", default=None, help="JSONL or CSV payloads to replay (default: synthetic)")
+    parser.add_argument("--synthetic", type=int, default=1000, help="Synthetic payloads to generate")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout (s)")
+    parser.add_argument("--cache", action="store_true", help="Keep the prediction cache on local servers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    args = parser.parse_args(argv)
+
+    try:
+        payloads = load_payloads(args.payloads) if args.payloads else synthetic_payloads(args.synthetic, args.seed)
+        requests = build_requests(payloads, parse_mix(args.mix), args.seed)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if not requests:
+        print("[ERROR] No payloads to replay.")
+        return 1
+
+    settings = {
+        k: getattr(args, k)
+        for k in ("duration", "warmup", "rate", "concurrency", "mix", "payloads", "cache", "seed")
+    }
+    runs = []
+    try:
+        if args.url:
+            runs.append({"config": "external", "url": args.url, **measure(args.url, requests, args)})
+        else:
+            for workers, threads in itertools.product(_int_list(args.workers), _int_list(args.threads)):
+                print(f"[INFO] gunicorn workers={workers} threads={threads}")
+                with local_server(workers, threads, cache=args.cache) as url:
+                    runs.append({
+                        "config": f"w{workers}/t{threads}",
+                        "workers": workers,
+                        "threads": threads,
+                        **measure(url, requests, args),
+                    })
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    _print_table(runs)
+    report = {
+        "meta": {"timestamp": time.strftime("%Y-%m-%d %H:%M:%S"), "cpu_count": os.cpu_count(), **settings},
+        "runs": runs,
+    }
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"[INFO] Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
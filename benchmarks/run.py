@@ -0,0 +1,366 @@
+"""
+Benchmark suite for the inference and serving hot paths.
+
+Measures:
+- cold start: import of src.inference.predict + first _ensure_models_loaded
+  (fresh interpreter per sample), and import of the Flask app
+  (per-package breakdown: python -m benchmarks.imports)
+- single-row latency distribution per model and backend through _predict
+- batch throughput per model and backend at several batch sizes
+- Flask test-client round trip for /predict and /api/v1/predict
+
+Results are written as flat JSON ({"meta": ..., "results": {name: value}})
+and compared against a stored baseline. Metric names ending in `_ms` are
+lower-is-better, names ending in `_per_s` higher-is-better. Tail latencies
+(mean/p90/p99) are reported but not gated: they are too noisy on shared
+machines, so regressions are judged on medians and throughput.
+
+Independently of the baseline, the numpy and compiled backends must not be
+slower than the sklearn pipeline on the same model and batch size: they
+exist to beat it, and a fast path that loses at some batch size is a bug
+even on a machine with no baseline.
+
+Usage:
+    python -m benchmarks.run                      # run, compare, exit 1 on regression
+                                                  # or on a backend slower than sklearn
+    python -m benchmarks.run --quick              # fewer iterations (CI smoke)
+    python -m benchmarks.run --update-baseline    # store this run as the new baseline
+
+The prediction cache is disabled so repeated payloads measure real work.
+Baselines are machine-specific: the comparison is skipped when the
+baseline's machine, CPU count or Python/NumPy/scikit-learn versions differ
+from this run's. Regenerate it on the machine that checks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from benchmarks.imports import measure as measure_imports
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(THIS_DIR, ".."))
+
+BASELINE_PATH = os.path.join(THIS_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(THIS_DIR, "results", "latest.json")
+
+DEFAULT_THRESHOLD = 0.3
+# Reported only, never flagged as regressions
+UNGATED_SUFFIXES = (".mean_ms", ".p90_ms", ".p99_ms")
+# Baseline meta that must match this run for the comparison to mean anything
+MACHINE_KEYS = ("machine", "cpu_count", "python", "numpy", "sklearn")
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+SAMPLE_ROW = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+
+# ---------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------
+
+def _timings_ms(fn: Callable[[], Any], iterations: int, warmup: int = 5) -> np.ndarray:
+    for _ in range(warmup):
+        fn()
+    times = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    return times * 1000.0
+
+
+def _distribution(prefix: str, times_ms: np.ndarray) -> Dict[str, float]:
+    return {
+        f"{prefix}.mean_ms": float(times_ms.mean()),
+        f"{prefix}.p50_ms": float(np.percentile(times_ms, 50)),
+        f"{prefix}.p90_ms": float(np.percentile(times_ms, 90)),
+        f"{prefix}.p99_ms": float(np.percentile(times_ms, 99)),
+    }
+
+
+def _rows(n: int) -> List[Dict[str, Any]]:
+    """Deterministic, varied payloads around the sample row."""
+    rng = np.random.default_rng(0)
+    materials = ["EN-8", "Mild Steel"]
+    return [
+        dict(
+            SAMPLE_ROW,
+            Material=materials[i % 2],
+            Current=float(rng.uniform(100, 180)),
+            Heat_Input=float(rng.uniform(0.5, 1.2)),
+            Soaking_Time=float(rng.uniform(5, 20)),
+        )
+        for i in range(n)
+    ]
+
+
+# ---------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------
+
+_COLD_START_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+from src.inference import predict
+t1 = time.perf_counter()
+predict._ensure_models_loaded()
+t2 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "load_ms": (t2 - t1) * 1000}))
+"""
+
+
+def bench_cold_start(samples: int) -> Dict[str, float]:
+    runs = []
+    for _ in range(samples):
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SNIPPET],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    import_ms = np.median([r["import_ms"] for r in runs])
+    load_ms = np.median([r["load_ms"] for r in runs])
+    return {
+        "cold_start.import_ms": float(import_ms),
+        "cold_start.first_load_ms": float(load_ms),
+        "cold_start.total_ms": float(import_ms + load_ms),
+        "cold_start.import_app_ms": measure_imports("src.app.app", samples)["total"],
+    }
+
+
+def bench_single_row(iterations: int) -> Dict[str, float]:
+    from src.inference import predict
+
+    models = {
+        "hardness": (predict.validate_hardness_input, predict.HARDNESS_FEATURES),
+        "oxidation": (predict.validate_oxidation_input, predict.OXIDATION_FEATURES),
+    }
+    results = {}
+    for backend in predict.BACKENDS:
+        for name, (validator_fn, features) in models.items():
+            model, error, _ = predict.get_model(name, backend)
+            if model is None:
+                print(f"[WARN] Skipping {name}/{backend}: {error}")
+                continue
+            times = _timings_ms(
+                lambda m=model, v=validator_fn, f=features: predict._predict(m, v, f, SAMPLE_ROW),
+                iterations,
+            )
+            results.update(_distribution(f"latency.{name}.{backend}", times))
+    return results
+
+
+def bench_batch(batch_sizes, budget_s: float) -> Dict[str, float]:
+    from src.inference import predict
+
+    batch_fns = {
+        "hardness": predict.predict_hardness_batch,
+        "oxidation": predict.predict_oxidation_batch,
+    }
+    results = {}
+    for backend in predict.BACKENDS:
+        for name, fn in batch_fns.items():
+            for size in batch_sizes:
+                rows = _rows(size)
+                fn(rows, backend)  # warm-up
+
+                # Repeat until the time budget is used (at least 3 runs)
+                runs, start = 0, time.perf_counter()
+                while runs < 3 or time.perf_counter() - start < budget_s:
+                    fn(rows, backend)
+                    runs += 1
+                elapsed = time.perf_counter() - start
+                results[f"throughput.{name}.{backend}.{size}.rows_per_s"] = size * runs / elapsed
+    return results
+
+
+def bench_flask(iterations: int) -> Dict[str, float]:
+    from src.app.app import create_app
+
+    client = create_app().test_client()
+    form = {k: str(v) for k, v in SAMPLE_ROW.items()}
+    body = json.dumps(SAMPLE_ROW)
+
+    results = {}
+    results.update(_distribution(
+        "flask.predict_form",
+        _timings_ms(lambda: client.post("/predict", data=form), iterations),
+    ))
+    results.update(_distribution(
+        "flask.api_v1_predict",
+        _timings_ms(
+            lambda: client.post("/api/v1/predict", data=body, content_type="application/json"),
+            iterations,
+        ),
+    ))
+    return results
+
+
+def run_suite(quick: bool = False) -> Dict[str, Any]:
+    """Run every benchmark; returns {"meta": ..., "results": {...}}."""
+    import sklearn
+    from src.inference import predict
+
+    # Repeated payloads must measure real work, not cache hits
+    predict._cache = None
+
+    iterations = 50 if quick else 300
+    results: Dict[str, float] = {}
+
+    results.update(bench_cold_start(samples=1 if quick else 5))
+    results.update(bench_single_row(iterations))
+    results.update(bench_batch(BATCH_SIZES[:4] if quick else BATCH_SIZES, 0.1 if quick else 1.0))
+    results.update(bench_flask(iterations // 2))
+
+    meta = {
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "quick": quick,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+    }
+    return {"meta": meta, "results": {k: round(v, 4) for k, v in sorted(results.items())}}
+
+
+# ---------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------
+
+def compare(
+    current: Dict[str, float],
+    baseline: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Metrics that got worse than the baseline by more than `threshold`
+    (relative). Metrics missing on either side are ignored.
+    """
+    regressions = []
+    for name in sorted(set(current) & set(baseline)):
+        if name.endswith(UNGATED_SUFFIXES):
+            continue
+        base, value = baseline[name], current[name]
+        if base <= 0:
+            continue
+
+        if name.endswith("_per_s"):
+            change = (base - value) / base
+        elif name.endswith("_ms"):
+            change = (value - base) / base
+        else:
+            continue
+
+        if change > threshold:
+            regressions.append(
+                {"name": name, "baseline": base, "current": value, "worse_by": round(change, 4)}
+            )
+    return regressions
+
+
+def slower_than_sklearn(
+    results: Dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Batch throughputs (`throughput.{model}.{backend}.{size}.rows_per_s`) of a
+    non-sklearn backend that trail sklearn's on the same model and size by
+    more than `threshold` (relative).
+    """
+    slower = []
+    for name in sorted(results):
+        parts = name.split(".")
+        if len(parts) != 5 or parts[0] != "throughput" or parts[2] == "sklearn":
+            continue
+        reference = ".".join(parts[:2] + ["sklearn"] + parts[3:])
+        if results.get(reference, 0) <= 0:
+            continue
+
+        base, value = results[reference], results[name]
+        change = (base - value) / base
+        if change > threshold:
+            slower.append(
+                {"name": name, "sklearn": base, "current": value, "worse_by": round(change, 4)}
+            )
+    return slower
+
+
+def machine_mismatch(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """MACHINE_KEYS on which the baseline's meta differs from this run's."""
+    return [k for k in MACHINE_KEYS if current.get(k) != baseline.get(k)]
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inference/serving benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations (smoke run)")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression (default 0.3)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = run_suite(quick=args.quick)
+
+    if args.update_baseline:
+        _write_json(args.baseline, report)
+        print(f"[INFO] Baseline written to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatch = machine_mismatch(report["meta"], baseline["meta"])
+        if mismatch:
+            print(f"[WARN] Baseline was recorded on another machine ({', '.join(mismatch)} differ); "
+                  f"skipping the comparison. Run with --update-baseline here to gate on it")
+            report["regressions"] = []
+        else:
+            report["regressions"] = compare(report["results"], baseline["results"], args.threshold)
+    else:
+        print(f"[WARN] No baseline at {args.baseline}; run with --update-baseline to create one")
+        report["regressions"] = []
+
+    report["slower_than_sklearn"] = slower_than_sklearn(report["results"], args.threshold)
+
+    _write_json(args.output, report)
+    print(f"[INFO] {len(report['results'])} metrics written to {args.output}")
+
+    for r in report["regressions"]:
+        print(f"[WARN] Regression: {r['name']} {r['baseline']} → {r['current']} "
+              f"(+{r['worse_by']:.0%})")
+    for r in report["slower_than_sklearn"]:
+        print(f"[WARN] Slower than sklearn: {r['name']} {r['current']} vs {r['sklearn']} "
+              f"(-{r['worse_by']:.0%})")
+    return 1 if report["regressions"] or report["slower_than_sklearn"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
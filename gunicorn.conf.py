@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration (picked up automatically from the working directory).
+
+The app and its models are loaded once in the master process, then
+workers are forked from it. Compiled forest arrays are memory-mapped,
+so resident memory stays flat as workers are added.
+"""
+
+import glob
+import os
+import tempfile
+
+preload_app = True
+
+
+def on_starting(server):
+    from src.inference import metrics
+
+    # Shared directory for per-worker metrics snapshots; stale files from a
+    # previous run would inflate the counters, so start clean
+    if metrics.ENABLED:
+        metrics_dir = os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="metrics-"))
+        for path in glob.glob(os.path.join(metrics_dir, "metrics-*.json")):
+            os.remove(path)
+
+    # Load models before forking; the backend follows INFERENCE_BACKEND
+    if os.environ.get("PRELOAD_MODELS", "1") == "1":
+        from src.inference.predict import preload_models
+
+        preload_models()
+
+    # Workers reset their inherited metrics; the master reports its own loads
+    metrics.flush()
+
+
+def post_fork(server, worker):
+    # Threads do not survive fork: start the artifact watcher in each worker
+    from src.inference.predict import warm_up
+    from src.inference.watcher import start_model_watcher
+
+    # No-op when the master preloaded; with PRELOAD_MODELS=0 workers boot
+    # immediately and load in the background (MODEL_WARMUP)
+    warm_up()
+    start_model_watcher()
@@ -2,8 +2,11 @@
 app.py — Flask application factory.
 """
 
-from flask import Flask
+import time
+
+from flask import Flask, g, request
 from src.app.routes import app_bp
+from src.inference import metrics
 
 
 def create_app():
@@ -15,10 +18,38 @@ def create_app():
     # Config
     app.config["TEMPLATES_AUTO_RELOAD"] = True
 
+    # Request counters + latency histogram per route (skipped entirely when disabled)
+    if metrics.ENABLED:
+        @app.before_request
+        def _start_timer():
+            g.request_start = time.perf_counter()
+
+        @app.after_request
+        def _record_request(response):
+            # Route pattern, not the raw path, to keep label cardinality bounded
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            start = g.get("request_start")
+            if start is not None:
+                metrics.observe(
+                    "http_request_duration_seconds", time.perf_counter() - start, endpoint=endpoint
+                )
+            metrics.inc(
+                "http_requests_total",
+                endpoint=endpoint,
+                method=request.method,
+                status=response.status_code,
+            )
+            return response
+
     return app
 
 
 # For local development
 if __name__ == "__main__":
+    from src.inference.predict import warm_up
+    from src.inference.watcher import start_model_watcher
+
+    warm_up()
+    start_model_watcher()
     app = create_app()
     app.run(host="0.0.0.0", port=5001, debug=True)
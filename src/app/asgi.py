@@ -0,0 +1,137 @@
+"""
+asgi.py — ASGI serving mode with request micro-batching.
+
+`POST /api/v1/predict` is handled natively: concurrent single-row requests
+are collected by a MicroBatcher and scored by predict_all_many, which gives
+the same answers, errors and cache behaviour as the Flask route but runs
+one vectorized predict per model for the cache misses. Every other route, and requests that turn on ?uncertainty or ?explain, are
+served by the regular Flask app through asgiref's WSGI adapter.
+
+Run with:
+    uvicorn src.app.asgi:app --workers 2
+or under gunicorn:
+    gunicorn src.app.asgi:app -k uvicorn.workers.UvicornWorker
+
+Batch window and size: MICROBATCH_WINDOW_MS / MICROBATCH_MAX_SIZE.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Optional
+from urllib.parse import parse_qs
+
+from src.app.app import create_app
+from src.app.routes import normalize_payload, parse_explain, parse_uncertainty
+from src.inference import metrics
+from src.inference.batching import MicroBatcher
+from src.inference.predict import flatten_result, predict_all_many, warm_up
+
+
+def _json_response(body, status: int = 200):
+    data = json.dumps(body).encode("utf-8")
+    start = {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(data)).encode("ascii")),
+        ],
+    }
+    return start, {"type": "http.response.body", "body": data}
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            return b"".join(chunks)
+
+
+def _score(payloads):
+    # Same validation, errors and cache as the Flask route's predict_all
+    return [flatten_result(r) for r in predict_all_many(payloads)]
+
+
+def _plain_predict(query_string: bytes) -> bool:
+    """
+    True when the query asks for neither intervals nor attributions, by the
+    same rules as the Flask route (`?explain=false` stays batched). Invalid
+    values go to Flask too, which answers them with a 400.
+    """
+    query = parse_qs(query_string.decode("latin-1"), keep_blank_values=True)
+    try:
+        level = parse_uncertainty(query.get("uncertainty", [None])[0])
+        explain = parse_explain(query.get("explain", [None])[0])
+    except ValueError:
+        return False
+    return level is None and not explain
+
+
+def create_asgi_app(max_batch_size: Optional[int] = None, window_ms: Optional[float] = None):
+    """Build the ASGI callable; the Flask fallback is created on first use."""
+    batcher = MicroBatcher(_score, max_batch_size=max_batch_size, window_ms=window_ms)
+    fallback = None
+
+    async def app(scope, receive, send):
+        nonlocal fallback
+
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    # "blocking" delays startup until loaded; "background" returns at once
+                    await asyncio.get_running_loop().run_in_executor(None, warm_up)
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/api/v1/predict"
+            and scope["method"] == "POST"
+            and _plain_predict(scope.get("query_string", b""))
+        ):
+            started = time.perf_counter() if metrics.ENABLED else None
+            try:
+                payload = json.loads(await _read_body(receive))
+            except ValueError:
+                start, body = _json_response({"error": "Invalid JSON"}, 400)
+            else:
+                normalize_payload(payload)
+                start, body = _json_response(await batcher.submit(payload))
+
+            # Same series the Flask hooks in app.py record for every other route
+            if started is not None:
+                metrics.observe(
+                    "http_request_duration_seconds",
+                    time.perf_counter() - started,
+                    endpoint="/api/v1/predict",
+                )
+                metrics.inc(
+                    "http_requests_total",
+                    endpoint="/api/v1/predict",
+                    method="POST",
+                    status=start["status"],
+                )
+
+            await send(start)
+            await send(body)
+            return
+
+        if fallback is None:
+            from asgiref.wsgi import WsgiToAsgi  # only needed for non-batched routes
+
+            fallback = WsgiToAsgi(create_app())
+        await fallback(scope, receive, send)
+
+    app.batcher = batcher
+    return app
+
+
+app = create_asgi_app()
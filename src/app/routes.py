@@ -1,10 +1,21 @@
 # src/app/routes.py
 
-from flask import Blueprint, render_template, request, jsonify
-from src.inference.predict import predict_hardness, predict_oxidation
+from typing import Optional
+
+from flask import Blueprint, Response, render_template, request, jsonify, stream_with_context
+from src.inference.predict import flatten_result, predict_all, predict_all_batch, readiness
+from src.inference.streaming import iter_text_lines, stream_csv, stream_ndjson
+from src.inference.optimize import optimize, parse_problem
+from src.inference.sweep import SweepTooLarge, parse_sweep, run_sweep, stream_sweep
+from src.inference.uncertainty import DEFAULT_LEVEL
+from src.inference.validator import ValidationError
+from src.inference import metrics
 
 app_bp = Blueprint("app_bp", __name__)
 
+# Upper bound on rows accepted by the batch endpoint
+MAX_BATCH_ROWS = 10_000
+
 
 @app_bp.route("/", methods=["GET"])
 def index():
@@ -29,16 +40,8 @@ def predict():
     carbon = _convert(request.form.get("Carbon"))
     manganese = _convert(request.form.get("Manganese"))
 
-    # Build payloads
-    hardness_payload = {
-        "Material": material,
-        "Current": current,
-        "Heat_Input": heat_input,
-        "Carbon": carbon,
-        "Manganese": manganese,
-    }
-
-    oxidation_payload = {
+    # Build payload (union of both models' fields)
+    payload = {
         "Material": material,
         "Current": current,
         "Heat_Input": heat_input,
@@ -47,19 +50,59 @@ def predict():
         "Manganese": manganese,
     }
 
-    # Get predictions
-    hardness_result = predict_hardness(hardness_payload)
-    oxidation_result = predict_oxidation(oxidation_payload)
-
-    return render_template(
-        "index.html",
-        hardness=hardness_result.get("prediction"),
-        oxidation=oxidation_result.get("prediction"),
-        hardness_error=hardness_result.get("error"),
-        oxidation_error=oxidation_result.get("error"),
-        selected_material=material,
-        form_data=request.form,
-    )
+    # Get predictions (validated once, models run concurrently)
+    results = predict_all(payload)
+    hardness_result = results["hardness"]
+    oxidation_result = results["oxidation"]
+
+    with metrics.stage("render", "all"):
+        return render_template(
+            "index.html",
+            hardness=hardness_result.get("prediction"),
+            oxidation=oxidation_result.get("prediction"),
+            hardness_error=hardness_result.get("error"),
+            oxidation_error=oxidation_result.get("error"),
+            selected_material=material,
+            form_data=request.form,
+        )
+
+
+def parse_uncertainty(raw: Optional[str]) -> Optional[float]:
+    """?uncertainty=<level in (0, 1)> (bare ?uncertainty means DEFAULT_LEVEL); None when absent."""
+    if raw is None:
+        return None
+    if raw in ("", "true"):
+        return DEFAULT_LEVEL
+    try:
+        level = float(raw)
+    except ValueError:
+        level = float("nan")
+    if not 0.0 < level < 1.0:
+        raise ValueError(f"'uncertainty' must be an interval level in (0, 1), got '{raw}'")
+    return level
+
+
+def parse_explain(raw: Optional[str]) -> bool:
+    """?explain (bare, "true" or "1") turns on per-row SHAP attributions."""
+    if raw is None:
+        return False
+    if raw in ("", "true", "1"):
+        return True
+    if raw in ("false", "0"):
+        return False
+    raise ValueError(f"'explain' must be true or false, got '{raw}'")
+
+
+def normalize_payload(payload) -> None:
+    """Convert numeric fields of a JSON payload in place (non-objects are left as is)."""
+    if not isinstance(payload, dict):
+        return  # the inference layer reports "Payload must be a JSON object."
+    for key in ["Current", "Heat_Input", "Soaking_Time", "Carbon", "Manganese"]:
+        if key in payload:
+            try:
+                payload[key] = float(payload[key])
+            except Exception:
+                pass  # Ignore; inference layer will validate
 
 
 # JSON API for async UI
@@ -70,20 +113,140 @@ def api_predict():
     except Exception:
         return jsonify({"error": "Invalid JSON"}), 400
 
-    # Convert numeric fields here also
-    for key in ["Current", "Heat_Input", "Soaking_Time", "Carbon", "Manganese"]:
-        if key in payload:
-            try:
-                payload[key] = float(payload[key])
-            except Exception:
-                pass  # Ignore; inference layer will validate
+    try:
+        level = parse_uncertainty(request.args.get("uncertainty"))
+        explain = parse_explain(request.args.get("explain"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    normalize_payload(payload)
+
+    if level is not None or explain:
+        # Intervals and attributions come from the batch path
+        result = predict_all_batch([payload], level=level, explain=explain)[0]
+        return jsonify(flatten_result(result)), 200
+    return jsonify(flatten_result(predict_all(payload))), 200
+
+
+# Batch JSON API: one validation pass and one model.predict per model
+@app_bp.route("/api/v1/predict/batch", methods=["POST"])
+def api_predict_batch():
+    try:
+        payload = request.get_json(force=True)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    # Accept either a bare list of rows or {"rows": [...]}
+    rows = payload.get("rows") if isinstance(payload, dict) else payload
+    if not isinstance(rows, list):
+        return jsonify({"error": "Expected a list of rows or {\"rows\": [...]}"}), 400
+
+    if len(rows) > MAX_BATCH_ROWS:
+        return jsonify({"error": f"Batch too large: {len(rows)} rows (max {MAX_BATCH_ROWS})"}), 413
+
+    try:
+        level = parse_uncertainty(request.args.get("uncertainty"))
+        explain = parse_explain(request.args.get("explain"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    results = [flatten_result(r) for r in predict_all_batch(rows, level=level, explain=explain)]
+
+    return jsonify({"count": len(results), "results": results}), 200
+
+
+# Streaming bulk API: rows are read, scored and written back chunk by chunk,
+# so request size is not bounded by memory (no MAX_BATCH_ROWS limit here)
+@app_bp.route("/api/v1/predict/stream", methods=["POST"])
+def api_predict_stream():
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "csv" if request.mimetype == "text/csv" else "ndjson"
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": f"Unknown format '{fmt}'. Use 'csv' or 'ndjson'."}), 400
+
+    lines = iter_text_lines(request.stream)
+    if fmt == "csv":
+        return Response(stream_with_context(stream_csv(lines)), mimetype="text/csv")
+    return Response(stream_with_context(stream_ndjson(lines)), mimetype="application/x-ndjson")
+
+
+# Parameter sweep: score a grid of settings in one call, dense arrays for
+# contour plots (downsampled above SWEEP_MAX_POINTS / "max_points")
+@app_bp.route("/api/v1/sweep", methods=["POST"])
+def api_sweep():
+    try:
+        payload = request.get_json(force=True)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    try:
+        spec = parse_sweep(payload)
+        max_points = payload.get("max_points")
+        if max_points is not None and (type(max_points) is not int or max_points < 1):
+            raise ValidationError("'max_points' must be a positive integer.")
+    except SweepTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify(run_sweep(spec, max_points)), 200
+
+
+# Full-resolution sweep streamed as NDJSON, one line per grid point
+@app_bp.route("/api/v1/sweep/stream", methods=["POST"])
+def api_sweep_stream():
+    try:
+        payload = request.get_json(force=True)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    try:
+        spec = parse_sweep(payload)
+    except SweepTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(stream_with_context(stream_sweep(spec)), mimetype="application/x-ndjson")
+
+
+# Inverse design: search the free inputs for settings that meet property
+# constraints, scoring a whole candidate population per model call
+@app_bp.route("/api/v1/optimize", methods=["POST"])
+def api_optimize():
+    try:
+        payload = request.get_json(force=True)
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+
+    try:
+        problem = parse_problem(payload)
+    except ValidationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = optimize(problem)
+    if not result["ok"]:
+        return jsonify({"error": result["error"]}), 503
+    return jsonify(result), 200
+
+
+# Prometheus text exposition (summed across gunicorn workers via METRICS_DIR)
+@app_bp.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    if not metrics.ENABLED:
+        return jsonify({"error": "Metrics are disabled (METRICS_ENABLED=0)"}), 404
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+# Liveness: the process is up (no model access)
+@app_bp.route("/healthz", methods=["GET"])
+def healthz():
+    return jsonify({"status": "ok"}), 200
 
-    hardness_result = predict_hardness(payload)
-    oxidation_result = predict_oxidation(payload)
 
-    return jsonify({
-        "hardness": hardness_result.get("prediction"),
-        "oxidation": oxidation_result.get("prediction"),
-        "hardness_error": hardness_result.get("error"),
-        "oxidation_error": oxidation_result.get("error"),
-    }), 200
+# Readiness: models for the configured backend are loaded (503 while warming up)
+@app_bp.route("/readyz", methods=["GET"])
+def readyz():
+    report = readiness()
+    return jsonify(report), 200 if report["ready"] else 503
@@ -0,0 +1,143 @@
+"""
+Binary artifact storage for compiled models.
+
+A binary model file holds a JSON header and the arrays, each starting on
+a 64-byte boundary, so it can be memory-mapped: every gunicorn worker on a
+host maps the same page-cache copy instead of holding its own.
+
+      offset 0   magic b"MHOMODEL"
+      offset 8   uint32 LE  container version
+      offset 12  uint32 LE  header length H
+      offset 16  header: UTF-8 JSON {"kind", "meta", "arrays": [
+                 {"name", "dtype", "shape", "offset"}, ...]}
+      then       array data (little-endian, C order), zero padded
+
+Loading maps the file once and returns views into it, so it costs a
+header parse regardless of model size.
+
+Every artifact file is written to a temporary sibling and renamed into
+place, so readers see the old or the new version, never a torn one.
+Replaced files are unlinked, not overwritten, so workers that still map
+the old arrays keep reading valid data.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+import numpy as np
+
+BINARY_MAGIC = b"MHOMODEL"
+BINARY_VERSION = 1
+BINARY_ALIGN = 64
+_PREFIX = struct.Struct("<8sII")
+
+
+def artifact_version(path: str) -> str:
+    """Cheap version key for an artifact file: mtime + size."""
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}-{st.st_size}"
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Yield a temporary sibling of `path` to write a file into, then fsync it
+    and rename it over `path`. On error the temporary is removed and `path`
+    is left untouched.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = os.path.join(parent, f".{os.path.basename(path)}.tmp-{uuid.uuid4().hex[:12]}")
+    try:
+        yield tmp
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# ---------------------------------------------------------
+# Single-file binary container
+# ---------------------------------------------------------
+
+def _aligned(n: int) -> int:
+    return -(-n // BINARY_ALIGN) * BINARY_ALIGN
+
+
+def save_binary(path: str, kind: str, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    """Write a binary model file (layout in the module docstring), atomically."""
+    arrays = {
+        name: np.ascontiguousarray(a, dtype=np.asarray(a).dtype.newbyteorder("<"))
+        for name, a in arrays.items()
+    }
+    if any(a.dtype.hasobject for a in arrays.values()):
+        raise TypeError("Object arrays cannot be stored in a binary model file.")
+
+    # Array offsets depend on the header length, which depends on the offsets'
+    # digits; lay out with a guess and redo until the header fits
+    data_start = _aligned(_PREFIX.size + 256 * (len(arrays) + 1))
+    while True:
+        table, offset = [], data_start
+        for name, a in arrays.items():
+            table.append({"name": name, "dtype": a.dtype.str, "shape": list(a.shape), "offset": offset})
+            offset = _aligned(offset + a.nbytes)
+        header = json.dumps({"kind": kind, "meta": meta, "arrays": table}).encode("utf-8")
+        if _PREFIX.size + len(header) <= data_start:
+            break
+        data_start = _aligned(_PREFIX.size + len(header))
+
+    with atomic_path(path) as tmp, open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(BINARY_MAGIC, BINARY_VERSION, len(header)))
+        f.write(header)
+        for entry, a in zip(table, arrays.values()):
+            f.write(b"\0" * (entry["offset"] - f.tell()))
+            f.write(a.tobytes())
+        f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+
+
+def load_binary(path: str, mmap: bool = True) -> Tuple[str, Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Read a binary model file: (kind, meta, arrays). With mmap=True the
+    arrays are read-only views of the mapped file.
+
+    Raises:
+        ValueError: If the file is not a binary model file, has an
+            unsupported container version, or is truncated.
+    """
+    if mmap:
+        buf = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.empty(0, np.uint8)
+    else:
+        buf = np.fromfile(path, dtype=np.uint8)
+    # np.asarray drops the np.memmap subclass (no copy) to keep ops fast
+    buf = np.asarray(buf)
+
+    if buf.size < _PREFIX.size:
+        raise ValueError(f"Not a binary model file (too short): {path}")
+    magic, version, header_len = _PREFIX.unpack(buf[:_PREFIX.size].tobytes())
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Not a binary model file (bad magic {magic!r}): {path}")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary model file version {version}: {path}")
+    if _PREFIX.size + header_len > buf.size:
+        raise ValueError(f"Truncated binary model file: {path}")
+
+    header = json.loads(buf[_PREFIX.size:_PREFIX.size + header_len].tobytes().decode("utf-8"))
+    arrays = {}
+    for entry in header["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        shape = tuple(entry["shape"])
+        start = entry["offset"]
+        end = start + dtype.itemsize * int(np.prod(shape, dtype=np.int64))
+        if end > buf.size:
+            raise ValueError(f"Truncated binary model file: {path} (array {entry['name']!r})")
+        arrays[entry["name"]] = buf[start:end].view(dtype).reshape(shape)
+    return header["kind"], header["meta"], arrays
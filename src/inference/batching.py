@@ -0,0 +1,84 @@
+"""
+Asyncio micro-batcher for concurrent single-row requests.
+
+Requests arriving within a short window (or until the batch is full)
+are scored together with one vectorized call, and each caller gets its
+own result back. The batch function runs in a thread so the event loop
+keeps accepting requests while the models work.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get("MICROBATCH_MAX_SIZE", "64"))
+DEFAULT_WINDOW_MS = float(os.environ.get("MICROBATCH_WINDOW_MS", "2"))
+
+
+class MicroBatcher:
+    """
+    Collect items for up to `window_ms` or `max_batch_size` items, then
+    call `batch_fn(items)` once; it must return one result per item.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: Optional[int] = None,
+        window_ms: Optional[float] = None,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size or DEFAULT_MAX_BATCH_SIZE
+        self.window = (DEFAULT_WINDOW_MS if window_ms is None else window_ms) / 1000.0
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks: hold running batches here
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters for tuning the window / size
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(None, self.batch_fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
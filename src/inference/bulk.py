@@ -0,0 +1,206 @@
+"""
+Offline bulk scoring CLI.
+
+Reads a large CSV or Parquet file in chunks, validates and scores each
+chunk in a pool of worker processes (each loads the models once) and
+writes the input columns plus predictions back out in input order.
+Input that already has a prediction column (hardness, oxidation or their
+_error columns) is refused rather than written out with duplicate names.
+
+Usage:
+    python -m src.inference.bulk data/welds.csv scored.csv
+    python -m src.inference.bulk welds.parquet scored.parquet --workers 8 --chunk-rows 50000
+
+Parquet needs `pyarrow` (optional, not in requirements.txt).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.inference import predict
+from src.inference.streaming import RESULT_COLUMNS
+
+DEFAULT_CHUNK_ROWS = 10_000
+
+
+# ---------------------------------------------------------
+# Chunked I/O
+# ---------------------------------------------------------
+
+def _is_parquet(path: str) -> bool:
+    return path.lower().endswith((".parquet", ".pq"))
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("[ERROR] Parquet support needs pyarrow: pip install pyarrow")
+    return pq
+
+
+def read_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield the input file as DataFrames of at most `chunk_rows` rows."""
+    if _is_parquet(path):
+        pq = _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        # Material stays a string; numerics are coerced by the validator
+        yield from pd.read_csv(path, chunksize=chunk_rows, dtype={"Material": str})
+
+
+class ChunkWriter:
+    """
+    Append scored chunks to a CSV or Parquet file. Use as a context
+    manager: the Parquet writer is closed on exit. CSV chunks are appended
+    by pandas, which opens and closes the file per chunk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self._parquet = _is_parquet(path)
+        self._writer = None
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        if self._writer is not None:
+            self._writer.close()
+        return False
+
+    def write(self, chunk: pd.DataFrame) -> None:
+        if self._parquet:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._writer is None:
+                self._writer = _require_pyarrow().ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            first = self.rows == 0
+            chunk.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+        self.rows += len(chunk)
+
+
+def check_columns(chunk: pd.DataFrame) -> None:
+    """
+    Raises:
+        ValueError: If the input already has a prediction column, which the
+            output would then repeat.
+    """
+    clash = [c for c in RESULT_COLUMNS if c in chunk.columns]
+    if clash:
+        raise ValueError(
+            f"Input already has prediction column(s) {clash}; rename or drop them before scoring."
+        )
+
+
+# ---------------------------------------------------------
+# Scoring (runs in the worker processes)
+# ---------------------------------------------------------
+
+_backend: Optional[str] = None
+
+
+def _init_worker(backend: Optional[str]) -> None:
+    """Pool initializer: load the models once per worker process."""
+    global _backend
+    _backend = predict.resolve_backend(backend)
+    predict.preload_models(_backend)
+
+
+def score_frame(chunk: pd.DataFrame, backend: Optional[str] = None) -> pd.DataFrame:
+    """
+    Validate and score one chunk through predict_all_batch (one vectorized
+    predict per model). Returns the chunk with hardness/oxidation (+ per-row
+    error) columns appended.
+    """
+    out = chunk.reset_index(drop=True)
+    flat = [predict.flatten_result(r) for r in predict.predict_all_batch(out, backend or _backend)]
+
+    for name in ("hardness", "oxidation"):
+        out[name] = np.array([np.nan if r[name] is None else r[name] for r in flat], dtype=float)
+        out[f"{name}_error"] = [r[f"{name}_error"] for r in flat]
+
+    return out[list(chunk.columns) + RESULT_COLUMNS]
+
+
+# ---------------------------------------------------------
+# Driver
+# ---------------------------------------------------------
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> int:
+    """
+    Score `input_path` into `output_path`; returns the number of rows written.
+    workers=None uses every core; workers <= 1 scores in this process.
+    At most 2 chunks per worker are in flight, so memory stays bounded.
+    """
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    chunks = read_chunks(input_path, chunk_rows)
+
+    with ChunkWriter(output_path) as writer:
+        if workers <= 1:
+            _init_worker(backend)
+            for chunk in chunks:
+                check_columns(chunk)
+                writer.write(score_frame(chunk))
+            return writer.rows
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(backend,)
+        ) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                check_columns(chunk)
+                in_flight.append(pool.submit(score_frame, chunk))
+                if len(in_flight) >= 2 * workers:
+                    writer.write(in_flight.popleft().result())
+            while in_flight:
+                writer.write(in_flight.popleft().result())
+        return writer.rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-score a CSV/Parquet file offline.")
+    parser.add_argument("input", help="CSV or Parquet file with the model feature columns")
+    parser.add_argument("output", help="Output CSV or Parquet file (format from extension)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    parser.add_argument("--backend", choices=predict.BACKENDS, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        rows = score_file(args.input, args.output, args.chunk_rows, args.workers, args.backend)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"[INFO] Scored {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s) "
+          f"→ {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Bounded prediction cache with LRU + TTL eviction.
+
+Keys are tuples built by the inference layer from the validated,
+canonicalized feature values plus the model artifact version, so a
+retrained model never serves stale entries.
+
+Backends:
+- MemoryCacheBackend: per-process OrderedDict (default)
+- SQLiteCacheBackend: one SQLite file shared by all workers on a host
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+# ---------------------------------------------------------
+# Backends
+# ---------------------------------------------------------
+
+class MemoryCacheBackend:
+    """In-process LRU store; `set` returns the number of evicted entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: Hashable, expires_at: float, value: Any) -> int:
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+
+        evicted = 0
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """
+    Host-local shared store for multi-worker deployments.
+    Values must be JSON-serializable. Connections are opened per process
+    (and per thread) so the backend survives gunicorn's fork.
+
+    Hits are read-only unless the entry's recency is older than
+    `touch_interval` seconds (so LRU order has that granularity), and the
+    size is counted every `evict_every` inserts per process instead of on
+    each one, so the store may run up to `evict_every` entries per worker
+    over `maxsize` between checks.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int,
+        touch_interval: float = 10.0,
+        evict_every: Optional[int] = None,
+    ):
+        self.path = path
+        self.maxsize = maxsize
+        self.touch_interval = touch_interval
+        self.evict_every = evict_every or max(1, maxsize // 20)
+        self._inserts = 0
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prediction_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS prediction_cache_accessed"
+                " ON prediction_cache (accessed_at)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        return json.dumps(key, separators=(",", ":"))
+
+    def get(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        conn = self._conn()
+        k = self._key(key)
+        row = conn.execute(
+            "SELECT expires_at, value, accessed_at FROM prediction_cache WHERE key = ?", (k,)
+        ).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if now - row[2] > self.touch_interval:
+            conn.execute("UPDATE prediction_cache SET accessed_at = ? WHERE key = ?", (now, k))
+        return row[0], json.loads(row[1])
+
+    def set(self, key: Hashable, expires_at: float, value: Any) -> int:
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO prediction_cache VALUES (?, ?, ?, ?)",
+            (self._key(key), json.dumps(value), expires_at, time.time()),
+        )
+
+        self._inserts += 1
+        if self._inserts % self.evict_every:
+            return 0
+        overflow = len(self) - self.maxsize
+        if overflow <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM prediction_cache WHERE key IN ("
+            " SELECT key FROM prediction_cache ORDER BY accessed_at LIMIT ?)",
+            (overflow,),
+        )
+        return overflow
+
+    def delete(self, key: Hashable) -> None:
+        self._conn().execute("DELETE FROM prediction_cache WHERE key = ?", (self._key(key),))
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM prediction_cache")
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM prediction_cache").fetchone()[0]
+
+
+# ---------------------------------------------------------
+# Cache front-end
+# ---------------------------------------------------------
+
+class PredictionCache:
+    """Thread-safe LRU/TTL cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, backend: Any = None):
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryCacheBackend(maxsize)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self.backend.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at < time.time():
+                self.backend.delete(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self.evictions += self.backend.set(key, time.time() + self.ttl, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self.backend),
+            }
+
+
+def cache_from_env() -> Optional[PredictionCache]:
+    """
+    Build the prediction cache from environment variables:
+        PREDICTION_CACHE_SIZE     max entries (0 disables, default 1024)
+        PREDICTION_CACHE_TTL      seconds (default 300)
+        PREDICTION_CACHE_BACKEND  "memory" (default) or "sqlite"
+        PREDICTION_CACHE_PATH     SQLite file for the shared backend
+    """
+    maxsize = int(os.environ.get("PREDICTION_CACHE_SIZE", "1024"))
+    if maxsize <= 0:
+        return None
+
+    ttl = float(os.environ.get("PREDICTION_CACHE_TTL", "300"))
+    kind = os.environ.get("PREDICTION_CACHE_BACKEND", "memory")
+
+    if kind == "memory":
+        backend = MemoryCacheBackend(maxsize)
+    elif kind == "sqlite":
+        default_path = os.path.join(tempfile.gettempdir(), "prediction_cache.sqlite3")
+        backend = SQLiteCacheBackend(os.environ.get("PREDICTION_CACHE_PATH", default_path), maxsize)
+    else:
+        raise ValueError(f"Unknown PREDICTION_CACHE_BACKEND '{kind}'. Use 'memory' or 'sqlite'.")
+
+    return PredictionCache(maxsize=maxsize, ttl=ttl, backend=backend)
@@ -0,0 +1,300 @@
+"""
+Per-prediction feature attributions (SHAP values), computed live.
+
+Attributions are given per raw input (Material, Current, ...). The
+one-hot columns of Material count as one feature. For every row,
+base_value + sum(attributions) equals the prediction.
+
+- Linear models: exact closed form. weight_j * (x_j - mean_j) for numeric
+  inputs (= coefficient * standardized deviation); the material term is
+  the row's intercept minus the frequency-weighted mean intercept. The
+  training means come from the residual stats stored with the model.
+- Tree ensembles: exact path-dependent TreeSHAP, in a leaf/product form
+  that vectorizes over trees and rows. A leaf's contribution to the
+  conditional expectation for a feature subset S is
+      value * prod_j (x follows the path on j if j in S else cover ratio of j)
+  so its Shapley values depend only on which of the M features the row
+  agrees with along the path (2**M patterns, M <= 6 here). Those are
+  tabulated once per model; explaining a batch is one vectorized path
+  check plus a table gather, block by block.
+
+No sklearn imports: compiled artifacts are explained with NumPy only
+(forests need the `cover` array, written by exports from this version on).
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from math import factorial
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference.forest import CompiledForest
+from src.inference.linear import FoldedLinearModel
+from src.inference.uncertainty import RESIDUALS_ATTR
+
+# Rows per gather block; bounds the (n_leaves, rows, n_features) scratch
+BLOCK_ROWS = 64
+
+
+class ExplanationUnavailable(Exception):
+    """The model artifact lacks what its explainer needs."""
+
+
+# ---------------------------------------------------------
+# Linear closed form
+# ---------------------------------------------------------
+
+class LinearExplainer:
+    """Exact SHAP values of a folded linear model against the training means."""
+
+    def __init__(self, folded: FoldedLinearModel, stats: Dict[str, Any]):
+        if "design_mean" not in stats:
+            raise ExplanationUnavailable(
+                "Model artifact has no training means; retrain it to enable explanations."
+            )
+        categories = stats["categories"]
+        mean = np.asarray(stats["design_mean"], dtype=np.float64)
+        freq, numeric_mean = mean[: len(categories)], mean[len(categories):]
+
+        self.folded = folded
+        self.features = folded.features
+        self._numeric_mean = dict(zip(stats["numeric_features"], numeric_mean))
+        self._mean_x = np.array([self._numeric_mean[f] for f in folded.numeric_features])
+
+        # E[intercept]: a material outside `categories` gets the default intercept
+        expected_intercept = folded.default_intercept + sum(
+            p * (folded.intercepts.get(c, folded.default_intercept) - folded.default_intercept)
+            for c, p in zip(categories, freq)
+        )
+        self._expected_intercept = float(expected_intercept)
+        self.base_value = self._expected_intercept + float(folded._weights @ self._mean_x)
+
+    def shap_values(self, frame) -> np.ndarray:
+        materials = np.asarray(frame[self.folded.categorical_feature], dtype=object).astype(str)
+        intercepts = np.array(
+            [self.folded.intercepts.get(m, self.folded.default_intercept) for m in materials]
+        )
+        numeric = np.asarray(frame[self.folded.numeric_features], dtype=np.float64)
+        return np.column_stack([
+            intercepts - self._expected_intercept,
+            (numeric - self._mean_x) * self.folded._weights,
+        ])
+
+
+# ---------------------------------------------------------
+# Path-dependent TreeSHAP
+# ---------------------------------------------------------
+
+class TreeExplainer:
+    """Exact path-dependent TreeSHAP for a CompiledForest, vectorized over trees and rows."""
+
+    def __init__(self, forest: CompiledForest):
+        if forest.cover is None:
+            raise ExplanationUnavailable(
+                "Forest artifact has no node covers; re-export it to enable explanations."
+            )
+        pre = forest.preprocessor
+        self.forest = forest
+        self.features = pre.features
+        n_features = len(self.features)
+
+        # Transformed column -> raw feature group (one-hot columns -> Material)
+        group_of_column = np.concatenate([
+            np.zeros(pre.n_categories, dtype=np.intp),
+            1 + np.arange(len(pre.numeric_features), dtype=np.intp),
+        ])
+
+        left, right = forest.left, forest.right
+        ids = np.arange(forest.n_nodes)
+        is_leaf = (left == ids) & (right == ids)
+        internal = np.flatnonzero(~is_leaf)
+        parent = np.full(forest.n_nodes, -1, dtype=np.intp)
+        went_right = np.zeros(forest.n_nodes, dtype=bool)
+        parent[left[internal]] = internal
+        parent[right[internal]] = internal
+        went_right[right[internal]] = True
+
+        leaves = np.flatnonzero(is_leaf)
+        n_leaves = len(leaves)
+
+        # Walk every leaf up to its root at once, one level per step. Each leaf's
+        # path is also kept padded to the forest depth: slot d holds the split d
+        # levels above it (padding: +inf threshold, never off the path)
+        threshold = np.asarray(forest.threshold, dtype=np.float64)
+        entry_leaf, entry_node, entry_child = [], [], []
+        path_column, path_threshold, path_right, path_group = [], [], [], []
+        cur = leaves.copy()
+        active = np.arange(n_leaves)
+        while True:
+            up = parent[cur[active]]
+            keep = up >= 0
+            active, up = active[keep], up[keep]
+            if not len(active):
+                break
+            entry_leaf.append(active)
+            entry_node.append(up)
+            entry_child.append(cur[active])
+
+            column = np.zeros(n_leaves, dtype=np.intp)
+            split = np.full(n_leaves, np.inf)
+            right = np.zeros(n_leaves, dtype=bool)
+            group = np.full(n_leaves, -1, dtype=np.intp)
+            column[active] = forest.feature[up]
+            split[active] = threshold[up]
+            right[active] = went_right[cur[active]]
+            group[active] = group_of_column[forest.feature[up]]
+            path_column.append(column)
+            path_threshold.append(split)
+            path_right.append(right)
+            path_group.append(group)
+            cur[active] = up
+
+        entry_leaf = np.concatenate(entry_leaf)
+        entry_node = np.concatenate(entry_node)
+        entry_child = np.concatenate(entry_child)
+        entry_group = group_of_column[forest.feature[entry_node]]
+
+        # Cover ratio products per (leaf, feature): the "feature absent" factor
+        zero_fraction = np.ones((n_leaves, n_features))
+        np.multiply.at(
+            zero_fraction,
+            (entry_leaf, entry_group),
+            forest.cover[entry_child] / forest.cover[entry_node],
+        )
+
+        values = forest.value[leaves]
+        self.expected_value = float(np.prod(zero_fraction, axis=1) @ values) / forest.n_trees
+        table = self._shap_table(values, zero_fraction, n_features)
+        self._table = table.reshape(-1, n_features)
+        self._row_base = (np.arange(n_leaves, dtype=np.int64) << n_features)[:, None]
+
+        self._column = path_column
+        self._threshold = [t[:, None] for t in path_threshold]
+        self._went_right = [r[:, None] for r in path_right]
+        self._full = (1 << n_features) - 1
+        # Smallest integer type holding every feature bit (uint8 for up to 8 features)
+        self._bit_dtype = np.min_scalar_type(self._full)
+        self._bit = [
+            np.where(g >= 0, 1 << np.maximum(g, 0), 0).astype(self._bit_dtype)[:, None]
+            for g in path_group
+        ]
+
+    @staticmethod
+    def _shap_table(values: np.ndarray, zero_fraction: np.ndarray, n_features: int) -> np.ndarray:
+        """
+        table[leaf, pattern, i]: Shapley value of feature i from one leaf when
+        `pattern` has bit j set iff the row agrees with the leaf's path on j.
+        """
+        n_patterns = 1 << n_features
+        one_fraction = ((np.arange(n_patterns)[:, None] >> np.arange(n_features)) & 1).astype(np.float64)
+        weights = np.array([
+            factorial(k) * factorial(n_features - 1 - k) / factorial(n_features)
+            for k in range(n_features)
+        ])
+
+        table = np.empty((len(values), n_patterns, n_features))
+        for i in range(n_features):
+            # Coefficients (in |S|) of prod_{j != i} (zero_j + one_j * t)
+            poly = np.zeros((len(values), n_patterns, n_features))
+            poly[..., 0] = 1.0
+            degree = 0
+            for j in range(n_features):
+                if j == i:
+                    continue
+                # Multiply by (zero_j + one_j * t), highest coefficient first, in place
+                one = one_fraction[None, :, j]
+                zero = zero_fraction[:, j, None]
+                for k in range(degree + 1, 0, -1):
+                    poly[..., k] = poly[..., k] * zero + poly[..., k - 1] * one
+                poly[..., 0] *= zero
+                degree += 1
+            table[:, :, i] = (
+                values[:, None]
+                * (one_fraction[None, :, i] - zero_fraction[:, i, None])
+                * (poly @ weights)
+            )
+        return table
+
+    def shap_values(self, X: np.ndarray) -> np.ndarray:
+        """SHAP values (n_rows, n_features) for transformed inputs X."""
+        # Compared like the forest itself: float32 inputs vs float64 thresholds
+        columns = np.ascontiguousarray(np.asarray(X, dtype=np.float32).astype(np.float64).T)
+        out = np.empty((columns.shape[1], len(self.features)))
+
+        for start in range(0, columns.shape[1], BLOCK_ROWS):
+            block = columns[:, start:start + BLOCK_ROWS]
+            # missed[leaf, row]: bits of the features on which the row leaves the path
+            missed = np.zeros((len(self._row_base), block.shape[1]), dtype=self._bit_dtype)
+            for column, split, right, bit in zip(self._column, self._threshold, self._went_right, self._bit):
+                off_path = np.greater(block[column], split)
+                np.not_equal(off_path, right, out=off_path)
+                missed |= off_path * bit
+            contributions = np.take(self._table, self._row_base + (self._full - missed), axis=0)
+            out[start:start + BLOCK_ROWS] = contributions.sum(axis=0) / self.forest.n_trees
+        return out
+
+
+# ---------------------------------------------------------
+# Dispatch (explainers are built once per loaded model)
+# ---------------------------------------------------------
+
+_explainers: "weakref.WeakKeyDictionary[Any, Tuple[Any, Any]]" = weakref.WeakKeyDictionary()
+_explainers_lock = threading.Lock()
+
+
+def _build(model: Any) -> Tuple[Any, Any]:
+    """(explainer, transform function or None) for any backend's model."""
+    if isinstance(model, CompiledForest):
+        return TreeExplainer(model), model.preprocessor.transform_frame
+    if isinstance(model, FoldedLinearModel):
+        stats = model.residuals_
+        if stats is None:
+            raise ExplanationUnavailable(
+                "Model artifact has no training means; retrain it to enable explanations."
+            )
+        return LinearExplainer(model, stats), None
+
+    # sklearn Pipeline or FastPipeline: compile the preprocessing, then pick by estimator
+    if hasattr(model, "steps"):
+        pre = CompiledPreprocessor.from_column_transformer(dict(model.steps)["preprocess"])
+        estimator = model.steps[-1][1]
+    elif hasattr(model, "preprocessor") and hasattr(model, "estimator"):
+        pre, estimator = model.preprocessor, model.estimator
+    else:
+        raise ExplanationUnavailable(f"No explainer for {type(model).__name__}.")
+
+    if hasattr(estimator, "estimators_"):
+        return TreeExplainer(CompiledForest.from_parts(pre, estimator)), pre.transform_frame
+    if hasattr(estimator, "coef_"):
+        stats = getattr(estimator, RESIDUALS_ATTR, None)
+        if stats is None:
+            raise ExplanationUnavailable(
+                "Model artifact has no training means; retrain it to enable explanations."
+            )
+        return LinearExplainer(FoldedLinearModel.from_parts(pre, estimator), stats), None
+    raise ExplanationUnavailable(f"No explainer for {type(estimator).__name__}.")
+
+
+def _explainer_for(model: Any) -> Tuple[Any, Any]:
+    cached = _explainers.get(model)
+    if cached is None:
+        with _explainers_lock:
+            cached = _explainers.get(model)
+            if cached is None:
+                cached = _explainers[model] = _build(model)
+    return cached
+
+
+def explain(model: Any, frame) -> Tuple[float, List[str], np.ndarray]:
+    """
+    SHAP values for every row of `frame` (validated feature columns).
+    Returns (base_value, feature names, values of shape (n_rows, n_features)).
+    """
+    explainer, transform = _explainer_for(model)
+    if isinstance(explainer, TreeExplainer):
+        return explainer.expected_value, explainer.features, explainer.shap_values(transform(frame))
+    return explainer.base_value, explainer.features, explainer.shap_values(frame)
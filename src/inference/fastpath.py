@@ -0,0 +1,157 @@
+"""
+Pandas-free fast path for inference.
+
+Precompiles a fitted preprocessing ColumnTransformer
+(OneHotEncoder on Material + StandardScaler on numerics) into plain
+NumPy arrays, so a validated record can be transformed without building
+a DataFrame or slicing columns by name. The transformed row is passed
+straight to the fitted estimator, giving bit-identical predictions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+class CompiledPreprocessor:
+    """
+    NumPy equivalent of the fitted `make_preprocessor` ColumnTransformer.
+    Output layout matches sklearn: one-hot Material columns, then scaled numerics.
+    """
+
+    def __init__(
+        self,
+        categorical_feature: str,
+        categories: Sequence[str],
+        numeric_features: Sequence[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+    ):
+        self.categorical_feature = categorical_feature
+        self.categories = [str(c) for c in categories]
+        self.numeric_features = list(numeric_features)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+
+        self.features = [categorical_feature] + self.numeric_features
+        self.n_categories = len(self.categories)
+        self.n_outputs = self.n_categories + len(self.numeric_features)
+
+        # Material -> column index; unknown materials encode as all zeros,
+        # matching OneHotEncoder(handle_unknown="ignore")
+        self._category_index = {c: i for i, c in enumerate(self.categories)}
+        eye = np.eye(self.n_categories, dtype=np.float64)
+        self._onehot = {c: eye[i] for i, c in enumerate(self.categories)}
+        self._unknown = np.zeros(self.n_categories, dtype=np.float64)
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor: Any) -> "CompiledPreprocessor":
+        """Extract the fitted encoder categories and scaler moments."""
+        encoder = scaler = None
+        categorical: List[str] = []
+        numeric: List[str] = []
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str) or len(columns) == 0:
+                continue
+            if hasattr(transformer, "categories_"):
+                encoder, categorical = transformer, list(columns)
+            elif hasattr(transformer, "scale_") or hasattr(transformer, "mean_"):
+                scaler, numeric = transformer, list(columns)
+            else:
+                raise ValueError(f"Unsupported transformer '{name}': {transformer!r}")
+
+        if encoder is None or scaler is None or len(categorical) != 1:
+            raise ValueError("Expected one OneHotEncoder column and one StandardScaler block.")
+
+        n_numeric = len(numeric)
+        mean = scaler.mean_ if scaler.with_mean else np.zeros(n_numeric)
+        scale = scaler.scale_ if scaler.with_std else np.ones(n_numeric)
+
+        return cls(categorical[0], encoder.categories_[0], numeric, mean, scale)
+
+    def to_arrays(self, prefix: str = "pre_") -> Dict[str, np.ndarray]:
+        """Flatten into plain NumPy arrays for artifact storage."""
+        return {
+            f"{prefix}categorical_feature": np.array([self.categorical_feature]),
+            f"{prefix}categories": np.array(self.categories),
+            f"{prefix}numeric_features": np.array(self.numeric_features),
+            f"{prefix}mean": self.mean,
+            f"{prefix}scale": self.scale,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Any, prefix: str = "pre_") -> "CompiledPreprocessor":
+        """Inverse of `to_arrays`."""
+        return cls(
+            str(arrays[f"{prefix}categorical_feature"][0]),
+            [str(c) for c in arrays[f"{prefix}categories"]],
+            [str(f) for f in arrays[f"{prefix}numeric_features"]],
+            arrays[f"{prefix}mean"],
+            arrays[f"{prefix}scale"],
+        )
+
+    def transform(self, materials: Sequence[str], numeric: np.ndarray) -> np.ndarray:
+        """Transform column arrays (materials, numeric matrix) into model inputs."""
+        numeric = np.asarray(numeric, dtype=np.float64).reshape(-1, len(self.numeric_features))
+        n_rows = numeric.shape[0]
+
+        out = np.zeros((n_rows, self.n_outputs), dtype=np.float64)
+        idx = np.fromiter(
+            (self._category_index.get(m, -1) for m in materials),
+            dtype=np.intp,
+            count=n_rows,
+        )
+        known = idx >= 0
+        out[np.flatnonzero(known), idx[known]] = 1.0
+        out[:, self.n_categories:] = (numeric - self.mean) / self.scale
+        return out
+
+    def transform_record(self, record: Dict[str, Any]) -> np.ndarray:
+        """Transform a single validated record into a (1, n_outputs) row."""
+        onehot = self._onehot.get(record[self.categorical_feature], self._unknown)
+        numeric = np.array([record[f] for f in self.numeric_features], dtype=np.float64)
+        scaled = (numeric - self.mean) / self.scale
+        return np.concatenate((onehot, scaled)).reshape(1, -1)
+
+    def transform_frame(self, df) -> np.ndarray:
+        """Transform a DataFrame holding the feature columns."""
+        return self.transform(
+            df[self.categorical_feature].to_numpy(),
+            df[self.numeric_features].to_numpy(dtype=np.float64),
+        )
+
+
+class FastPipeline:
+    """
+    Fitted estimator behind a CompiledPreprocessor.
+    Drop-in for the sklearn Pipeline's `predict`, plus a per-record path.
+    """
+
+    def __init__(self, preprocessor: CompiledPreprocessor, estimator: Any):
+        self.preprocessor = preprocessor
+        self.estimator = estimator
+
+    def predict_record(self, record: Dict[str, Any]) -> float:
+        row = self.preprocessor.transform_record(record)
+        return float(self.estimator.predict(row)[0])
+
+    def predict(self, df) -> np.ndarray:
+        return self.estimator.predict(self.preprocessor.transform_frame(df))
+
+
+def compile_pipeline(pipeline: Any) -> FastPipeline:
+    """
+    Compile a fitted `build_*_pipeline()` Pipeline into a FastPipeline.
+    Raises ValueError if the pipeline layout is not supported.
+    """
+    steps = dict(pipeline.steps)
+    if "preprocess" not in steps or "model" not in steps:
+        raise ValueError("Pipeline must have 'preprocess' and 'model' steps.")
+
+    return FastPipeline(
+        CompiledPreprocessor.from_column_transformer(steps["preprocess"]),
+        steps["model"],
+    )
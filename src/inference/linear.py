@@ -0,0 +1,113 @@
+"""
+Closed-form compiled hardness model.
+
+The hardness pipeline is OneHotEncoder -> StandardScaler -> LinearRegression,
+which collapses to a single dot product per material:
+
+    y = intercept[material] + sum_j (coef_j / scale_j) * x_j
+
+with intercept[material] = b + coef_cat[material] - sum_j coef_j * mean_j / scale_j.
+
+The folded weights are exported to a binary model file (modelfile.py) and
+served here without importing sklearn or joblib.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference.uncertainty import RESIDUALS_ATTR
+
+FORMAT_NAME = "folded-linear"
+FORMAT_VERSION = 1
+
+
+class FoldedLinearModel:
+    """Linear model with the scaler folded into the weights, one intercept per material."""
+
+    def __init__(
+        self,
+        categorical_feature: str,
+        numeric_features: Sequence[str],
+        weights: Sequence[float],
+        intercepts: Dict[str, float],
+        default_intercept: float,
+        residuals: Optional[Dict[str, Any]] = None,
+    ):
+        self.categorical_feature = categorical_feature
+        self.numeric_features = list(numeric_features)
+        self.weights = [float(w) for w in weights]
+        self.intercepts = {str(k): float(v) for k, v in intercepts.items()}
+        # Used for materials the encoder never saw (all-zero one-hot)
+        self.default_intercept = float(default_intercept)
+        # Training residual stats for prediction intervals (see uncertainty.py)
+        self.residuals_ = dict(residuals) if residuals else None
+
+        self.features = [categorical_feature] + self.numeric_features
+        self._weights = np.asarray(self.weights, dtype=np.float64)
+
+    # ---------------------------------------------------------
+    # Construction
+    # ---------------------------------------------------------
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Any) -> "FoldedLinearModel":
+        """Fold a fitted hardness Pipeline into per-material intercepts + weights."""
+        steps = dict(pipeline.steps)
+        return cls.from_parts(
+            CompiledPreprocessor.from_column_transformer(steps["preprocess"]), steps["model"]
+        )
+
+    @classmethod
+    def from_parts(cls, pre: CompiledPreprocessor, estimator: Any) -> "FoldedLinearModel":
+        """Fold a fitted linear estimator behind an already compiled preprocessor."""
+
+        coef = np.asarray(estimator.coef_, dtype=np.float64).ravel()
+        if coef.shape[0] != pre.n_outputs:
+            raise ValueError(
+                f"Estimator has {coef.shape[0]} coefficients, "
+                f"preprocessor produces {pre.n_outputs} columns."
+            )
+
+        coef_cat = coef[: pre.n_categories]
+        coef_num = coef[pre.n_categories:]
+
+        weights = coef_num / pre.scale
+        base = float(estimator.intercept_) - float(np.dot(coef_num, pre.mean / pre.scale))
+
+        intercepts = {cat: base + float(c) for cat, c in zip(pre.categories, coef_cat)}
+        return cls(
+            pre.categorical_feature,
+            pre.numeric_features,
+            weights,
+            intercepts,
+            base,
+            getattr(estimator, RESIDUALS_ATTR, None),
+        )
+
+    # ---------------------------------------------------------
+    # Inference
+    # ---------------------------------------------------------
+
+    def predict_record(self, record: Dict[str, Any]) -> float:
+        """Single validated record → prediction, in plain Python."""
+        total = self.intercepts.get(record[self.categorical_feature], self.default_intercept)
+        for w, f in zip(self.weights, self.numeric_features):
+            total += w * record[f]
+        return float(total)
+
+    def predict(self, df) -> np.ndarray:
+        """Vectorized prediction over a DataFrame holding the feature columns."""
+        # Look up each distinct material once, then broadcast
+        materials = np.asarray(df[self.categorical_feature], dtype=object)
+        uniques, inverse = np.unique(materials.astype(str), return_inverse=True)
+        per_unique = np.array(
+            [self.intercepts.get(m, self.default_intercept) for m in uniques],
+            dtype=np.float64,
+        )
+        intercepts = per_unique[inverse]
+        numeric = df[self.numeric_features].to_numpy(dtype=np.float64)
+        return intercepts + numeric @ self._weights
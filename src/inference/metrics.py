@@ -0,0 +1,306 @@
+"""
+Lightweight in-process metrics with Prometheus text exposition.
+
+Counters and fixed-bucket histograms are kept in plain dicts under one
+lock, so recording costs a few dict operations. Set METRICS_ENABLED=0 to
+turn every call into a no-op.
+
+Multi-worker (gunicorn): when METRICS_DIR is set, a background thread in
+each process writes its snapshot to METRICS_DIR/metrics-<pid>-<token>.json
+every METRICS_FLUSH_INTERVAL seconds when something changed (atomic
+rename), and `render()` sums the snapshots of all processes, so any worker
+can answer a /metrics scrape. The scraped worker flushes first, and files
+of exited workers are kept, so counters never go backwards between
+scrapes. The random token is drawn per process (again after fork), so a
+new worker that reuses a dead worker's pid never overwrites its file.
+"""
+
+from __future__ import annotations
+
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1"))
+
+# Histogram upper bounds in seconds (+Inf is implicit)
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0,
+)
+
+# name -> (type, help)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "inference_stage_duration_seconds": (
+        "histogram", "Time spent per hot-path stage (validate, to_dataframe, transform, ...)."),
+    "predictions_total": ("counter", "Prediction results by model and outcome."),
+    "model_loads_total": ("counter", "Model artifact loads by slot and status."),
+    "model_load_duration_seconds": ("histogram", "Model artifact load time."),
+    "http_requests_total": ("counter", "HTTP requests by endpoint, method and status."),
+    "http_request_duration_seconds": ("histogram", "HTTP request latency by endpoint."),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Key = Tuple[str, Labels]
+
+_lock = threading.Lock()
+_counters: Dict[Key, float] = {}
+# key -> [per-bucket counts (len(BUCKETS) + 1), sum]
+_histograms: Dict[Key, list] = {}
+
+_dirty = False
+_flusher_pid = None
+# Snapshot file name stem, unique per process lifetime (see module docstring)
+_process_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted(labels.items()))
+
+
+# ---------------------------------------------------------
+# Recording
+# ---------------------------------------------------------
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+    _mark_dirty()
+
+
+def observe(name: str, seconds: float, **labels) -> None:
+    if ENABLED:
+        _observe(_key(name, labels), seconds)
+
+
+def _observe(key: Key, seconds: float) -> None:
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * (len(BUCKETS) + 1), 0.0]
+        hist[0][index] += 1
+        hist[1] += seconds
+    _mark_dirty()
+
+
+class _Timer:
+    __slots__ = ("key", "start")
+
+    def __init__(self, key: Key):
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _observe(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+def timer(name: str, **labels):
+    """`with timer("inference_stage_duration_seconds", stage="validate", model="hardness"):`"""
+    if not ENABLED:
+        return _NOOP
+    return _Timer(_key(name, labels))
+
+
+_stage_keys: Dict[Tuple[str, str], Key] = {}
+
+
+def stage(name: str, model: str):
+    """Shorthand for the per-stage inference histogram (label keys are memoized)."""
+    if not ENABLED:
+        return _NOOP
+    key = _stage_keys.get((name, model))
+    if key is None:
+        key = _stage_keys[(name, model)] = _key(
+            "inference_stage_duration_seconds", {"stage": name, "model": model}
+        )
+    return _Timer(key)
+
+
+def reset() -> None:
+    """Drop all recorded values."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _after_fork_in_child() -> None:
+    # Children must not re-report what the parent recorded before fork (e.g.
+    # model loads in the gunicorn master; the master flushes its own). The
+    # lock may have been held by a parent thread at fork time: replace it.
+    global _lock, _dirty, _process_id
+
+    _lock = threading.Lock()
+    _counters.clear()
+    _histograms.clear()
+    _dirty = False
+    _process_id = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ---------------------------------------------------------
+# Cross-process snapshots
+# ---------------------------------------------------------
+
+def _snapshot() -> Dict[str, list]:
+    with _lock:
+        return {
+            "counters": [[n, list(map(list, l)), v] for (n, l), v in _counters.items()],
+            "histograms": [
+                [n, list(map(list, l)), list(h[0]), h[1]] for (n, l), h in _histograms.items()
+            ],
+        }
+
+
+def _mark_dirty() -> None:
+    global _dirty, _flusher_pid
+
+    _dirty = True
+    # One flusher per process, started lazily (threads do not survive fork)
+    pid = os.getpid()
+    if _flusher_pid != pid:
+        _flusher_pid = pid
+        if os.environ.get("METRICS_DIR"):
+            threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+def _flush_loop() -> None:
+    pid = os.getpid()
+    while _flusher_pid == pid:
+        time.sleep(FLUSH_INTERVAL)
+        if _dirty:
+            flush()
+
+
+def _snapshot_path(directory: str) -> str:
+    return os.path.join(directory, f"metrics-{_process_id}.json")
+
+
+def flush() -> None:
+    """Write this process's snapshot to METRICS_DIR (no-op when unset)."""
+    global _dirty
+
+    directory = os.environ.get("METRICS_DIR")
+    if not ENABLED or not directory:
+        return
+    _dirty = False
+
+    path = _snapshot_path(directory)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(_snapshot(), f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[WARN] Could not write metrics snapshot to {path}: {e}")
+
+
+def _collect() -> List[Dict[str, list]]:
+    """Live snapshot of this process plus files written by the others."""
+    snapshots = [_snapshot()]
+    directory = os.environ.get("METRICS_DIR")
+    if not directory:
+        return snapshots
+
+    # Publish what this scrape shows, so the next one (maybe served by
+    # another worker) never sees lower values
+    flush()
+
+    own = _snapshot_path(directory)
+    for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+        if path == own:
+            continue
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # being replaced right now; picked up next scrape
+    return snapshots
+
+
+# ---------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [tuple(p) for p in labels] + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+def render() -> str:
+    """All metrics, summed across processes, in Prometheus text format 0.0.4."""
+    counters: Dict[Key, float] = {}
+    histograms: Dict[Key, list] = {}
+
+    for snap in _collect():
+        for name, labels, value in snap["counters"]:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0.0) + value
+        for name, labels, buckets, total in snap["histograms"]:
+            key = (name, tuple(map(tuple, labels)))
+            hist = histograms.setdefault(key, [[0] * (len(BUCKETS) + 1), 0.0])
+            hist[0] = [a + b for a, b in zip(hist[0], buckets)]
+            hist[1] += total
+
+    lines: List[str] = []
+    names = sorted({n for n, _ in counters} | {n for n, _ in histograms})
+    for name in names:
+        kind, help_text = METRICS.get(name, ("untyped", ""))
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"{name}{_format_labels(labels)} {_number(value)}")
+
+        for (n, labels), (buckets, total) in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), buckets):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
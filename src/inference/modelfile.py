@@ -0,0 +1,143 @@
+"""
+Single-file binary model export for the compiled backend.
+
+Both pipelines compile to NumPy-only models (linear.py, forest.py); this
+module stores either one in the binary container from artifacts.py:
+
+- hardness: "folded-linear", meta = feature names, default intercept and
+  residual stats; arrays = weights, materials and per-material intercepts
+- oxidation: "compiled-forest", meta = max depth; arrays = the packed node
+  buffers plus the OneHot/Scaler preprocessing arrays
+
+`load` maps the file and wraps views of it, so it needs neither sklearn nor
+joblib and takes milliseconds regardless of forest size.
+
+Command line (export an existing pipeline):
+
+    python -m src.inference.modelfile models/oxidation_model.joblib models/oxidation_model.bin
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+from src.inference import forest, linear
+from src.inference.artifacts import load_binary, save_binary
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference.forest import CompiledForest
+from src.inference.linear import FoldedLinearModel
+
+CompiledModel = Union[FoldedLinearModel, CompiledForest]
+
+
+def compile_model(pipeline: Any) -> CompiledModel:
+    """Compile a fitted hardness or oxidation Pipeline for NumPy-only serving."""
+    if hasattr(pipeline.steps[-1][1], "estimators_"):
+        return CompiledForest.from_pipeline(pipeline)
+    return FoldedLinearModel.from_pipeline(pipeline)
+
+
+# ---------------------------------------------------------
+# Save / load
+# ---------------------------------------------------------
+
+def save(model: Union[CompiledModel, Any], path: str) -> None:
+    """Write a compiled model (or a fitted pipeline, compiled first) to `path`."""
+    if not isinstance(model, (FoldedLinearModel, CompiledForest)):
+        model = compile_model(model)
+
+    if isinstance(model, FoldedLinearModel):
+        materials = list(model.intercepts)
+        meta = {
+            "version": linear.FORMAT_VERSION,
+            "categorical_feature": model.categorical_feature,
+            "numeric_features": model.numeric_features,
+            "default_intercept": model.default_intercept,
+            "residuals": model.residuals_,
+        }
+        arrays = {
+            "weights": np.asarray(model.weights, dtype=np.float64),
+            "materials": np.array(materials, dtype=str),
+            "intercepts": np.array([model.intercepts[m] for m in materials], dtype=np.float64),
+        }
+        save_binary(path, linear.FORMAT_NAME, meta, arrays)
+        return
+
+    arrays = {
+        "roots": model.roots,
+        "feature": model.feature,
+        "threshold": model.threshold,
+        "children": model.children,
+        "value": model.value,
+        **model.preprocessor.to_arrays(),
+    }
+    if model.cover is not None:
+        arrays["cover"] = model.cover
+    meta = {"version": forest.FORMAT_VERSION, "max_depth": model.max_depth}
+    save_binary(path, forest.FORMAT_NAME, meta, arrays)
+
+
+def load(path: str, mmap: bool = True) -> CompiledModel:
+    """
+    Load a binary model file. With mmap=True the model's arrays are views
+    of the mapped file, shared by every process on the host.
+
+    Raises:
+        ValueError: For a malformed file or an unknown model kind/version.
+    """
+    kind, meta, arrays = load_binary(path, mmap=mmap)
+
+    if kind == linear.FORMAT_NAME and meta.get("version") == linear.FORMAT_VERSION:
+        return FoldedLinearModel(
+            meta["categorical_feature"],
+            meta["numeric_features"],
+            arrays["weights"],
+            dict(zip(map(str, arrays["materials"]), arrays["intercepts"])),
+            meta["default_intercept"],
+            meta.get("residuals"),
+        )
+
+    if kind == forest.FORMAT_NAME and meta.get("version") == forest.FORMAT_VERSION:
+        return CompiledForest(
+            CompiledPreprocessor.from_arrays(arrays),
+            arrays["roots"],
+            arrays["feature"],
+            arrays["threshold"],
+            arrays["children"],
+            arrays["value"],
+            meta["max_depth"],
+            arrays.get("cover"),
+        )
+
+    raise ValueError(
+        f"Unsupported binary model: kind={kind!r}, version={meta.get('version')!r} ({path})"
+    )
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export a fitted pipeline to a binary model file.")
+    parser.add_argument("pipeline", help="joblib pipeline (hardness or oxidation)")
+    parser.add_argument("output", help="binary model file to write")
+    args = parser.parse_args(argv)
+
+    import joblib  # export only; serving never needs it
+
+    save(joblib.load(args.pipeline), args.output)
+    start = time.perf_counter()
+    model = load(args.output)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    print(f"[INFO] Wrote {type(model).__name__} to {args.output} (loads in {elapsed_ms:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
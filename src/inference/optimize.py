@@ -0,0 +1,324 @@
+"""
+Inverse design: search process settings that meet target properties.
+
+Given a fixed Material/composition and bounds for the free numeric inputs,
+find settings that satisfy constraints on the predicted properties (e.g.
+hardness >= 330) while minimizing or maximizing one of them (e.g.
+oxidation). The search is population based (cross-entropy method): every
+generation samples a few hundred candidates, scores all of them with one
+vectorized predict per model, and refits a per-input Gaussian to the
+elite fraction. Infeasible candidates rank behind feasible ones by their
+total constraint violation.
+
+Stops at the first of: evaluation budget, time budget, or convergence
+(population spread below OPTIMIZE_TOLERANCE of each input's range).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.inference import metrics
+from src.inference.predict import (
+    ALL_FEATURES,
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    get_model,
+    resolve_backend,
+    validate_fields,
+)
+from src.inference.validator import ValidationError, validate_numeric
+
+# Upper bounds on what a single request may ask for
+MAX_EVALUATIONS = int(os.environ.get("OPTIMIZE_MAX_EVALUATIONS", "50000"))
+MAX_SECONDS = float(os.environ.get("OPTIMIZE_MAX_SECONDS", "5"))
+
+DEFAULT_POPULATION = 256
+DEFAULT_EVALUATIONS = 10_000
+DEFAULT_SECONDS = 1.0
+ELITE_FRACTION = 0.1
+TOLERANCE = float(os.environ.get("OPTIMIZE_TOLERANCE", "0.001"))
+
+_MODELS = {"hardness": HARDNESS_FEATURES, "oxidation": OXIDATION_FEATURES}
+_NUMERIC = [f for f in ALL_FEATURES if f != "Material"]
+
+
+class Problem(NamedTuple):
+    free: List[str]                            # inputs searched, in feature order
+    lower: np.ndarray
+    upper: np.ndarray
+    fixed: Dict[str, Any]                      # validated fixed inputs
+    objective: Tuple[str, str]                 # ("minimize" | "maximize", model)
+    constraints: Dict[str, Tuple[float, float]]  # model -> (min, max)
+    population: int
+    max_evaluations: int
+    time_budget: float
+    top_k: int
+    seed: int
+
+    @property
+    def models(self) -> List[str]:
+        needed = {self.objective[1], *self.constraints}
+        return [m for m in _MODELS if m in needed]
+
+
+# ---------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------
+
+def _positive_int(payload: Dict[str, Any], key: str, default: int, cap: Optional[int] = None) -> int:
+    value = payload.get(key, default)
+    if type(value) is not int or value < 1:
+        raise ValidationError(f"'{key}' must be a positive integer.")
+    return min(value, cap) if cap is not None else value
+
+
+def _parse_objective(spec: Any) -> Tuple[str, str]:
+    if not isinstance(spec, dict) or len(spec) != 1:
+        raise ValidationError("'objective' must be {\"minimize\": <model>} or {\"maximize\": <model>}.")
+    (direction, model), = spec.items()
+    if direction not in ("minimize", "maximize") or model not in _MODELS:
+        raise ValidationError(
+            f"'objective' must be {{\"minimize\"|\"maximize\": one of {list(_MODELS)}}}."
+        )
+    return direction, model
+
+
+def _parse_constraints(spec: Any) -> Dict[str, Tuple[float, float]]:
+    if not isinstance(spec, dict):
+        raise ValidationError("'constraints' must be an object mapping models to {min, max}.")
+
+    constraints = {}
+    for model, bound in spec.items():
+        if model not in _MODELS:
+            raise ValidationError(f"Unknown constraint '{model}'. Must be one of: {list(_MODELS)}")
+        if not isinstance(bound, dict) or not set(bound) & {"min", "max"} or set(bound) - {"min", "max"}:
+            raise ValidationError(f"Constraint '{model}' must have 'min' and/or 'max'.")
+        lo = validate_numeric(f"{model}.min", bound["min"]) if "min" in bound else -np.inf
+        hi = validate_numeric(f"{model}.max", bound["max"]) if "max" in bound else np.inf
+        if lo > hi:
+            raise ValidationError(f"Constraint '{model}': min is greater than max.")
+        constraints[model] = (lo, hi)
+    return constraints
+
+
+def parse_problem(payload: Any) -> Problem:
+    """
+    Validate an optimization request:
+
+        {"fixed":       {"Material": "EN-8", "Carbon": 0.37, "Manganese": 0.8},
+         "bounds":      {"Current": [100, 180], "Heat_Input": [0.5, 1.2],
+                         "Soaking_Time": [5, 20]},
+         "objective":   {"minimize": "oxidation"},
+         "constraints": {"hardness": {"min": 330}},
+         "population": 256, "max_evaluations": 10000,
+         "time_budget_s": 1.0, "top_k": 5, "seed": 0}             # optional
+
+    Raises ValidationError for malformed requests or missing inputs.
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError("Optimization request must be a JSON object.")
+
+    bounds = payload.get("bounds")
+    if not isinstance(bounds, dict) or not bounds:
+        raise ValidationError("'bounds' must map at least one numeric input to [min, max].")
+    unknown = sorted(set(bounds) - set(_NUMERIC))
+    if unknown:
+        raise ValidationError(f"Cannot search over '{unknown[0]}'. Searchable inputs: {_NUMERIC}")
+
+    free, lower, upper = [], [], []
+    for name in _NUMERIC:
+        if name not in bounds:
+            continue
+        pair = bounds[name]
+        if not isinstance(pair, list) or len(pair) != 2:
+            raise ValidationError(f"Bounds for '{name}' must be [min, max].")
+        lo, hi = (validate_numeric(name, v) for v in pair)
+        if not (np.isfinite(lo) and np.isfinite(hi)) or lo > hi:
+            raise ValidationError(f"Bounds for '{name}' must be finite with min <= max.")
+        free.append(name)
+        lower.append(lo)
+        upper.append(hi)
+
+    objective = _parse_objective(payload.get("objective"))
+    constraints = _parse_constraints(payload.get("constraints") or {})
+
+    fixed = payload.get("fixed") or {}
+    if not isinstance(fixed, dict):
+        raise ValidationError("'fixed' must be an object.")
+
+    needed = [f for f in ALL_FEATURES if f not in free and any(
+        f in _MODELS[m] for m in {objective[1], *constraints}
+    )]
+    values, errors = validate_fields(fixed, needed)
+    if errors:
+        raise ValidationError(errors[next(f for f in needed if f in errors)])
+
+    time_budget = payload.get("time_budget_s", DEFAULT_SECONDS)
+    if isinstance(time_budget, bool) or not isinstance(time_budget, (int, float)) or time_budget <= 0:
+        raise ValidationError("'time_budget_s' must be a positive number.")
+
+    seed = payload.get("seed", 0)
+    if type(seed) is not int:
+        raise ValidationError("'seed' must be an integer.")
+
+    return Problem(
+        free=free,
+        lower=np.array(lower),
+        upper=np.array(upper),
+        fixed=values,
+        objective=objective,
+        constraints=constraints,
+        population=_positive_int(payload, "population", DEFAULT_POPULATION, cap=MAX_EVALUATIONS),
+        max_evaluations=_positive_int(payload, "max_evaluations", DEFAULT_EVALUATIONS, cap=MAX_EVALUATIONS),
+        time_budget=min(float(time_budget), MAX_SECONDS),
+        top_k=_positive_int(payload, "top_k", 5, cap=100),
+        seed=seed,
+    )
+
+
+# ---------------------------------------------------------
+# Batched candidate scoring
+# ---------------------------------------------------------
+
+def _frame(problem: Problem, X: np.ndarray, features: List[str]):
+    """Feature frame for candidate rows X (columns = problem.free)."""
+    import pandas as pd
+
+    columns = {name: X[:, k] for k, name in enumerate(problem.free)}
+    for f in features:
+        if f not in columns:
+            columns[f] = np.full(len(X), problem.fixed[f], dtype=object if f == "Material" else np.float64)
+    return pd.DataFrame(columns, columns=features)
+
+
+def _evaluate(problem: Problem, models: Dict[str, Any], X: np.ndarray) -> Dict[str, np.ndarray]:
+    """One vectorized predict per model over all candidates."""
+    out = {}
+    for name, model in models.items():
+        with metrics.stage("optimize_predict", name):
+            out[name] = np.asarray(model.predict(_frame(problem, X, _MODELS[name])), dtype=np.float64)
+        metrics.inc("predictions_total", len(X), model=name, outcome="ok")
+    return out
+
+
+def _rank_keys(problem: Problem, preds: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """(constraint violation, signed objective): lower is better for both."""
+    n = len(next(iter(preds.values())))
+    violation = np.zeros(n)
+    for name, (lo, hi) in problem.constraints.items():
+        # Relative to the bound's magnitude, so models on different scales add up fairly
+        scale = max(abs(lo) if np.isfinite(lo) else 0.0, abs(hi) if np.isfinite(hi) else 0.0, 1e-12)
+        violation += (np.maximum(lo - preds[name], 0.0) + np.maximum(preds[name] - hi, 0.0)) / scale
+
+    direction, name = problem.objective
+    objective = preds[name] if direction == "minimize" else -preds[name]
+    return violation, objective
+
+
+def _candidate(problem: Problem, x: np.ndarray, preds: Dict[str, float], violation: float) -> Dict[str, Any]:
+    inputs = dict(problem.fixed)
+    inputs.update((name, float(v)) for name, v in zip(problem.free, x))
+    return {
+        "inputs": {f: inputs[f] for f in ALL_FEATURES if f in inputs},
+        "predictions": {name: float(v) for name, v in preds.items()},
+        "feasible": bool(violation == 0.0),
+        "violation": float(violation),
+    }
+
+
+# ---------------------------------------------------------
+# Search
+# ---------------------------------------------------------
+
+def optimize(problem: Problem, backend: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Cross-entropy search over problem.free within the bounds.
+
+    Returns the best `top_k` distinct candidates (feasible first, then by
+    objective), whether any candidate met every constraint, and the search
+    stats. Model loading errors are reported as {"ok": False, "error": ...}.
+    """
+    backend = resolve_backend(backend)
+    models = {}
+    for name in problem.models:
+        model, error, _ = get_model(name, backend)
+        if model is None:
+            metrics.inc("predictions_total", model=name, outcome="model_unavailable")
+            return {"ok": False, "error": f"{name.capitalize()} model unavailable: {error}"}
+        models[name] = model
+
+    rng = np.random.default_rng(problem.seed)
+    span = problem.upper - problem.lower
+    mean = problem.lower + span / 2.0
+    std = span / 2.0
+    n_elite = max(int(problem.population * ELITE_FRACTION), 2)
+
+    # Best candidates so far (rows of X plus their scores), merged each generation
+    best_X = np.empty((0, len(problem.free)))
+    best_preds: Dict[str, np.ndarray] = {name: np.empty(0) for name in models}
+    best_keys = (np.empty(0), np.empty(0))
+
+    start = time.perf_counter()
+    evaluations, iterations, stopped = 0, 0, "evaluations"
+
+    while evaluations < problem.max_evaluations:
+        size = min(problem.population, problem.max_evaluations - evaluations)
+        if iterations == 0:
+            # Uniform over the box first, Gaussian around the elites afterwards
+            X = problem.lower + rng.random((size, len(problem.free))) * span
+        else:
+            X = np.clip(mean + std * rng.standard_normal((size, len(problem.free))),
+                        problem.lower, problem.upper)
+
+        preds = _evaluate(problem, models, X)
+        violation, objective = _rank_keys(problem, preds)
+        evaluations += size
+        iterations += 1
+
+        # Merge with the running best and keep the top population
+        X = np.vstack([best_X, X])
+        preds = {n: np.concatenate([best_preds[n], preds[n]]) for n in models}
+        violation = np.concatenate([best_keys[0], violation])
+        objective = np.concatenate([best_keys[1], objective])
+        order = np.lexsort((objective, violation))[:problem.population]
+        best_X, best_keys = X[order], (violation[order], objective[order])
+        best_preds = {n: p[order] for n, p in preds.items()}
+
+        elites = best_X[:n_elite]
+        mean, std = elites.mean(axis=0), elites.std(axis=0)
+
+        if np.all(std <= TOLERANCE * np.where(span > 0, span, 1.0)):
+            stopped = "converged"
+            break
+        if time.perf_counter() - start >= problem.time_budget:
+            stopped = "time"
+            break
+
+    # Distinct settings only (the elites collapse onto one point at convergence)
+    top, seen = [], set()
+    for i in range(len(best_X)):
+        key = tuple(np.round(best_X[i], 6))
+        if key in seen:
+            continue
+        seen.add(key)
+        preds_i = {n: best_preds[n][i] for n in models}
+        top.append(_candidate(problem, best_X[i], preds_i, best_keys[0][i]))
+        if len(top) == problem.top_k:
+            break
+
+    return {
+        "ok": True,
+        "feasible": bool(top and top[0]["feasible"]),
+        "best": top[0] if top else None,
+        "top": top,
+        "objective": {problem.objective[0]: problem.objective[1]},
+        "evaluations": evaluations,
+        "iterations": iterations,
+        "stopped": stopped,
+        "elapsed_s": round(time.perf_counter() - start, 4),
+    }
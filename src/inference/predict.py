@@ -5,22 +5,49 @@ Provides:
 - consistent response structure
 - robust error handling
 - input validation via validator.py
+- selectable inference backends (sklearn pipeline, NumPy fast path,
+  or compiled artifacts served without sklearn/joblib)
+- LRU/TTL prediction cache keyed on canonicalized inputs + artifact version
+- atomic, smoke-tested model swaps on reload (see watcher.py for polling)
+- artifacts resolved through the versioned registry when one exists (registry.py)
+- combined predict_all: validate once, run both models concurrently
+- per-stage timings and outcome counters (metrics.py, METRICS_ENABLED)
+- background warmup at boot and a readiness report (MODEL_WARMUP)
+- optional prediction intervals on the batch path (uncertainty.py)
+- optional per-row SHAP attributions on the batch path (explain.py)
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
 import traceback
-import joblib
-from typing import Any, Dict, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
 
-from src.models.pipelines import HARDNESS_FEATURES, OXIDATION_FEATURES
+# Feature lists come from validator.py (kept in sync with pipelines.py) so
+# importing this module does not pull in sklearn
 from src.inference.validator import (
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
     validate_hardness_input,
     validate_oxidation_input,
+    validate_material,
+    validate_numeric,
     to_dataframe,
+    validate_columns,
     ValidationError,
 )
+from src.inference.fastpath import compile_pipeline
+from src.inference import modelfile
+from src.inference.cache import cache_from_env
+from src.inference.artifacts import artifact_version
+from src.inference import registry
+from src.inference.uncertainty import UncertaintyUnavailable, predict_interval
+from src.inference.explain import ExplanationUnavailable, explain as explain_rows
+from src.inference import metrics
 
 # ---------------------------------------------------------
 # Model path resolution (robust across CI, local, Render)
@@ -33,15 +60,83 @@ MODEL_DIR = os.path.join(PROJECT_ROOT, "models")
 HARDNESS_MODEL_PATH = os.path.join(MODEL_DIR, "hardness_model.joblib")
 OXIDATION_MODEL_PATH = os.path.join(MODEL_DIR, "oxidation_model.joblib")
 
+# Compiled artifacts: single-file binary models (no sklearn/joblib needed to serve)
+HARDNESS_BINARY_PATH = os.path.join(MODEL_DIR, "hardness_model.bin")
+OXIDATION_BINARY_PATH = os.path.join(MODEL_DIR, "oxidation_model.bin")
+
+# Versioned registry (MODEL_REGISTRY_DIR); None or empty -> the flat paths above
+REGISTRY_DIR: Optional[str] = registry.DEFAULT_ROOT
+
 # ---------------------------------------------------------
-# Lazy-loaded models (None until first prediction call)
+# Inference backends
+#   "sklearn": full Pipeline on a one-row DataFrame (reference path)
+#   "numpy":   precompiled NumPy preprocessing + fitted estimator,
+#              no pandas on the single-sample path, bit-identical output
+#   "compiled": exported artifacts only, never imports sklearn/joblib
+#              (memory-mapped binary model files, see modelfile.py)
 # ---------------------------------------------------------
 
-_hardness_model = None
-_hardness_error = None
+BACKENDS = ("sklearn", "numpy", "compiled")
+DEFAULT_BACKEND = os.environ.get("INFERENCE_BACKEND", "sklearn")
+
+# Union of both models' inputs, in validation order
+ALL_FEATURES = list(dict.fromkeys(OXIDATION_FEATURES + HARDNESS_FEATURES))
+
+# Threads used by predict_all to run the two models concurrently (0 = sequential)
+PREDICT_THREADS = int(os.environ.get("PREDICT_THREADS", "4"))
+
+# ---------------------------------------------------------
+# Prediction cache (None when PREDICTION_CACHE_SIZE=0)
+# ---------------------------------------------------------
+
+_cache = cache_from_env()
+
+# ---------------------------------------------------------
+# Loaded model slots (lazy: nothing is loaded until first use)
+#
+# `_slots` maps slot name -> ModelSlot and is never mutated in place:
+# loads and reloads build a new dict and swap the module reference in a
+# single assignment. A request reads its slot once, so it finishes on the
+# version it started with even if a reload swaps in a new one meanwhile.
+# ---------------------------------------------------------
 
-_oxidation_model = None
-_oxidation_error = None
+class ModelSlot(NamedTuple):
+    model: Any
+    error: Optional[str]
+    version: str = ""
+    fast: Any = None  # NumPy fast path compiled from a pipeline
+
+
+_SLOT_PATHS = {
+    "hardness": HARDNESS_MODEL_PATH,
+    "oxidation": OXIDATION_MODEL_PATH,
+    "hardness_compiled": HARDNESS_BINARY_PATH,
+    "oxidation_compiled": OXIDATION_BINARY_PATH,
+}
+
+# Slot -> (registry model, artifact name inside a version directory)
+_SLOT_ARTIFACTS = {
+    name: (name.split("_")[0], os.path.basename(path)) for name, path in _SLOT_PATHS.items()
+}
+
+_COMPILED_LOADERS = {
+    "hardness_compiled": modelfile.load,
+    "oxidation_compiled": modelfile.load,
+}
+
+# Canned input used to smoke-test freshly loaded models before swapping
+_SMOKE_RECORD = {
+    "Material": "EN-8",
+    "Current": 140.0,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10.0,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+_slots: Dict[str, ModelSlot] = {}
+_swap_lock = threading.Lock()
+_reload_lock = threading.Lock()
 
 
 def _load_model(path: str) -> Tuple[Optional[Any], Optional[str]]:
@@ -50,6 +145,8 @@ def _load_model(path: str) -> Tuple[Optional[Any], Optional[str]]:
         return None, f"Model file does not exist: {path}"
 
     try:
+        import joblib  # deferred: compiled backends never need it
+
         model = joblib.load(path)
         return model, None
     except Exception as e:
@@ -58,78 +155,748 @@ def _load_model(path: str) -> Tuple[Optional[Any], Optional[str]]:
         return None, str(e)
 
 
+def _load_compiled(loader, path: str) -> Tuple[Optional[Any], Optional[str]]:
+    """Safe loader for compiled artifacts returning (model, error_message)."""
+    if not os.path.exists(path):
+        return None, f"Compiled artifact does not exist: {path}"
+
+    try:
+        return loader(path), None
+    except Exception as e:
+        print(f"[ERROR] Failed to load compiled artifact at {path}: {e}")
+        traceback.print_exc()
+        return None, str(e)
+
+
+def _compile_fast(model) -> Optional[Any]:
+    """Compile a loaded pipeline for the NumPy backend (None if unsupported)."""
+    if model is None:
+        return None
+
+    try:
+        return compile_pipeline(model)
+    except Exception as e:
+        print(f"[WARN] NumPy fast path unavailable, using sklearn pipeline: {e}")
+        return None
+
+
+def _slot_source(name: str) -> Tuple[str, str]:
+    """
+    (path, version) a slot loads from: the registry's current version when
+    it has one (version = registry version id, read from the index without
+    touching the artifact), else the flat path keyed by mtime + size.
+    """
+    if REGISTRY_DIR:
+        model, artifact = _SLOT_ARTIFACTS[name]
+        try:
+            record = registry.current(REGISTRY_DIR, model)
+        except (OSError, ValueError, registry.RegistryError) as e:
+            print(f"[WARN] Model registry unreadable, using {_SLOT_PATHS[name]}: {e}")
+            record = None
+        if record is not None and artifact in record["artifacts"]:
+            return os.path.join(record["path"], artifact), record["version"]
+
+    path = _SLOT_PATHS[name]
+    try:
+        return path, artifact_version(path)
+    except OSError:
+        return path, ""
+
+
+def _load_slot(name: str) -> ModelSlot:
+    """Load one slot from disk (no publishing)."""
+    path, version = _slot_source(name)
+
+    start = time.perf_counter()
+    if name in _COMPILED_LOADERS:
+        model, error = _load_compiled(_COMPILED_LOADERS[name], path)
+        slot = ModelSlot(model, error, version)
+    else:
+        model, error = _load_model(path)
+        slot = ModelSlot(model, error, version, _compile_fast(model))
+
+    metrics.observe("model_load_duration_seconds", time.perf_counter() - start, slot=name)
+    metrics.inc("model_loads_total", slot=name, status="ok" if model is not None else "error")
+    return slot
+
+
+def _publish(updates: Dict[str, ModelSlot]) -> None:
+    """Atomically replace the published slot mapping. Caller holds _swap_lock."""
+    global _slots
+    _slots = {**_slots, **updates}
+
+
+def _get_slot(name: str) -> ModelSlot:
+    slot = _slots.get(name)
+    if slot is not None:
+        return slot
+
+    with _swap_lock:
+        slot = _slots.get(name)
+        if slot is None:
+            slot = _load_slot(name)
+            _publish({name: slot})
+    return slot
+
+
+def slot_sources() -> Dict[str, Tuple[str, str]]:
+    """(path, version) every artifact slot would load from right now."""
+    return {name: _slot_source(name) for name in _SLOT_PATHS}
+
+
+def slot_version(name: str) -> Optional[str]:
+    """Version of slot `name` as loaded in this process; None when not loaded."""
+    slot = _slots.get(name)
+    return None if slot is None else slot.version
+
+
 def _ensure_models_loaded():
     """Load models lazily only when needed (prevents import-time failures)."""
-    global _hardness_model, _oxidation_model
-    global _hardness_error, _oxidation_error
+    _get_slot("hardness")
+    _get_slot("oxidation")
+
+
+def _ensure_compiled_loaded():
+    """Load compiled artifacts lazily; never touches the joblib pipelines."""
+    _get_slot("hardness_compiled")
+    _get_slot("oxidation_compiled")
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """Return `backend` (or the default), rejecting unknown names with ValueError."""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}'. Must be one of: {BACKENDS}")
+    return backend
 
-    if _hardness_model is None and _hardness_error is None:
-        _hardness_model, _hardness_error = _load_model(HARDNESS_MODEL_PATH)
 
-    if _oxidation_model is None and _oxidation_error is None:
-        _oxidation_model, _oxidation_error = _load_model(OXIDATION_MODEL_PATH)
+def get_model(name: str, backend: Optional[str] = None) -> Tuple[Optional[Any], Optional[str], str]:
+    """Return (model, error, version) serving `name` ("hardness"/"oxidation") for `backend`."""
+    backend = resolve_backend(backend)
+    if backend == "compiled":
+        slot = _get_slot(f"{name}_compiled")
+        return slot.model, slot.error, slot.version
+
+    slot = _get_slot(name)
+    if backend == "numpy" and slot.fast is not None:
+        return slot.fast, None, slot.version
+    return slot.model, slot.error, slot.version
 
 
 # ---------------------------------------------------------
 # Generic prediction helper
 # ---------------------------------------------------------
 
-def _predict(model, validator_fn, features, payload) -> Dict[str, Any]:
+def _run_model(model, record: Dict[str, Any], features, frame=None, name: str = "model") -> float:
+    """Single prediction from a validated record (or a prebuilt DataFrame)."""
+    if hasattr(model, "predict_record"):
+        with metrics.stage("predict", name):
+            return model.predict_record(record)
+
+    if frame is None:
+        with metrics.stage("to_dataframe", name):
+            frame = to_dataframe(record, features)
+
+    if not (metrics.ENABLED and hasattr(model, "steps")):
+        return float(model.predict(frame)[0])
+
+    # Same as Pipeline.predict, split so preprocessing and estimator are timed apart
+    with metrics.stage("transform", name):
+        X = frame
+        for _, step in model.steps[:-1]:
+            X = step.transform(X)
+    with metrics.stage("estimator", name):
+        return float(model.steps[-1][1].predict(X)[0])
+
+
+def _predict(model, validator_fn, features, payload, cache_prefix=None, name: str = "model") -> Dict[str, Any]:
     """
     Generic prediction wrapper.
-    Validates input, builds DataFrame, runs model.
+    Validates input, builds DataFrame (sklearn backend) or transforms the
+    record directly (NumPy backend), runs model.
+    Successful results are cached under cache_prefix + validated features.
     Returns a standardized response dict.
     """
     try:
-        validated = validator_fn(payload)
-        df = to_dataframe(validated, features)
-        pred = float(model.predict(df)[0])
-        return {"ok": True, "prediction": pred}
+        with metrics.stage("validate", name):
+            validated = validator_fn(payload)
+
+        key = None
+        if _cache is not None and cache_prefix is not None:
+            key = cache_prefix + tuple(validated[f] for f in features)
+            cached = _cache.get(key)
+            if cached is not None:
+                metrics.inc("predictions_total", model=name, outcome="cache_hit")
+                return dict(cached)
+
+        pred = _run_model(model, validated, features, name=name)
+
+        result = {"ok": True, "prediction": pred}
+        if key is not None:
+            _cache.set(key, result)
+        metrics.inc("predictions_total", model=name, outcome="ok")
+        return result
 
     except ValidationError as ve:
+        metrics.inc("predictions_total", model=name, outcome="validation_error")
         return {"ok": False, "error": str(ve)}
 
     except Exception as e:
+        metrics.inc("predictions_total", model=name, outcome="error")
         print("[ERROR] Unexpected prediction failure:", e)
         traceback.print_exc()
         return {"ok": False, "error": "Internal error during prediction. Check logs."}
 
 
+def _predict_batch(
+    model,
+    features,
+    rows,
+    name: str = "model",
+    level: Optional[float] = None,
+    explain: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Batch prediction wrapper.
+    Validates all rows in one columnar pass, then runs a single
+    model.predict call over the valid rows. Returns one response dict
+    per row, in input order, so a bad row only fails itself.
+    With `level`, each result also carries "std" and a central `level`
+    "interval" [lower, upper] (one pass over the model, see uncertainty.py).
+    With `explain`, each result also carries "attributions" {feature: SHAP
+    value} and their "base_value" (explain.py).
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+
+    if hasattr(rows, "columns"):
+        records = rows  # DataFrame (bulk scoring): validated column by column as is
+    else:
+        records = []
+        for i, row in enumerate(rows):
+            if isinstance(row, dict):
+                records.append(row)
+            else:
+                records.append({})
+                results[i] = {"ok": False, "error": "Each row must be a JSON object."}
+
+    try:
+        with metrics.stage("batch_validate", name):
+            frame, mask, errors = validate_columns(records, features)
+        valid_idx = np.flatnonzero(~mask)
+        stats = None
+        with metrics.stage("batch_predict", name):
+            if level is None or not len(valid_idx):
+                preds = model.predict(frame.iloc[valid_idx]) if len(valid_idx) else []
+            else:
+                stats = predict_interval(model, frame.iloc[valid_idx], level)
+                preds = stats["prediction"]
+        shap = None
+        if explain and len(valid_idx):
+            with metrics.stage("batch_explain", name):
+                base_value, names, shap = explain_rows(model, frame.iloc[valid_idx])
+    except (UncertaintyUnavailable, ExplanationUnavailable) as e:
+        metrics.inc("predictions_total", len(rows), model=name, outcome="error")
+        return [r or {"ok": False, "error": str(e)} for r in results]
+    except Exception as e:
+        metrics.inc("predictions_total", len(rows), model=name, outcome="error")
+        print("[ERROR] Unexpected batch prediction failure:", e)
+        traceback.print_exc()
+        error = "Internal error during prediction. Check logs."
+        return [r or {"ok": False, "error": error} for r in results]
+
+    metrics.inc("predictions_total", len(valid_idx), model=name, outcome="ok")
+    metrics.inc("predictions_total", len(rows) - len(valid_idx), model=name, outcome="validation_error")
+
+    for k, (i, pred) in enumerate(zip(valid_idx, preds)):
+        results[i] = {"ok": True, "prediction": float(pred)}
+        if stats is not None:
+            results[i]["std"] = float(stats["std"][k])
+            results[i]["interval"] = [float(stats["lower"][k]), float(stats["upper"][k])]
+        if shap is not None:
+            results[i]["attributions"] = dict(zip(names, shap[k].tolist()))
+            results[i]["base_value"] = base_value
+
+    for i, error in enumerate(errors):
+        if results[i] is None:
+            results[i] = {"ok": False, "error": error}
+
+    return results
+
+
 # ---------------------------------------------------------
 # Public prediction APIs
 # ---------------------------------------------------------
 
-def predict_hardness(payload: dict) -> Dict[str, Any]:
-    _ensure_models_loaded()
+def _cache_prefix(name: str, backend: str, version: str) -> Tuple[str, ...]:
+    return (name, backend, version)
+
+
+def predict_hardness(payload: dict, backend: Optional[str] = None) -> Dict[str, Any]:
+    backend = resolve_backend(backend)
+    model, error, version = get_model("hardness", backend)
+
+    if model is None:
+        metrics.inc("predictions_total", model="hardness", outcome="model_unavailable")
+        return {"ok": False, "error": f"Hardness model unavailable: {error}"}
+
+    prefix = _cache_prefix("hardness", backend, version)
+    return _predict(model, validate_hardness_input, HARDNESS_FEATURES, payload, prefix, "hardness")
 
-    if _hardness_model is None:
-        return {"ok": False, "error": f"Hardness model unavailable: {_hardness_error}"}
 
-    return _predict(_hardness_model, validate_hardness_input, HARDNESS_FEATURES, payload)
+def predict_oxidation(payload: dict, backend: Optional[str] = None) -> Dict[str, Any]:
+    backend = resolve_backend(backend)
+    model, error, version = get_model("oxidation", backend)
 
+    if model is None:
+        metrics.inc("predictions_total", model="oxidation", outcome="model_unavailable")
+        return {"ok": False, "error": f"Oxidation model unavailable: {error}"}
 
-def predict_oxidation(payload: dict) -> Dict[str, Any]:
-    _ensure_models_loaded()
+    prefix = _cache_prefix("oxidation", backend, version)
+    return _predict(model, validate_oxidation_input, OXIDATION_FEATURES, payload, prefix, "oxidation")
 
-    if _oxidation_model is None:
-        return {"ok": False, "error": f"Oxidation model unavailable: {_oxidation_error}"}
 
-    return _predict(_oxidation_model, validate_oxidation_input, OXIDATION_FEATURES, payload)
+def predict_hardness_batch(
+    rows: List[dict],
+    backend: Optional[str] = None,
+    level: Optional[float] = None,
+    explain: bool = False,
+) -> List[Dict[str, Any]]:
+    model, error, _ = get_model("hardness", backend)
+
+    if model is None:
+        metrics.inc("predictions_total", len(rows), model="hardness", outcome="model_unavailable")
+        error = f"Hardness model unavailable: {error}"
+        return [{"ok": False, "error": error} for _ in range(len(rows))]
+
+    return _predict_batch(model, HARDNESS_FEATURES, rows, "hardness", level, explain)
+
+
+def predict_oxidation_batch(
+    rows: List[dict],
+    backend: Optional[str] = None,
+    level: Optional[float] = None,
+    explain: bool = False,
+) -> List[Dict[str, Any]]:
+    model, error, _ = get_model("oxidation", backend)
+
+    if model is None:
+        metrics.inc("predictions_total", len(rows), model="oxidation", outcome="model_unavailable")
+        error = f"Oxidation model unavailable: {error}"
+        return [{"ok": False, "error": error} for _ in range(len(rows))]
+
+    return _predict_batch(model, OXIDATION_FEATURES, rows, "oxidation", level, explain)
 
 
 # ---------------------------------------------------------
-# Manual reload (useful after retraining)
+# Combined prediction (both models, one validation pass)
 # ---------------------------------------------------------
 
-def reload_models():
-    """Call to force reloading models without restarting the server."""
-    global _hardness_model, _oxidation_model
-    global _hardness_error, _oxidation_error
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+
+
+def _get_executor() -> Optional[ThreadPoolExecutor]:
+    """Per-process thread pool, created lazily (threads do not survive fork)."""
+    global _executor, _executor_pid
+
+    if PREDICT_THREADS <= 0:
+        return None
+    if _executor is None or _executor_pid != os.getpid():
+        _executor = ThreadPoolExecutor(max_workers=PREDICT_THREADS, thread_name_prefix="predict")
+        _executor_pid = os.getpid()
+    return _executor
+
 
-    print("[INFO] Reloading models from disk...")
+def validate_fields(payload: Dict[str, Any], features) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Validate each field once; return (values, errors) keyed by field name."""
+    values: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    for feature in features:
+        try:
+            if feature == "Material":
+                values[feature] = validate_material(payload.get(feature))
+            else:
+                values[feature] = validate_numeric(feature, payload.get(feature))
+        except ValidationError as ve:
+            errors[feature] = str(ve)
+    return values, errors
 
-    _hardness_model, _hardness_error = _load_model(HARDNESS_MODEL_PATH)
-    _oxidation_model, _oxidation_error = _load_model(OXIDATION_MODEL_PATH)
 
-    print("[INFO] Hardness model:", "OK" if _hardness_error is None else _hardness_error)
-    print("[INFO] Oxidation model:", "OK" if _oxidation_error is None else _oxidation_error)
+def _safe_result(job) -> Dict[str, Any]:
+    try:
+        return {"ok": True, "prediction": job()}
+    except Exception as e:
+        print("[ERROR] Unexpected prediction failure:", e)
+        traceback.print_exc()
+        return {"ok": False, "error": "Internal error during prediction. Check logs."}
+
+
+_MODEL_FEATURES = {"hardness": HARDNESS_FEATURES, "oxidation": OXIDATION_FEATURES}
+
+# Model name -> (model, load error, version), read once per request
+Models = Dict[str, Tuple[Optional[Any], Optional[str], str]]
+
+
+def _all_models(backend: str) -> Models:
+    return {name: get_model(name, backend) for name in ("oxidation", "hardness")}
+
+
+def _resolve_all(payload: Any, backend: str, models: Models):
+    """
+    Shared front half of predict_all / predict_all_many: validate the
+    payload once, then answer each model from a load error, a validation
+    error or the cache where possible. Returns (values, results, jobs);
+    jobs maps each model still to run to (model, features, cache key).
+    """
+    if not isinstance(payload, dict):
+        error = {"ok": False, "error": "Payload must be a JSON object."}
+        return {}, {"hardness": dict(error), "oxidation": dict(error)}, {}
+
+    with metrics.stage("validate", "all"):
+        values, field_errors = validate_fields(payload, ALL_FEATURES)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    jobs: Dict[str, Tuple[Any, List[str], Optional[Tuple]]] = {}
+
+    for name, features in (("oxidation", OXIDATION_FEATURES), ("hardness", HARDNESS_FEATURES)):
+        model, error, version = models[name]
+        if model is None:
+            metrics.inc("predictions_total", model=name, outcome="model_unavailable")
+            results[name] = {"ok": False, "error": f"{name.capitalize()} model unavailable: {error}"}
+            continue
+
+        first_error = next((field_errors[f] for f in features if f in field_errors), None)
+        if first_error is not None:
+            metrics.inc("predictions_total", model=name, outcome="validation_error")
+            results[name] = {"ok": False, "error": first_error}
+            continue
+
+        key = None
+        if _cache is not None:
+            key = _cache_prefix(name, backend, version) + tuple(values[f] for f in features)
+            cached = _cache.get(key)
+            if cached is not None:
+                metrics.inc("predictions_total", model=name, outcome="cache_hit")
+                results[name] = dict(cached)
+                continue
+
+        jobs[name] = (model, features, key)
+
+    return values, results, jobs
+
+
+def predict_all(payload: dict, backend: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Predict hardness and oxidation for one sample.
+
+    The union of both models' fields is validated once; each model reports
+    the first failing field in its own feature order, exactly like
+    predict_hardness / predict_oxidation. When both models need to run on
+    the sklearn or NumPy backends, oxidation runs on a thread pool while
+    hardness runs here (forest predict releases the GIL), so latency is
+    the max of the two rather than the sum.
+
+    Returns {"hardness": result, "oxidation": result}.
+    """
+    backend = resolve_backend(backend)
+    values, results, jobs = _resolve_all(payload, backend, _all_models(backend))
+
+    # One shared frame for both pipelines (ColumnTransformer selects by name)
+    frame = None
+    if backend == "sklearn" and jobs:
+        with metrics.stage("to_dataframe", "all"):
+            frame = to_dataframe(values, ALL_FEATURES if len(jobs) == 2 else jobs[next(iter(jobs))][1])
+
+    def job_for(name):
+        model, features, _ = jobs[name]
+        return lambda: _run_model(model, values, features, frame, name)
+
+    executor = _get_executor() if backend != "compiled" else None
+    future = None
+    if len(jobs) == 2 and executor is not None:
+        future = executor.submit(_safe_result, job_for("oxidation"))
+
+    for name in jobs:
+        if name == "oxidation" and future is not None:
+            continue
+        results[name] = _safe_result(job_for(name))
+
+    if future is not None:
+        results["oxidation"] = future.result()
+
+    for name, (_, _, key) in jobs.items():
+        ok = results[name]["ok"]
+        metrics.inc("predictions_total", model=name, outcome="ok" if ok else "error")
+        if key is not None and ok:
+            _cache.set(key, results[name])
+
+    return {"hardness": results["hardness"], "oxidation": results["oxidation"]}
+
+
+def predict_all_many(payloads: List[Any], backend: Optional[str] = None) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    predict_all for many independent requests (the ASGI micro-batcher):
+    the same validation, error messages and cache as predict_all, but the
+    cache misses of each model are scored with one vectorized predict.
+    Returns one {"hardness": result, "oxidation": result} per payload.
+    """
+    import pandas as pd
+
+    backend = resolve_backend(backend)
+    models = _all_models(backend)
+    out: List[Dict[str, Dict[str, Any]]] = []
+    pending: Dict[str, List[Tuple[int, Dict[str, Any], Optional[Tuple]]]] = {}
+
+    for i, payload in enumerate(payloads):
+        values, results, jobs = _resolve_all(payload, backend, models)
+        out.append(results)
+        for name, (_, _, key) in jobs.items():
+            pending.setdefault(name, []).append((i, values, key))
+
+    for name, items in pending.items():
+        model, features = models[name][0], _MODEL_FEATURES[name]
+        frame = pd.DataFrame([[values[f] for f in features] for _, values, _ in items], columns=features)
+        try:
+            with metrics.stage("batch_predict", name):
+                preds = [float(p) for p in model.predict(frame)]
+        except Exception as e:
+            print("[ERROR] Unexpected batch prediction failure:", e)
+            traceback.print_exc()
+            preds = None
+
+        for k, (i, _, key) in enumerate(items):
+            if preds is None:
+                out[i][name] = {"ok": False, "error": "Internal error during prediction. Check logs."}
+                metrics.inc("predictions_total", model=name, outcome="error")
+                continue
+            out[i][name] = {"ok": True, "prediction": preds[k]}
+            metrics.inc("predictions_total", model=name, outcome="ok")
+            if key is not None:
+                _cache.set(key, out[i][name])
+
+    return [{"hardness": r["hardness"], "oxidation": r["oxidation"]} for r in out]
+
+
+def predict_all_batch(
+    rows: List[dict],
+    backend: Optional[str] = None,
+    level: Optional[float] = None,
+    explain: bool = False,
+) -> List[Dict[str, Dict[str, Any]]]:
+    """
+    Batch counterpart of predict_all: one vectorized predict per model.
+    `rows` is a list of dicts or a DataFrame (bulk.py scores CSV chunks as is).
+    Returns [{"hardness": result, "oxidation": result}, ...] in input order;
+    results carry "std" and "interval" when `level` is given, and
+    "attributions" and "base_value" with `explain`.
+    """
+    hardness = predict_hardness_batch(rows, backend, level, explain)
+    oxidation = predict_oxidation_batch(rows, backend, level, explain)
+    return [{"hardness": h, "oxidation": o} for h, o in zip(hardness, oxidation)]
+
+
+def flatten_result(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """predict_all output → public response row (prediction or error per model)."""
+    hardness, oxidation = results["hardness"], results["oxidation"]
+    flat = {
+        "hardness": hardness.get("prediction"),
+        "oxidation": oxidation.get("prediction"),
+        "hardness_error": hardness.get("error"),
+        "oxidation_error": oxidation.get("error"),
+    }
+    # Uncertainty mode only
+    for name, result in (("hardness", hardness), ("oxidation", oxidation)):
+        if "interval" in result:
+            flat[f"{name}_std"] = result["std"]
+            flat[f"{name}_interval"] = result["interval"]
+    # Explain mode only
+    for name, result in (("hardness", hardness), ("oxidation", oxidation)):
+        if "attributions" in result:
+            flat[f"{name}_attributions"] = result["attributions"]
+            flat[f"{name}_base_value"] = result["base_value"]
+    return flat
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss/eviction counters of the prediction cache ({} when disabled)."""
+    return _cache.stats() if _cache is not None else {}
+
+
+# ---------------------------------------------------------
+# Preload (call in the gunicorn master before forking)
+# ---------------------------------------------------------
+
+def preload_models(backend: Optional[str] = None) -> None:
+    """
+    Load the models for `backend` eagerly.
+    Called from gunicorn's `on_starting` hook with preload_app, so forked
+    workers inherit already-loaded models; compiled forest arrays are
+    memory-mapped and share one page-cache copy across workers.
+    """
+    backend = resolve_backend(backend)
+    _warmup.update(state="loading", error=None)
+    start = time.perf_counter()
+
+    try:
+        if backend == "compiled":
+            _ensure_compiled_loaded()
+        else:
+            _ensure_models_loaded()
+    except Exception as e:
+        _warmup.update(state="failed", error=str(e))
+        raise
+
+    failed = {n: m for n, m in readiness(backend)["models"].items() if m != "loaded"}
+    _warmup.update(
+        state="failed" if failed else "ready",
+        error="; ".join(f"{n} {m}" for n, m in failed.items()) or None,
+        seconds=round(time.perf_counter() - start, 3),
+    )
+    print(f"[INFO] Preloaded models for backend '{backend}'")
+
+
+# ---------------------------------------------------------
+# Startup warmup / readiness
+# ---------------------------------------------------------
+
+# "background" (default): load on a daemon thread at boot, serve meanwhile
+# "blocking": load before serving; "lazy": load on the first request
+WARMUP_MODES = ("background", "blocking", "lazy")
+WARMUP_MODE = os.environ.get("MODEL_WARMUP", "background")
+
+_warmup: Dict[str, Any] = {"state": "idle", "error": None, "seconds": None}
+_warmup_thread: Optional[threading.Thread] = None
+
+
+def _background_warmup(backend: str) -> None:
+    try:
+        preload_models(backend)
+    except Exception as e:
+        print(f"[ERROR] Background model warmup failed: {e}")
+        traceback.print_exc()
+
+
+def warm_up(mode: Optional[str] = None, backend: Optional[str] = None) -> Optional[threading.Thread]:
+    """
+    Start loading models according to `mode` (default MODEL_WARMUP).
+    Idempotent per process; call it after fork, since threads do not survive it.
+    Requests that arrive during a background warmup wait on the slot lock
+    rather than loading the same model twice.
+    """
+    global _warmup_thread
+
+    mode = mode or WARMUP_MODE
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown MODEL_WARMUP '{mode}'. Choose one of {WARMUP_MODES}.")
+
+    backend = resolve_backend(backend)
+    if mode == "lazy" or all(name in _slots for name in _backend_slots(backend)):
+        return None
+
+    if mode == "blocking":
+        preload_models(backend)
+        return None
+
+    if _warmup_thread is None or not _warmup_thread.is_alive():
+        _warmup_thread = threading.Thread(
+            target=_background_warmup, args=(backend,), name="model-warmup", daemon=True
+        )
+        _warmup_thread.start()
+    return _warmup_thread
+
+
+def readiness(backend: Optional[str] = None) -> Dict[str, Any]:
+    """Whether the models for `backend` are loaded (never triggers a load)."""
+    backend = resolve_backend(backend)
+
+    models = {}
+    for name in _backend_slots(backend):
+        slot = _slots.get(name)
+        if slot is None:
+            models[name] = "not_loaded"
+        elif slot.model is None:
+            models[name] = f"error: {slot.error}"
+        else:
+            models[name] = "loaded"
+
+    return {
+        "ready": all(state == "loaded" for state in models.values()),
+        "backend": backend,
+        "models": models,
+        "versions": {name: _slots[name].version for name in models if name in _slots},
+        "warmup": dict(_warmup),
+    }
+
+
+# ---------------------------------------------------------
+# Reload / hot swap (useful after retraining)
+# ---------------------------------------------------------
+
+def _smoke_test(name: str, slot: ModelSlot) -> Optional[str]:
+    """Run one canned prediction through a freshly loaded slot; return an error or None."""
+    features = HARDNESS_FEATURES if name.startswith("hardness") else OXIDATION_FEATURES
+    record = {f: _SMOKE_RECORD[f] for f in features}
+
+    try:
+        for model in (slot.model, slot.fast):
+            if model is None:
+                continue
+            if hasattr(model, "predict_record"):
+                pred = model.predict_record(record)
+            else:
+                pred = float(model.predict(to_dataframe(record, features))[0])
+            if not np.isfinite(pred):
+                return f"non-finite smoke prediction: {pred}"
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _backend_slots(backend: str) -> List[str]:
+    if backend == "compiled":
+        return ["hardness_compiled", "oxidation_compiled"]
+    return ["hardness", "oxidation"]
+
+
+def reload_models(names: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Reload model artifacts without restarting the server.
+
+    New artifacts are loaded and smoke-tested off to the side, then all
+    slots are swapped in one atomic step. A slot that fails to load or to
+    predict keeps serving its previous version. Returns {slot: error or None}.
+    Safe to call from a background thread (see watcher.py).
+    """
+    with _reload_lock:
+        if names is None:
+            names = sorted(_slots) or _backend_slots(resolve_backend(None))
+
+        print("[INFO] Reloading models from disk...")
+
+        fresh: Dict[str, ModelSlot] = {}
+        status: Dict[str, Optional[str]] = {}
+        for name in names:
+            slot = _load_slot(name)
+            if slot.error is None:
+                smoke_error = _smoke_test(name, slot)
+                if smoke_error is not None:
+                    slot = ModelSlot(None, f"Smoke prediction failed: {smoke_error}", slot.version)
+
+            status[name] = slot.error
+            previous = _slots.get(name)
+            if slot.error is not None and previous is not None and previous.model is not None:
+                print(f"[WARN] Keeping previous {name} model: {slot.error}")
+                continue
+            fresh[name] = slot
+
+        with _swap_lock:
+            _publish(fresh)
+
+        # Versions are part of the cache key, but clear eagerly to free memory
+        if _cache is not None:
+            _cache.clear()
+
+        for name, error in status.items():
+            print(f"[INFO] {name} model:", "OK" if error is None else error)
+
+        return status
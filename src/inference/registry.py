@@ -0,0 +1,298 @@
+"""
+Versioned on-disk model registry.
+
+Layout under the registry root (MODEL_REGISTRY_DIR, default models/registry):
+
+    index.json                          current version + history per model
+    <model>/<version>/<artifact files>  one immutable directory per version
+
+Training publishes every run as a new version: the artifacts are copied
+(hard-linked when possible) into a fresh version directory, which is
+renamed into place complete, then index.json is replaced atomically. So
+switching the current version, forward or back, is one rename of a small
+file, and version directories are never modified once written. Workers
+that still memory-map an older version keep valid data.
+
+The index holds what the serving side needs without unpickling anything:
+the current version id per model and, per version, the artifact content
+hashes, training-data hash and metrics. The version id doubles as a cheap
+version key for the prediction cache and for hot reload.
+
+Command line (rollback points the index at an earlier version):
+
+    python -m src.inference.registry list [MODEL]
+    python -m src.inference.registry rollback MODEL [--to VERSION]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.inference.artifacts import atomic_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, single writer assumed
+    fcntl = None
+
+FORMAT_NAME = "model-registry"
+FORMAT_VERSION = 1
+INDEX_NAME = "index.json"
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_ROOT = os.environ.get(
+    "MODEL_REGISTRY_DIR",
+    os.path.abspath(os.path.join(THIS_DIR, "..", "..", "models", "registry")),
+)
+
+
+class RegistryError(Exception):
+    """Unknown model or version, or a malformed index."""
+
+
+# ---------------------------------------------------------
+# Hashing
+# ---------------------------------------------------------
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# ---------------------------------------------------------
+# Index
+# ---------------------------------------------------------
+
+def _index_path(root: str) -> str:
+    return os.path.join(root, INDEX_NAME)
+
+
+def read_index(root: str) -> Dict[str, Any]:
+    """The parsed index ({"models": {}} when the registry is empty)."""
+    try:
+        with open(_index_path(root)) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        return {"format": FORMAT_NAME, "version": FORMAT_VERSION, "models": {}}
+
+    if index.get("format") != FORMAT_NAME or index.get("version") != FORMAT_VERSION:
+        raise RegistryError(
+            f"Unsupported registry index: format={index.get('format')!r}, "
+            f"version={index.get('version')!r}"
+        )
+    return index
+
+
+def _write_index(root: str, index: Dict[str, Any]) -> None:
+    with atomic_path(_index_path(root)) as tmp, open(tmp, "w") as f:
+        json.dump(index, f, indent=4)
+
+
+@contextmanager
+def _locked(root: str) -> Iterator[None]:
+    """Serialize index read-modify-write cycles across processes."""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def _entry(index: Dict[str, Any], model: str) -> Dict[str, Any]:
+    entry = index["models"].get(model)
+    if entry is None:
+        raise RegistryError(f"No versions registered for model '{model}'.")
+    return entry
+
+
+def _record(root: str, model: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    return {**record, "model": model, "path": os.path.join(root, model, record["version"])}
+
+
+def current(root: str, model: str) -> Optional[Dict[str, Any]]:
+    """
+    Record of the current version of `model` (None when not registered):
+    version, created, artifacts {name: sha256}, data_hash, metrics, path.
+    """
+    entry = read_index(root)["models"].get(model)
+    if entry is None or entry.get("current") is None:
+        return None
+    for record in entry["versions"]:
+        if record["version"] == entry["current"]:
+            return _record(root, model, record)
+    raise RegistryError(f"Index points {model} at missing version {entry['current']}.")
+
+
+def live_path(root: Optional[str], model: str, flat_path: str) -> str:
+    """
+    Where the live copy of an artifact is: inside the current registry
+    version when it holds a file named like `flat_path`, else `flat_path`
+    itself. After a rollback the two differ.
+    """
+    record = current(root, model) if root else None
+    name = os.path.basename(flat_path)
+    if record is not None and name in record["artifacts"]:
+        return os.path.join(record["path"], name)
+    return flat_path
+
+
+def versions(root: str, model: str) -> List[Dict[str, Any]]:
+    """Every registered version of `model`, oldest first."""
+    entry = _entry(read_index(root), model)
+    return [_record(root, model, r) for r in entry["versions"]]
+
+
+# ---------------------------------------------------------
+# Publish / rollback
+# ---------------------------------------------------------
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        # Safe to share inodes: artifacts are only ever replaced, never rewritten
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _write_version_dir(target: str, artifacts: Dict[str, str]) -> None:
+    """Link the artifacts into a temporary sibling of `target`, then rename it into place."""
+    parent = os.path.dirname(target)
+    tmp = os.path.join(parent, f".{os.path.basename(target)}.tmp-{uuid.uuid4().hex[:12]}")
+    os.makedirs(tmp)
+    try:
+        for name, path in artifacts.items():
+            _link_or_copy(path, os.path.join(tmp, name))
+        os.rename(tmp, target)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def publish(
+    root: str,
+    model: str,
+    artifacts: Dict[str, str],
+    data_hash: Optional[str] = None,
+    metrics: Optional[Dict[str, float]] = None,
+    hashes: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Register `artifacts` ({name in the version dir: source path}) as the
+    new current version of `model` and return its record. `hashes` may
+    carry digests the caller already computed.
+    """
+    hashes = dict(hashes or {})
+    for name, path in artifacts.items():
+        if name not in hashes:
+            hashes[name] = file_digest(path)
+
+    content = hashlib.sha256(
+        "".join(f"{n}\0{hashes[n]}\n" for n in sorted(hashes)).encode()
+    ).hexdigest()
+    version = f"{time.strftime('%Y%m%dT%H%M%S')}-{content[:12]}"
+
+    record = {
+        "version": version,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "artifacts": {n: hashes[n] for n in sorted(hashes)},
+        "data_hash": data_hash,
+        "metrics": metrics or {},
+    }
+
+    target = os.path.join(root, model, version)
+    with _locked(root):
+        if not os.path.exists(target):
+            _write_version_dir(target, artifacts)
+
+        index = read_index(root)
+        entry = index["models"].setdefault(model, {"current": None, "versions": []})
+        entry["versions"] = [r for r in entry["versions"] if r["version"] != version] + [record]
+        entry["current"] = version
+        _write_index(root, index)
+
+    print(f"[INFO] Registered {model} version {version}")
+    return _record(root, model, record)
+
+
+def rollback(root: str, model: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Point `model` at `version`, or by default at the version published
+    before the current one. Returns the new current record.
+    """
+    with _locked(root):
+        index = read_index(root)
+        entry = _entry(index, model)
+        known = [r["version"] for r in entry["versions"]]
+
+        if version is None:
+            position = known.index(entry["current"]) if entry["current"] in known else len(known)
+            if position == 0:
+                raise RegistryError(f"{model} is already at its oldest version {known[0]}.")
+            version = known[position - 1]
+        elif version not in known:
+            raise RegistryError(f"Unknown {model} version '{version}'. Known: {known}")
+
+        if not os.path.isdir(os.path.join(root, model, version)):
+            raise RegistryError(f"Version directory missing for {model} {version}.")
+
+        previous, entry["current"] = entry["current"], version
+        _write_index(root, index)
+
+    print(f"[INFO] {model}: {previous} -> {version}")
+    return current(root, model)
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect the model registry or roll back a model.")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Registry directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = sub.add_parser("list", help="List registered versions")
+    list_cmd.add_argument("model", nargs="?")
+
+    rollback_cmd = sub.add_parser("rollback", help="Make an earlier version current")
+    rollback_cmd.add_argument("model")
+    rollback_cmd.add_argument("--to", default=None, metavar="VERSION",
+                              help="Version to restore (default: the one before current)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "rollback":
+            rollback(args.root, args.model, args.to)
+            return 0
+
+        index = read_index(args.root)
+        for model in [args.model] if args.model else sorted(index["models"]):
+            entry = _entry(index, model)
+            for record in entry["versions"]:
+                marker = "*" if record["version"] == entry["current"] else " "
+                print(f"{marker} {model} {record['version']}  {record['created']}  {record['metrics']}")
+        return 0
+    except RegistryError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
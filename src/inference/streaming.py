@@ -0,0 +1,96 @@
+"""
+Incremental bulk scoring helpers.
+
+Input lines are parsed lazily, grouped into fixed-size chunks and scored
+with one vectorized predict per model per chunk, so memory stays bounded
+by the chunk size no matter how large the input is. Shared by the
+streaming HTTP endpoint and the offline bulk CLI.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.inference.predict import flatten_result, predict_all_batch
+
+CHUNK_ROWS = int(os.environ.get("STREAM_CHUNK_ROWS", "1000"))
+
+RESULT_COLUMNS = ["hardness", "oxidation", "hardness_error", "oxidation_error"]
+
+
+def iter_text_lines(stream, encoding: str = "utf-8") -> Iterator[str]:
+    """Decode a binary stream line by line (keeps line endings for csv)."""
+    for raw in stream:
+        yield raw.decode(encoding)
+
+
+def iter_chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_ndjson_rows(lines: Iterable[str]) -> Iterator[Any]:
+    """One JSON object per line; blank lines are skipped, bad lines yield None."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def score_chunks(
+    rows: Iterable[Any],
+    chunk_size: Optional[int] = None,
+    score_fn: Callable[[List[Any]], List[Dict[str, Any]]] = predict_all_batch,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield flat results chunk by chunk, in input order."""
+    for chunk in iter_chunks(rows, chunk_size or CHUNK_ROWS):
+        yield [flatten_result(r) for r in score_fn(chunk)]
+
+
+def stream_ndjson(lines: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[str]:
+    """NDJSON in → NDJSON out, one result object per input row."""
+    index = 0
+    for results in score_chunks(iter_ndjson_rows(lines), chunk_size):
+        out = io.StringIO()
+        for result in results:
+            out.write(json.dumps({"row": index, **result}))
+            out.write("\n")
+            index += 1
+        yield out.getvalue()
+
+
+def stream_csv(lines: Iterable[str], chunk_size: Optional[int] = None) -> Iterator[str]:
+    """CSV in → CSV out: the input columns followed by the result columns."""
+    reader = csv.DictReader(lines)
+    header_written = False
+
+    for inputs in iter_chunks(reader, chunk_size or CHUNK_ROWS):
+        results = [flatten_result(r) for r in predict_all_batch(inputs)]
+        fieldnames = list(reader.fieldnames or [])
+
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        if not header_written:
+            writer.writerow(fieldnames + RESULT_COLUMNS)
+            header_written = True
+        for row, result in zip(inputs, results):
+            writer.writerow(
+                [row.get(f) for f in fieldnames]
+                + ["" if result[c] is None else result[c] for c in RESULT_COLUMNS]
+            )
+        yield out.getvalue()
+
+    if not header_written and reader.fieldnames:
+        yield ",".join(list(reader.fieldnames) + RESULT_COLUMNS) + "\n"
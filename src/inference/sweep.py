@@ -0,0 +1,331 @@
+"""
+Parameter sweeps (response surfaces) over a grid of process settings.
+
+A sweep fixes some inputs and varies others over ranges or explicit value
+lists; every point of the Cartesian product is scored by both models with
+vectorized predict calls of at most SWEEP_BATCH_ROWS rows. Each model is
+evaluated only over the axes it actually uses (e.g. hardness ignores
+Soaking_Time) and broadcast across the rest.
+
+- run_sweep: dense nested arrays shaped like the grid, ready for contour
+  plots; grids above `max_points` are downsampled evenly per axis (only
+  the kept points are scored)
+- stream_sweep: every grid point as NDJSON, chunk by chunk
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.inference import metrics
+from src.inference.predict import (
+    ALL_FEATURES,
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    get_model,
+    resolve_backend,
+    validate_fields,
+)
+from src.inference.validator import ValidationError, validate_material, validate_numeric
+
+# Points returned by run_sweep (larger grids are downsampled to fit)
+MAX_POINTS = int(os.environ.get("SWEEP_MAX_POINTS", "100000"))
+# Points a streamed sweep may cover
+STREAM_MAX_POINTS = int(os.environ.get("SWEEP_STREAM_MAX_POINTS", "10000000"))
+# Rows per vectorized predict call
+BATCH_ROWS = int(os.environ.get("SWEEP_BATCH_ROWS", "65536"))
+
+_MODELS = {"hardness": HARDNESS_FEATURES, "oxidation": OXIDATION_FEATURES}
+
+
+class SweepTooLarge(ValidationError):
+    """The requested grid exceeds the configured point limit."""
+
+
+class Axis(NamedTuple):
+    name: str
+    values: np.ndarray  # float64, or object (strings) for Material
+
+
+class SweepSpec(NamedTuple):
+    axes: List[Axis]
+    fixed: Dict[str, Any]         # validated fixed inputs
+    fixed_errors: Dict[str, str]  # fixed inputs that are missing/invalid
+    models: List[str]
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(a.values) for a in self.axes)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64))
+
+
+# ---------------------------------------------------------
+# Request parsing
+# ---------------------------------------------------------
+
+def _parse_axis(name: str, spec: Any, max_points: int) -> Axis:
+    if isinstance(spec, list):
+        spec = {"values": spec}
+    if not isinstance(spec, dict):
+        raise ValidationError(f"Axis '{name}' must be a list of values or an object.")
+
+    if "values" in spec:
+        raw = spec["values"]
+        if not isinstance(raw, list) or not raw:
+            raise ValidationError(f"Axis '{name}': 'values' must be a non-empty list.")
+        if len(raw) > max_points:
+            raise SweepTooLarge(f"Axis '{name}' has {len(raw)} values (max {max_points}).")
+        if name == "Material":
+            return Axis(name, np.array([validate_material(v) for v in raw], dtype=object))
+        return Axis(name, np.array([validate_numeric(name, v) for v in raw], dtype=np.float64))
+
+    if name == "Material":
+        raise ValidationError("Axis 'Material' needs an explicit 'values' list.")
+
+    missing = [k for k in ("min", "max", "steps") if k not in spec]
+    if missing:
+        raise ValidationError(f"Axis '{name}' needs 'values' or 'min', 'max' and 'steps' (missing {missing}).")
+
+    lo = validate_numeric(f"{name}.min", spec["min"])
+    hi = validate_numeric(f"{name}.max", spec["max"])
+    steps = spec["steps"]
+    if isinstance(steps, bool) or not isinstance(steps, int) or steps < 1:
+        raise ValidationError(f"Axis '{name}': 'steps' must be a positive integer.")
+    if steps > max_points:
+        raise SweepTooLarge(f"Axis '{name}' has {steps} steps (max {max_points}).")
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        raise ValidationError(f"Axis '{name}': 'min' and 'max' must be finite.")
+
+    return Axis(name, np.linspace(lo, hi, steps))
+
+
+def parse_sweep(payload: Any, max_points: int = STREAM_MAX_POINTS) -> SweepSpec:
+    """
+    Validate a sweep request:
+
+        {"fixed":  {"Material": "EN-8", "Carbon": 0.37, ...},
+         "axes":   {"Current": {"min": 100, "max": 180, "steps": 81},
+                    "Heat_Input": [0.5, 0.7, 0.9]},
+         "models": ["hardness", "oxidation"]}          # optional
+
+    Axes override fixed values of the same name. A model whose inputs are
+    neither swept nor validly fixed reports an error instead of results;
+    malformed requests raise ValidationError (SweepTooLarge above `max_points`).
+    """
+    if not isinstance(payload, dict):
+        raise ValidationError("Sweep request must be a JSON object.")
+
+    axes_spec = payload.get("axes")
+    if not isinstance(axes_spec, dict) or not axes_spec:
+        raise ValidationError("'axes' must be an object mapping feature names to ranges.")
+
+    fixed = payload.get("fixed") or {}
+    if not isinstance(fixed, dict):
+        raise ValidationError("'fixed' must be an object.")
+
+    models = payload.get("models") or list(_MODELS)
+    if not isinstance(models, list) or any(m not in _MODELS for m in models):
+        raise ValidationError(f"'models' must be a list drawn from {list(_MODELS)}.")
+
+    unknown = sorted(set(axes_spec) - set(ALL_FEATURES))
+    if unknown:
+        raise ValidationError(f"Unknown sweep axis '{unknown[0]}'. Must be one of: {ALL_FEATURES}")
+    # Axes in feature order, so the grid layout does not depend on JSON key order
+    axes = [_parse_axis(name, axes_spec[name], max_points) for name in ALL_FEATURES if name in axes_spec]
+
+    swept = {a.name for a in axes}
+    values, errors = validate_fields(fixed, [f for f in ALL_FEATURES if f not in swept])
+
+    spec = SweepSpec(axes, values, errors, [m for m in _MODELS if m in models])
+    if spec.size > max_points:
+        raise SweepTooLarge(f"Sweep grid has {spec.size} points (max {max_points}).")
+    return spec
+
+
+# ---------------------------------------------------------
+# Downsampling
+# ---------------------------------------------------------
+
+def _downsampled_sizes(shape: Tuple[int, ...], max_points: int) -> List[int]:
+    """Largest per-axis sizes (<= shape) whose product fits in max_points."""
+    sizes = list(shape)
+    remaining = sorted(range(len(shape)), key=lambda i: shape[i])
+    budget = float(max(max_points, 1))
+
+    # Small axes are kept whole; the rest share what is left equally
+    while remaining:
+        share = budget ** (1.0 / len(remaining))
+        i = remaining[0]
+        if shape[i] <= share:
+            budget /= shape[i]
+            remaining.pop(0)
+            continue
+        for j in remaining:
+            sizes[j] = max(int(share + 1e-9), 1)
+        break
+    return sizes
+
+
+def downsample(spec: SweepSpec, max_points: int) -> SweepSpec:
+    """Evenly spaced subset of each axis (endpoints kept) with at most max_points points."""
+    if spec.size <= max_points:
+        return spec
+
+    axes = []
+    for axis, size in zip(spec.axes, _downsampled_sizes(spec.shape, max_points)):
+        n = len(axis.values)
+        keep = np.round(np.linspace(0, n - 1, size)).astype(np.intp) if size > 1 else np.array([0])
+        axes.append(Axis(axis.name, axis.values[keep]))
+    return spec._replace(axes=axes)
+
+
+# ---------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------
+
+def _model_error(name: str, spec: SweepSpec) -> Optional[str]:
+    """First missing/invalid fixed input of the model, in its feature order."""
+    return next((spec.fixed_errors[f] for f in _MODELS[name] if f in spec.fixed_errors), None)
+
+
+def _frame(axes: List[Axis], shape: Tuple[int, ...], flat: np.ndarray, fixed: Dict[str, Any], features):
+    """Feature frame for the grid points at flat (C-order) indices."""
+    import pandas as pd
+
+    index = np.unravel_index(flat, shape) if axes else ()
+    columns = {a.name: a.values[i] for a, i in zip(axes, index)}
+    n = len(flat)
+    for f in features:
+        if f not in columns:
+            columns[f] = np.full(n, fixed[f], dtype=object if f == "Material" else np.float64)
+    return pd.DataFrame(columns, columns=features)
+
+
+def _score(model, name: str, axes: List[Axis], fixed: Dict[str, Any], start: int, stop: int) -> np.ndarray:
+    """Predictions for grid points [start, stop) in BATCH_ROWS-sized calls."""
+    shape = tuple(len(a.values) for a in axes)
+    out = np.empty(stop - start, dtype=np.float64)
+    for lo in range(start, stop, BATCH_ROWS):
+        hi = min(lo + BATCH_ROWS, stop)
+        frame = _frame(axes, shape, np.arange(lo, hi), fixed, _MODELS[name])
+        with metrics.stage("sweep_predict", name):
+            out[lo - start:hi - start] = model.predict(frame)
+    metrics.inc("predictions_total", stop - start, model=name, outcome="ok")
+    return out
+
+
+def _surface(model, name: str, spec: SweepSpec) -> np.ndarray:
+    """Model output over the full grid, computed on the model's own axes only."""
+    own = [a for a in spec.axes if a.name in _MODELS[name]]
+    own_shape = tuple(len(a.values) for a in own)
+    values = _score(model, name, own, spec.fixed, 0, int(np.prod(own_shape, dtype=np.int64)))
+
+    # Unused axes become length-1 dimensions, then broadcast
+    expanded = [len(a.values) if a.name in _MODELS[name] else 1 for a in spec.axes]
+    return np.broadcast_to(values.reshape(expanded), spec.shape)
+
+
+def _axis_values(axis: Axis) -> List[Any]:
+    return axis.values.tolist()
+
+
+def run_sweep(
+    spec: SweepSpec,
+    max_points: Optional[int] = None,
+    backend: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Score the sweep grid (downsampled to at most `max_points`, capped at
+    SWEEP_MAX_POINTS) and return dense nested lists, axis-major in axis order:
+    result["hardness"][i][j] is the prediction at axes[0][i], axes[1][j].
+    """
+    limit = min(max_points or MAX_POINTS, MAX_POINTS)
+    requested = spec.shape
+    spec = downsample(spec, limit)
+    backend = resolve_backend(backend)
+
+    response: Dict[str, Any] = {
+        "axes": [{"name": a.name, "values": _axis_values(a)} for a in spec.axes],
+        "shape": list(spec.shape),
+        "requested_shape": list(requested),
+        "downsampled": spec.shape != requested,
+        "fixed": spec.fixed,
+    }
+
+    for name in spec.models:
+        model, error, _ = get_model(name, backend)
+        if model is None:
+            metrics.inc("predictions_total", model=name, outcome="model_unavailable")
+            error = f"{name.capitalize()} model unavailable: {error}"
+        else:
+            error = _model_error(name, spec)
+
+        if error is not None:
+            response[name], response[f"{name}_error"] = None, error
+            continue
+        response[name] = _surface(model, name, spec).tolist()
+        response[f"{name}_error"] = None
+
+    return response
+
+
+def stream_sweep(
+    spec: SweepSpec,
+    backend: Optional[str] = None,
+    chunk_size: int = BATCH_ROWS,
+) -> Iterator[str]:
+    """
+    Every grid point as one NDJSON line, in C order of the axes:
+    {"point": i, "<axis>": value, ..., "hardness": ..., "oxidation": ...,
+     "hardness_error": ..., "oxidation_error": ...}
+    """
+    backend = resolve_backend(backend)
+
+    runnable, errors = {}, {}
+    for name in spec.models:
+        model, error, _ = get_model(name, backend)
+        if model is None:
+            errors[name] = f"{name.capitalize()} model unavailable: {error}"
+        else:
+            errors[name] = _model_error(name, spec)
+            if errors[name] is None:
+                runnable[name] = model
+
+    # Models run on their own axes; each full-grid point maps into that sub-grid
+    own_axes = {
+        name: [i for i, a in enumerate(spec.axes) if a.name in _MODELS[name]] for name in runnable
+    }
+
+    for start in range(0, spec.size, chunk_size):
+        flat = np.arange(start, min(start + chunk_size, spec.size))
+        index = np.unravel_index(flat, spec.shape) if spec.axes else ()
+        columns = {a.name: a.values[i].tolist() for a, i in zip(spec.axes, index)}
+
+        for name, model in runnable.items():
+            axes = [spec.axes[i] for i in own_axes[name]]
+            sub_shape = tuple(len(a.values) for a in axes)
+            sub_flat = np.zeros(len(flat), dtype=np.intp)
+            if axes:
+                sub_flat = np.ravel_multi_index([index[i] for i in own_axes[name]], sub_shape)
+
+            frame = _frame(axes, sub_shape, sub_flat, spec.fixed, _MODELS[name])
+            with metrics.stage("sweep_predict", name):
+                columns[name] = model.predict(frame).tolist()
+            metrics.inc("predictions_total", len(flat), model=name, outcome="ok")
+
+        lines = []
+        for k, point in enumerate(flat.tolist()):
+            row = {"point": point}
+            row.update((a.name, columns[a.name][k]) for a in spec.axes)
+            for name in spec.models:
+                row[name] = columns[name][k] if name in runnable else None
+                row[f"{name}_error"] = errors[name]
+            lines.append(json.dumps(row))
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,166 @@
+"""
+Prediction intervals for every inference backend.
+
+- Tree ensembles (oxidation): the per-tree predictions for a whole batch
+  are computed once as an (n_trees, n_rows) matrix. The mean, standard
+  deviation and quantile interval are all reductions of that matrix, so the
+  forest is traversed once, not once per statistic. The spread measures
+  disagreement between trees, i.e. model uncertainty.
+- Linear models (hardness): the textbook OLS prediction interval
+  prediction ± t(dof) * s * sqrt(1 + h), where s is the residual standard
+  error and h is the row's leverage under the training design. Both come
+  from statistics stored at training time (`residuals_` on the estimator,
+  `"residuals"` in the compiled JSON). It assumes homoscedastic normal
+  noise.
+
+No sklearn or scipy imports: the compiled backend stays dependency-free.
+"""
+
+from __future__ import annotations
+
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_LEVEL = 0.9
+
+# Stored on fitted linear estimators (and FoldedLinearModel) by the training script
+RESIDUALS_ATTR = "residuals_"
+
+
+class UncertaintyUnavailable(Exception):
+    """The model carries nothing to derive an interval from."""
+
+
+def _design(frame, stats: Dict[str, Any]) -> np.ndarray:
+    """
+    Raw linear design [one-hot material, numeric inputs]. It spans the same
+    space as the pipeline's intercept + encoder + scaler output, so the
+    leverage is the same for every backend.
+    """
+    materials = np.asarray(frame[stats["categorical_feature"]], dtype=object).astype(str)
+    onehot = (materials[:, np.newaxis] == np.asarray(stats["categories"])[np.newaxis, :])
+    numeric = np.asarray(frame[stats["numeric_features"]], dtype=np.float64)
+    return np.column_stack([onehot.astype(np.float64), numeric])
+
+
+def residual_stats(
+    frame,
+    y_true,
+    y_pred,
+    categorical_feature: str,
+    categories,
+    numeric_features,
+) -> Dict[str, Any]:
+    """
+    Training statistics of a fitted linear model, stored with the artifact:
+    residual standard error, design Gram inverse (leverage) and design
+    means (the SHAP baseline in explain.py).
+    """
+    stats: Dict[str, Any] = {
+        "categorical_feature": categorical_feature,
+        "categories": [str(c) for c in categories],
+        "numeric_features": list(numeric_features),
+    }
+    design = _design(frame, stats)
+    residuals = np.asarray(y_true, dtype=np.float64) - np.asarray(y_pred, dtype=np.float64)
+    n = residuals.shape[0]
+    dof = max(n - int(np.linalg.matrix_rank(design)), 1)
+
+    stats.update(
+        std=float(np.sqrt(np.sum(residuals ** 2) / dof)),
+        dof=int(dof),
+        n=int(n),
+        xtx_inv=np.linalg.pinv(design.T @ design).tolist(),
+        design_mean=design.mean(axis=0).tolist(),
+    )
+    return stats
+
+
+def t_quantile(p: float, dof: int) -> float:
+    """
+    Student t quantile via Hill's expansion around the normal quantile
+    (within 0.2% for dof >= 3 at the usual levels), so no scipy needed.
+    """
+    z = NormalDist().inv_cdf(p)
+    v = float(dof)
+    z2 = z * z
+    return z * (
+        1.0
+        + (z2 + 1.0) / (4.0 * v)
+        + (5.0 * z2 ** 2 + 16.0 * z2 + 3.0) / (96.0 * v ** 2)
+        + (3.0 * z2 ** 3 + 19.0 * z2 ** 2 + 17.0 * z2 - 15.0) / (384.0 * v ** 3)
+        + (79.0 * z2 ** 4 + 776.0 * z2 ** 3 + 1482.0 * z2 ** 2 - 1920.0 * z2 - 945.0) / (92160.0 * v ** 4)
+    )
+
+
+def _split(model: Any) -> Tuple[Any, Any]:
+    """(transform function or None, final estimator) for any backend's model."""
+    if hasattr(model, "steps"):  # sklearn Pipeline
+        head = model[:-1]
+        return head.transform, model.steps[-1][1]
+    preprocessor = getattr(model, "preprocessor", None)
+    if preprocessor is not None:  # FastPipeline / CompiledForest
+        return preprocessor.transform_frame, getattr(model, "estimator", model)
+    return None, model  # FoldedLinearModel predicts from the frame directly
+
+
+def tree_predictions(model: Any, frame) -> Optional[np.ndarray]:
+    """Per-tree predictions (n_trees, n_rows), or None if `model` is not a tree ensemble."""
+    transform, estimator = _split(model)
+
+    if hasattr(estimator, "predict_trees"):  # CompiledForest
+        return estimator.predict_trees(transform(frame))
+
+    trees = getattr(estimator, "estimators_", None)
+    if trees is None or transform is None:
+        return None
+
+    # Same input handling as the forest's own predict (float32, no re-validation)
+    X = np.ascontiguousarray(transform(frame), dtype=np.float32)
+    return np.stack([tree.predict(X, check_input=False) for tree in trees])
+
+
+def _residuals(model: Any) -> Optional[Dict[str, Any]]:
+    _, estimator = _split(model)
+    return getattr(estimator, RESIDUALS_ATTR, None)
+
+
+def predict_interval(model: Any, frame, level: float = DEFAULT_LEVEL) -> Dict[str, np.ndarray]:
+    """
+    Point prediction plus uncertainty for every row of `frame`.
+
+    Returns {"prediction", "std", "lower", "upper"} arrays; the interval is
+    the central `level` range (tree quantiles, or Student t for linear models).
+    Raises UncertaintyUnavailable when the model has neither trees nor
+    stored residuals (e.g. artifacts trained before intervals existed).
+    """
+    if not 0.0 < level < 1.0:
+        raise ValueError(f"Interval level must be in (0, 1), got {level}")
+
+    per_tree = tree_predictions(model, frame)
+    if per_tree is not None:
+        # Mean as the forest computes it: trees added in order, then divided
+        # (cumsum never reorders; sum() may switch to pairwise for one row)
+        prediction = per_tree.cumsum(axis=0)[-1] / per_tree.shape[0]
+        lower, upper = np.quantile(per_tree, [(1.0 - level) / 2.0, (1.0 + level) / 2.0], axis=0)
+        return {"prediction": prediction, "std": per_tree.std(axis=0), "lower": lower, "upper": upper}
+
+    residuals = _residuals(model)
+    if residuals is None:
+        raise UncertaintyUnavailable(
+            "Model artifact has no residual statistics; retrain it to enable intervals."
+        )
+
+    prediction = np.asarray(model.predict(frame), dtype=np.float64)
+    design = _design(frame, residuals)
+    leverage = np.einsum("ij,jk,ik->i", design, np.asarray(residuals["xtx_inv"]), design)
+    std = residuals["std"] * np.sqrt(1.0 + leverage)
+    half_width = t_quantile((1.0 + level) / 2.0, residuals["dof"]) * std
+    return {
+        "prediction": prediction,
+        "std": std,
+        "lower": prediction - half_width,
+        "upper": prediction + half_width,
+    }
@@ -5,12 +5,22 @@ Ensures safe, typed, and ordered data for model prediction.
 
 from __future__ import annotations
 
-import pandas as pd
-from typing import Any, Dict, List
+import math
+
+import numpy as np
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+# pandas is imported inside the DataFrame helpers: the compiled backend's
+# single-row path never needs it, and it dominates import time
+if TYPE_CHECKING:
+    import pandas as pd
 
 # Supported materials (categorical)
 VALID_MATERIALS = {"EN-8", "Mild Steel"}
 
+# Case-folded lookup: normalized input -> canonical material name
+_MATERIAL_LOOKUP = {mat.lower(): mat for mat in VALID_MATERIALS}
+
 # Feature order (imported by pipelines, duplicated for safety)
 HARDNESS_FEATURES = ["Material", "Current", "Heat_Input", "Carbon", "Manganese"]
 OXIDATION_FEATURES = ["Material", "Current", "Heat_Input", "Soaking_Time", "Carbon", "Manganese"]
@@ -35,32 +45,53 @@ def validate_material(value: Any) -> str:
 
     value = str(value).strip()
 
-    # Case-insensitive match
-    for mat in VALID_MATERIALS:
-        if value.lower() == mat.lower():
-            return mat  # Return canonical form used in model
+    # Case-insensitive match, returns canonical form used in model
+    canonical = _MATERIAL_LOOKUP.get(value.lower())
+    if canonical is not None:
+        return canonical
 
-    raise ValidationError(
+    raise ValidationError(_invalid_material_message(value))
+
+
+def _invalid_material_message(value: str) -> str:
+    return (
         f"Invalid material '{value}'. "
         f"Must be one of: {sorted(VALID_MATERIALS)}"
     )
 
 
+def parse_number(value: Any) -> float:
+    """
+    The one numeric parsing rule, shared by validate_numeric and
+    validate_columns: float() (so "1_000" and non-ASCII digits parse),
+    minus complex numbers, whose imaginary part would be dropped.
+
+    Raises:
+        TypeError / ValueError: When the value is not a real number.
+    """
+    if isinstance(value, (complex, np.complexfloating)):
+        raise TypeError(f"complex value {value!r}")
+    return float(value)
+
+
 def validate_numeric(name: str, value: Any) -> float:
     """
     Validate numeric fields.
     Accepts values like:
         10, "10", "10.5", 0, "0"
     Rejects:
-        "", None, "abc"
+        "", None, NaN, "nan" (missing, as in validate_columns), "abc"
     """
     if value is None or (isinstance(value, str) and value.strip() == ""):
         raise ValidationError(f"Missing required value for '{name}'.")
 
     try:
-        return float(value)
+        number = parse_number(value)
     except Exception:
         raise ValidationError(f"Field '{name}' must be numeric. Got '{value}'.")
+    if math.isnan(number):
+        raise ValidationError(f"Missing required value for '{name}'.")
+    return number
 
 
 # ------------------------------------------------------------
@@ -98,9 +129,146 @@ def to_dataframe(data: Dict[str, Any], feature_order: List[str]) -> pd.DataFrame
     """
     Convert validated dict → single-row DataFrame with strict column ordering.
     """
+    import pandas as pd
+
     try:
         row = [data[feature] for feature in feature_order]
     except KeyError as e:
         raise ValidationError(f"Missing required field: {e}")
 
     return pd.DataFrame([row], columns=feature_order)
+
+
+# ------------------------------------------------------------
+# Columnar (bulk) validation
+# ------------------------------------------------------------
+
+def _as_frame(data: Any) -> pd.DataFrame:
+    """
+    Accept a DataFrame, a NumPy structured array, a dict of lists
+    or a list of dicts and return a DataFrame view of it.
+    """
+    import pandas as pd
+
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, np.ndarray):
+        if data.dtype.names is None:
+            raise ValidationError("NumPy input must be a structured array with named fields.")
+        return pd.DataFrame(data)
+    if isinstance(data, (dict, list)):
+        return pd.DataFrame(data)
+    raise ValidationError(f"Unsupported input type for columnar validation: {type(data).__name__}")
+
+
+def _validate_material_column(col: pd.Series) -> Tuple[pd.Series, np.ndarray, np.ndarray]:
+    """Return (canonical materials, missing mask, invalid mask)."""
+    import pandas as pd
+
+    # Materials are low-cardinality: normalize each distinct value once,
+    # then broadcast back through the factorized codes.
+    codes, uniques = pd.factorize(col, use_na_sentinel=True)
+    normalized = [str(u).strip() for u in uniques]
+    blank = np.array([n == "" for n in normalized] + [True], dtype=bool)
+    lookup = np.array(
+        [_MATERIAL_LOOKUP.get(n.lower()) for n in normalized] + [None], dtype=object
+    )
+
+    # code -1 (missing) indexes the trailing sentinel entries
+    missing = blank[codes]
+    canonical = lookup[codes]
+    invalid = ~missing & pd.isna(canonical)
+    return pd.Series(canonical, dtype=object), missing, invalid
+
+
+def _validate_numeric_column(col: pd.Series) -> Tuple[pd.Series, np.ndarray, np.ndarray]:
+    """Return (float values, missing mask, non-numeric mask)."""
+    import pandas as pd
+
+    types = pd.api.types
+    if types.is_numeric_dtype(col) and not (types.is_bool_dtype(col) or types.is_complex_dtype(col)):
+        values = col.astype(float)
+        missing = values.isna().to_numpy()
+        return values, missing, np.zeros(len(col), dtype=bool)
+
+    values = pd.to_numeric(col, errors="coerce")
+    if types.is_complex_dtype(values):
+        values = pd.Series(np.nan, index=values.index)  # every row goes through parse_number
+    values = values.astype(float)
+    failed = values.isna().to_numpy()
+    missing = col.isna().to_numpy(dtype=bool)
+
+    # Rows pandas could not convert (blank, "nan", "1_000", ...) get the
+    # scalar rule, so both validators accept and reject the same values
+    for i in np.flatnonzero(failed & ~missing):
+        value = col.iloc[i]
+        if isinstance(value, str) and value.strip() == "":
+            missing[i] = True
+            continue
+        try:
+            number = parse_number(value)
+        except (TypeError, ValueError):
+            continue
+        if math.isnan(number):
+            missing[i] = True
+        else:
+            values.iloc[i] = number
+            failed[i] = False
+
+    return values, missing, failed & ~missing
+
+
+def validate_columns(
+    data: Any,
+    feature_order: List[str],
+) -> Tuple[pd.DataFrame, np.ndarray, List[Optional[str]]]:
+    """
+    Validate many rows at once.
+
+    Numerics are coerced with a single vectorized conversion per column (the
+    values it cannot convert fall back to parse_number, the scalar rule) and
+    materials go through the precomputed case-folded lookup table.
+
+    Returns:
+        frame:  validated DataFrame in `feature_order` (invalid rows hold NaN/None)
+        mask:   boolean array, True where the row failed validation
+        errors: per-row error message (same text as the scalar validators), None when valid
+    """
+    import pandas as pd
+
+    source = _as_frame(data)
+    n_rows = len(source)
+
+    columns: Dict[str, pd.Series] = {}
+    mask = np.zeros(n_rows, dtype=bool)
+    errors: List[Optional[str]] = [None] * n_rows
+
+    def record(bad: np.ndarray, message) -> None:
+        # Only the first failing field (in feature order) is reported per row
+        new = bad & ~mask
+        for i in np.flatnonzero(new):
+            errors[i] = message(i)
+        mask[new] = True
+
+    for feature in feature_order:
+        if feature in source.columns:
+            col = source[feature].reset_index(drop=True)
+        else:
+            col = pd.Series([None] * n_rows, dtype=object)
+
+        if feature == "Material":
+            values, missing, invalid = _validate_material_column(col)
+            record(missing, lambda i: "Material is required.")
+            record(invalid, lambda i, c=col: _invalid_material_message(str(c.iloc[i]).strip()))
+        else:
+            values, missing, invalid = _validate_numeric_column(col)
+            record(missing, lambda i, f=feature: f"Missing required value for '{f}'.")
+            record(
+                invalid,
+                lambda i, f=feature, c=col: f"Field '{f}' must be numeric. Got '{c.iloc[i]}'.",
+            )
+
+        columns[feature] = values
+
+    frame = pd.DataFrame(columns, columns=feature_order)
+    return frame, mask, errors
@@ -0,0 +1,96 @@
+"""
+Background watcher that hot-swaps models when artifacts in MODEL_DIR change.
+
+Polls the version of every served artifact: the registry's current version
+id (one small index read) or, without a registry, the artifact's mtime and
+size. A change is acted on once the fingerprint has been stable for one
+extra poll, so half-written files are never loaded. A registry rollback is
+picked up the same way. The reload runs in this thread; requests keep being
+served from the previous models until `reload_models()` swaps them.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Optional
+
+from src.inference import predict
+
+
+def _fingerprint() -> Dict[str, str]:
+    """Current version of every artifact slot served by predict.py."""
+    return {name: version for name, (_, version) in predict.slot_sources().items()}
+
+
+class ModelWatcher(threading.Thread):
+    """Daemon thread polling artifacts and calling `reload_models()` on change."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="model-watcher", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        # Baseline taken synchronously so changes right after start() are seen
+        self._last = _fingerprint()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        last = self._last
+        pending = None
+
+        while not self._stop_event.wait(self.interval):
+            current = _fingerprint()
+            if current == last:
+                pending = None
+                continue
+
+            # Wait until the artifacts stop changing before loading them
+            if current != pending:
+                pending = current
+                continue
+
+            changed = sorted(n for n in current if current[n] != last.get(n))
+            # Only reload slots this process is actually serving
+            loaded = [n for n in changed if predict.slot_version(n) is not None]
+            print(f"[INFO] Model artifacts changed: {changed}")
+            if loaded:
+                try:
+                    predict.reload_models(loaded)
+                except Exception as e:
+                    print(f"[ERROR] Background model reload failed: {e}")
+
+            last, pending = current, None
+
+
+_watcher: Optional[ModelWatcher] = None
+
+
+def start_model_watcher(interval: Optional[float] = None) -> Optional[ModelWatcher]:
+    """
+    Start the per-process watcher (idempotent).
+    interval defaults to MODEL_WATCH_INTERVAL seconds; 0 or unset disables.
+    Call after fork (gunicorn `post_fork`), since threads do not survive it.
+    """
+    global _watcher
+
+    if interval is None:
+        interval = float(os.environ.get("MODEL_WATCH_INTERVAL", "0"))
+    if interval <= 0:
+        return None
+
+    if _watcher is None or not _watcher.is_alive():
+        _watcher = ModelWatcher(interval)
+        _watcher.start()
+        print(f"[INFO] Watching model artifacts every {interval}s")
+    return _watcher
+
+
+def stop_model_watcher() -> None:
+    global _watcher
+
+    if _watcher is not None:
+        _watcher.stop()
+        _watcher.join()
+        _watcher = None
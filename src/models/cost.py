@@ -0,0 +1,199 @@
+"""
+cost.py
+Serving-cost measurement and latency-aware model selection.
+
+- measure_cost: single-row / batch predict latency plus on-disk and
+  in-memory size of a fitted model (sklearn pipeline or compiled export)
+- select_cheapest: k-fold CV over pruned variants of a fitted forest
+  (fewer trees, shallower trees) and pick the cheapest one whose RMSE is
+  within a relative tolerance of the most accurate variant
+"""
+
+from __future__ import annotations
+
+import copy
+import io
+import os
+import pickle
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold
+
+
+# Pruning grid for forests; values >= the fitted model's own are skipped
+PRUNE_TREES = (10, 25, 50, 100, 200)
+PRUNE_DEPTHS = (4, 6, 8, 12)
+
+
+# -------------------------------------------------------------------
+# Measurement
+# -------------------------------------------------------------------
+
+def _median_ms(fn, repeats: int) -> float:
+    fn()  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) * 1000.0)
+
+
+def _disk_size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(path, f))
+            for f in os.listdir(path)
+            if os.path.isfile(os.path.join(path, f))
+        )
+    return os.path.getsize(path)
+
+
+def measure_cost(
+    model: Any,
+    X,
+    path: Optional[str] = None,
+    batch_rows: int = 1000,
+    repeats: int = 30,
+) -> Dict[str, Any]:
+    """
+    Measure what serving `model` costs.
+
+    Latencies are the median over `repeats` calls of `model.predict` on one
+    row and on `batch_rows` rows (resampled from X). Disk size is the saved
+    artifact at `path` (joblib bytes when no path is given); memory size is
+    the pickled size, which tracks the arrays the model holds.
+    """
+    rng = np.random.default_rng(0)
+    single = X.iloc[[0]]
+    batch = X.iloc[rng.integers(0, len(X), size=batch_rows)].reset_index(drop=True)
+
+    if path is not None:
+        disk = _disk_size(path)
+    else:
+        buf = io.BytesIO()
+        joblib.dump(model, buf)
+        disk = buf.getbuffer().nbytes
+
+    return {
+        "latency_single_ms": round(_median_ms(lambda: model.predict(single), repeats), 4),
+        "latency_batch_ms": round(_median_ms(lambda: model.predict(batch), max(repeats // 6, 3)), 4),
+        "batch_rows": batch_rows,
+        "size_disk_bytes": int(disk),
+        "size_memory_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+    }
+
+
+def predict_work(pipeline: Any) -> int:
+    """
+    Deterministic per-row predict cost used to rank candidates:
+    node visits (sum of tree depths) for forests, coefficients for linear models.
+    """
+    model = dict(pipeline.steps)["model"]
+    if hasattr(model, "estimators_"):
+        return int(sum(e.tree_.max_depth for e in model.estimators_))
+    return int(np.size(getattr(model, "coef_", 1)))
+
+
+# -------------------------------------------------------------------
+# Selection
+# -------------------------------------------------------------------
+
+def _truncate(pipeline: Any, n_trees: int) -> Any:
+    """Copy of a fitted forest pipeline keeping only its first `n_trees` trees."""
+    pruned = copy.deepcopy(pipeline)
+    model = dict(pruned.steps)["model"]
+    model.estimators_ = model.estimators_[:n_trees]
+    model.n_estimators = n_trees
+    return pruned
+
+
+def _variants(pipeline: Any) -> Tuple[List[Optional[int]], List[int]]:
+    """Depths to refit with and tree counts to truncate to (None = as trained)."""
+    model = dict(pipeline.steps)["model"]
+    if not hasattr(model, "estimators_"):
+        return [None], []
+
+    depth_limit = model.max_depth or float("inf")
+    depths = [None] + [d for d in PRUNE_DEPTHS if d < depth_limit]
+    trees = [n for n in PRUNE_TREES if n < model.n_estimators]
+    return depths, trees
+
+
+def _fit_variants(pipeline: Any, depths, trees, X, y) -> Dict[Tuple, Any]:
+    """Fit one model per depth on (X, y); tree-count variants are truncations of it."""
+    n_full = dict(pipeline.steps)["model"].n_estimators if trees else None
+    fitted = {}
+    for depth in depths:
+        candidate = clone(pipeline)
+        if depth is not None:
+            candidate.set_params(model__max_depth=depth)
+        candidate.fit(X, y)
+
+        fitted[(depth, n_full)] = candidate
+        for n in trees:
+            fitted[(depth, n)] = _truncate(candidate, n)
+    return fitted
+
+
+def select_cheapest(
+    pipeline: Any,
+    X,
+    y,
+    tolerance: float = 0.01,
+    cv: int = 5,
+    random_state: int = 42,
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Pick the cheapest variant of `pipeline` (by `predict_work`) whose CV RMSE
+    is within `tolerance` (relative) of the best variant, refit on (X, y).
+    Models with nothing to prune (linear) are simply refit as they are.
+    """
+    depths, trees = _variants(pipeline)
+    folds = KFold(n_splits=min(cv, len(X)), shuffle=True, random_state=random_state)
+
+    errors: Dict[Tuple, List[float]] = {}
+    for train_idx, val_idx in folds.split(X):
+        X_tr, X_va = X.iloc[train_idx], X.iloc[val_idx]
+        y_tr, y_va = y.iloc[train_idx], y.iloc[val_idx]
+        for key, model in _fit_variants(pipeline, depths, trees, X_tr, y_tr).items():
+            rmse = mean_squared_error(y_va, model.predict(X_va), squared=False)
+            errors.setdefault(key, []).append(rmse)
+
+    final = _fit_variants(pipeline, depths, trees, X, y)
+    candidates = []
+    for key, model in final.items():
+        params = dict(model.steps)["model"].get_params()
+        candidates.append({
+            "max_depth": params.get("max_depth"),
+            "n_estimators": params.get("n_estimators"),
+            "cv_rmse": float(np.mean(errors[key])),
+            "predict_work": predict_work(model),
+            "_key": key,
+        })
+
+    best_rmse = min(c["cv_rmse"] for c in candidates)
+    eligible = [c for c in candidates if c["cv_rmse"] <= best_rmse * (1.0 + tolerance)]
+    chosen = min(eligible, key=lambda c: (c["predict_work"], c["cv_rmse"]))
+    selected = final[chosen["_key"]]
+    for c in candidates:
+        del c["_key"]
+
+    candidates.sort(key=lambda c: c["predict_work"])
+    record = {
+        "tolerance": tolerance,
+        "metric": "RMSE",
+        "cv_folds": folds.get_n_splits(),
+        "best_cv_rmse": best_rmse,
+        "chosen": chosen,
+        "candidates": candidates,
+    }
+    print(f"[INFO] Selected max_depth={chosen['max_depth']}, n_estimators={chosen['n_estimators']} "
+          f"(CV RMSE {chosen['cv_rmse']:.6g} vs best {best_rmse:.6g}, "
+          f"work {chosen['predict_work']} of {max(c['predict_work'] for c in candidates)})")
+    return selected, record
@@ -0,0 +1,276 @@
+"""
+incremental.py
+Incremental retraining from delta files (`--delta PATH` on both training scripts).
+
+- Hardness (linear): the training state is a set of sufficient statistics
+  of the raw design [one-hot material, numeric inputs]: row count, column
+  sums, Gram matrix, design-target products and target moments. A delta
+  adds its rows' statistics; the scaler moments, coefficients and residual
+  stats are then re-derived in closed form. The result matches a full
+  refit on all rows seen (same centered least squares as LinearRegression
+  / Ridge), at a cost that depends on the delta size, not the history.
+- Oxidation (forest): warm start. New trees are grown on the delta rows
+  only, through the already fitted preprocessing; old trees are kept. The
+  number of new trees is proportional to the delta's share of all rows
+  seen, so every row keeps roughly the same weight in the ensemble.
+
+The state lives under "incremental" in the metadata JSON. Full training
+writes the initial state, and each update adds to it. Digests of the applied
+delta files are recorded there, so the same file is never applied twice.
+
+An update keeps the held-out `metrics` of the last full training and
+records its prequential errors (the old model on the delta rows, before
+the update) under "update" -> "delta_metrics". With --no-append the
+training CSV is unchanged, so `data_hash` chains the previous hash with the
+delta's digest instead of hashing the CSV (chain_data_hash).
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression, Ridge
+
+
+# -------------------------------------------------------------------
+# Delta files
+# -------------------------------------------------------------------
+
+def check_delta(df: pd.DataFrame, features: List[str], target: str) -> None:
+    """
+    Raises:
+        KeyError: If required columns are missing.
+        ValueError: If the delta is empty or has missing values.
+    """
+    missing = [c for c in features + [target] if c not in df.columns]
+    if missing:
+        raise KeyError(
+            f"Delta missing required columns: {missing}. Delta columns: {list(df.columns)}"
+        )
+    if df.empty:
+        raise ValueError("Delta file has no rows.")
+    if df[features + [target]].isna().any().any():
+        raise ValueError("Delta file has missing values.")
+
+
+def check_not_applied(state: Dict[str, Any], digest: str) -> None:
+    if digest in state.get("deltas", []):
+        raise ValueError(f"Delta {digest[:12]} was already applied to this model.")
+
+
+def chain_data_hash(data_hash: Optional[str], digest: str) -> str:
+    """
+    data_hash for a model updated from a delta that was not appended to the
+    training CSV: the previous data_hash chained with the delta's digest, so
+    it still identifies every row the model has seen.
+    """
+    return hashlib.sha256(f"{data_hash or ''}+{digest}".encode()).hexdigest()
+
+
+# -------------------------------------------------------------------
+# Linear model: sufficient statistics
+# -------------------------------------------------------------------
+
+def _raw_design(frame, categorical_feature: str, categories, numeric_features) -> np.ndarray:
+    materials = np.asarray(frame[categorical_feature], dtype=object).astype(str)
+    onehot = materials[:, np.newaxis] == np.asarray(categories)[np.newaxis, :]
+    numeric = np.asarray(frame[numeric_features], dtype=np.float64)
+    return np.column_stack([onehot.astype(np.float64), numeric])
+
+
+def linear_state(frame, y, categorical_feature: str, categories, numeric_features) -> Dict[str, Any]:
+    """Sufficient statistics of the rows in `frame` (JSON-serializable)."""
+    categories = [str(c) for c in categories]
+    design = _raw_design(frame, categorical_feature, categories, numeric_features)
+    target = np.asarray(y, dtype=np.float64)
+    return {
+        "categorical_feature": categorical_feature,
+        "categories": categories,
+        "numeric_features": list(numeric_features),
+        "n": int(design.shape[0]),
+        "design_sum": design.sum(axis=0).tolist(),
+        "gram": (design.T @ design).tolist(),
+        "design_target": (design.T @ target).tolist(),
+        "target_sum": float(target.sum()),
+        "target_sq_sum": float(target @ target),
+        "deltas": [],
+    }
+
+
+def update_linear_state(state: Dict[str, Any], frame, y, digest: Optional[str] = None) -> Dict[str, Any]:
+    """
+    New state with the delta rows added.
+
+    Raises:
+        ValueError: If the delta has a material the model was not trained on
+            (adding an encoder column needs a full retrain).
+    """
+    unseen = sorted(set(map(str, frame[state["categorical_feature"]])) - set(state["categories"]))
+    if unseen:
+        raise ValueError(f"Delta has unseen materials {unseen}; run a full retrain.")
+
+    delta = linear_state(
+        frame, y, state["categorical_feature"], state["categories"], state["numeric_features"]
+    )
+    merged = dict(state)
+    merged["n"] = state["n"] + delta["n"]
+    for key in ("design_sum", "gram", "design_target"):
+        merged[key] = (np.asarray(state[key]) + np.asarray(delta[key])).tolist()
+    for key in ("target_sum", "target_sq_sum"):
+        merged[key] = state[key] + delta[key]
+    merged["deltas"] = list(state.get("deltas", [])) + ([digest] if digest else [])
+    return merged
+
+
+def _pipeline_moments(state: Dict[str, Any]) -> Tuple[np.ndarray, ...]:
+    """
+    Scaler moments plus sums over the pipeline's own design
+    d = [one-hot, (x - mean) / scale], derived from the raw statistics:
+    returns (mean, var, scale, sum_d, gram_d, d_target).
+    """
+    n = state["n"]
+    k = len(state["categories"])
+    s = np.asarray(state["design_sum"])
+    G = np.asarray(state["gram"])
+    b = np.asarray(state["design_target"])
+
+    # StandardScaler moments (population variance; zero variance -> scale 1)
+    mean = s[k:] / n
+    var = np.maximum(np.diag(G)[k:] / n - mean ** 2, 0.0)
+    scale = np.sqrt(var)
+    scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+
+    # d = T r + t
+    T = np.diag(np.concatenate([np.ones(k), 1.0 / scale]))
+    t = np.concatenate([np.zeros(k), -mean / scale])
+    Ts = T @ s
+    sum_d = Ts + n * t
+    gram_d = T @ G @ T.T + np.outer(Ts, t) + np.outer(t, Ts) + n * np.outer(t, t)
+    d_target = T @ b + t * state["target_sum"]
+    return mean, var, scale, sum_d, gram_d, d_target
+
+
+def refit_linear(pipeline, state: Dict[str, Any]) -> None:
+    """
+    Set a fitted hardness pipeline's scaler moments and coefficients from
+    `state`, as if it had been fitted on every row the state has seen.
+
+    Raises:
+        ValueError: For estimators without a closed form (e.g. Lasso).
+    """
+    estimator = pipeline.steps[-1][1]
+    if type(estimator) not in (LinearRegression, Ridge):
+        raise ValueError(
+            f"Incremental updates support LinearRegression and Ridge, not "
+            f"{type(estimator).__name__}; run a full retrain."
+        )
+
+    preprocess = pipeline.named_steps["preprocess"]
+    encoder = preprocess.named_transformers_["cat"]
+    if [str(c) for c in encoder.categories_[0]] != state["categories"]:
+        raise ValueError("Model categories do not match the incremental state; run a full retrain.")
+
+    n = state["n"]
+    mean, var, scale, sum_d, gram_d, d_target = _pipeline_moments(state)
+
+    # Centered least squares, as sklearn fits with fit_intercept=True
+    d_mean = sum_d / n
+    y_mean = state["target_sum"] / n
+    gram_c = gram_d - n * np.outer(d_mean, d_mean)
+    target_c = d_target - n * d_mean * y_mean
+    if isinstance(estimator, Ridge):
+        coef = np.linalg.solve(gram_c + estimator.alpha * np.eye(len(gram_c)), target_c)
+    else:
+        # Minimum-norm solution (the one-hot block is collinear with the intercept)
+        coef = np.linalg.pinv(gram_c, rcond=1e-10, hermitian=True) @ target_c
+
+    scaler = preprocess.named_transformers_["num"]
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = n
+
+    estimator.coef_ = coef
+    estimator.intercept_ = float(y_mean - d_mean @ coef)
+
+
+def linear_residual_stats(pipeline, state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The residual stats uncertainty.residual_stats computes from the rows
+    (same keys), derived from the sufficient statistics instead.
+    """
+    n = state["n"]
+    G = np.asarray(state["gram"])
+    _, _, _, sum_d, gram_d, d_target = _pipeline_moments(state)
+
+    estimator = pipeline.steps[-1][1]
+    coef = np.asarray(estimator.coef_, dtype=np.float64)
+    intercept = float(estimator.intercept_)
+
+    # sum (y - intercept - d.coef)^2, expanded into the stored sums
+    rss = (
+        state["target_sq_sum"]
+        - 2.0 * (intercept * state["target_sum"] + coef @ d_target)
+        + n * intercept ** 2
+        + 2.0 * intercept * (coef @ sum_d)
+        + coef @ gram_d @ coef
+    )
+    dof = max(n - int(np.linalg.matrix_rank(G, hermitian=True)), 1)
+
+    return {
+        "categorical_feature": state["categorical_feature"],
+        "categories": list(state["categories"]),
+        "numeric_features": list(state["numeric_features"]),
+        "std": float(np.sqrt(max(rss, 0.0) / dof)),
+        "dof": int(dof),
+        "n": int(n),
+        "xtx_inv": np.linalg.pinv(G).tolist(),
+        "design_mean": (np.asarray(state["design_sum"]) / n).tolist(),
+    }
+
+
+# -------------------------------------------------------------------
+# Forest: warm start
+# -------------------------------------------------------------------
+
+def forest_state(n_rows: int) -> Dict[str, Any]:
+    return {"n": int(n_rows), "deltas": []}
+
+
+def grow_forest(
+    pipeline,
+    frame,
+    y,
+    state: Dict[str, Any],
+    digest: Optional[str] = None,
+    max_trees: Optional[int] = None,
+) -> Tuple[Dict[str, Any], int]:
+    """
+    Add trees fitted on the delta rows only. Returns (new state, trees added).
+
+    With `max_trees`, the oldest trees are dropped once the ensemble grows
+    past it (a sliding window over the data history).
+    """
+    forest = pipeline.steps[-1][1]
+    n_old = len(forest.estimators_)
+    n_new = max(1, int(round(n_old * len(frame) / state["n"])))
+
+    # Fitted preprocessing is reused as is: old trees' thresholds stay valid
+    X = pipeline[:-1].transform(frame)
+    forest.set_params(warm_start=True, n_estimators=n_old + n_new)
+    try:
+        forest.fit(X, np.asarray(y, dtype=np.float64))
+    finally:
+        forest.set_params(warm_start=False)
+
+    if max_trees is not None and len(forest.estimators_) > max_trees:
+        forest.estimators_ = forest.estimators_[-max_trees:]
+        forest.set_params(n_estimators=max_trees)
+
+    new_state = dict(state)
+    new_state["n"] = state["n"] + len(frame)
+    new_state["deltas"] = list(state.get("deltas", [])) + ([digest] if digest else [])
+    return new_state, n_new
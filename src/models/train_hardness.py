@@ -3,15 +3,21 @@ Train the hardness prediction model.
 This script:
 - Loads training data
 - Splits into train/test sets
-- Builds sklearn pipeline
+- Builds sklearn pipeline (or tunes it with --tune, see tuning.py)
 - Evaluates metrics
 - Saves model + metadata
+- Exports the folded closed-form model (no sklearn needed to serve)
+- Stores training residual stats for prediction intervals
+- Stores sufficient statistics for incremental updates (--delta, see incremental.py)
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any
+import argparse
+import os
+from typing import Dict, Any, Optional
 
+import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
     mean_absolute_error,
@@ -23,8 +29,26 @@ from src.models.pipelines import (
     build_hardness_pipeline,
     HARDNESS_FEATURES,
 )
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference import modelfile
+from src.inference.uncertainty import RESIDUALS_ATTR, residual_stats
+from src.inference import registry
+from src.inference.registry import file_digest
+from src.models.cost import measure_cost, select_cheapest
+from src.models.incremental import (
+    check_delta,
+    chain_data_hash,
+    check_not_applied,
+    linear_residual_stats,
+    linear_state,
+    refit_linear,
+    update_linear_state,
+)
+from src.models.tuning import HARDNESS_SEARCH_SPACE, tune_pipeline
 from src.models.utils import (
+    append_csv,
     load_csv,
+    load_metadata,
     save_model,
     save_metadata,
 )
@@ -33,6 +57,8 @@ from src.models.utils import (
 DATA_PATH = "data/hardness.csv"
 MODEL_PATH = "models/hardness_model.joblib"
 META_PATH = "models/hardness_metadata.json"
+BINARY_PATH = "models/hardness_model.bin"
+REGISTRY_DIR = registry.DEFAULT_ROOT
 
 
 def compute_metrics(y_true, y_pred) -> Dict[str, float]:
@@ -44,7 +70,9 @@ def compute_metrics(y_true, y_pred) -> Dict[str, float]:
     }
 
 
-def train_hardness_model() -> Dict[str, Any]:
+def train_hardness_model(
+    tune: bool = False, select_tolerance: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Train the hardness model and return training metadata.
     Raises:
@@ -56,6 +84,7 @@ def train_hardness_model() -> Dict[str, Any]:
     # Load dataset
     # -----------------------------
     df = load_csv(DATA_PATH)
+    data_hash = file_digest(DATA_PATH)
 
     missing_features = [f for f in HARDNESS_FEATURES if f not in df.columns]
     if missing_features:
@@ -80,8 +109,37 @@ def train_hardness_model() -> Dict[str, Any]:
     # -----------------------------
     # Fit model
     # -----------------------------
-    pipeline = build_hardness_pipeline()
-    pipeline.fit(X_train, y_train)
+    search = None
+    if tune:
+        # k-fold successive-halving search on the training split only
+        pipeline, search = tune_pipeline(
+            build_hardness_pipeline(), HARDNESS_SEARCH_SPACE, X_train, y_train
+        )
+    else:
+        pipeline = build_hardness_pipeline()
+        pipeline.fit(X_train, y_train)
+
+    selection = None
+    if select_tolerance is not None:
+        # Cheapest pruned variant within the RMSE tolerance of the best one
+        pipeline, selection = select_cheapest(pipeline, X_train, y_train, select_tolerance)
+
+    # -----------------------------
+    # Residual stats (analytic prediction intervals at serve time)
+    # -----------------------------
+    pre = CompiledPreprocessor.from_column_transformer(pipeline.named_steps["preprocess"])
+    residuals = residual_stats(
+        X_train,
+        y_train,
+        pipeline.predict(X_train),
+        pre.categorical_feature,
+        pre.categories,
+        pre.numeric_features,
+    )
+    setattr(pipeline.steps[-1][1], RESIDUALS_ATTR, residuals)
+    state = linear_state(
+        X_train, y_train, pre.categorical_feature, pre.categories, pre.numeric_features
+    )
 
     # -----------------------------
     # Evaluate
@@ -95,27 +153,189 @@ def train_hardness_model() -> Dict[str, Any]:
     for k, v in metrics.items():
         print(f"{k}: {v:.4f}")
 
+    extra = {"residuals": residuals, "search": search, "selection": selection, "incremental": state}
+    cost = _save_artifacts(pipeline, X, metrics, extra, data_hash)
+
+    return {
+        "model_path": MODEL_PATH,
+        "meta_path": META_PATH,
+        "binary_path": BINARY_PATH,
+        "metrics": metrics,
+        "cost": cost,
+    }
+
+
+def update_hardness_model(delta_path: str, append: bool = True) -> Dict[str, Any]:
+    """
+    Incremental update: add the rows of `delta_path` to the saved model's
+    sufficient statistics and re-derive the fit (see incremental.py).
+    Cost depends on the delta size only. The current model's errors on the
+    delta rows before they are absorbed (prequential) are stored under
+    update.delta_metrics; `metrics` stay those of the last full training.
+    With `append`, the delta rows are also appended to DATA_PATH; without,
+    data_hash chains the previous one with the delta's digest. The
+    model updated is the registry's current version, so an update after
+    a rollback builds on the restored model.
+
+    Raises:
+        FileNotFoundError: When the delta CSV or saved model is missing.
+        KeyError: If required columns are missing.
+        ValueError: When the saved model has no incremental state, the
+            delta was already applied, or it cannot be absorbed in closed form.
+    """
+
+    # -----------------------------
+    # Load delta + saved state
+    # -----------------------------
+    delta = load_csv(delta_path)
+    check_delta(delta, HARDNESS_FEATURES, "Hardness")
+    digest = file_digest(delta_path)
+
+    # Build on the live version (after a rollback, not the flat files)
+    meta_path = registry.live_path(REGISTRY_DIR, "hardness", META_PATH)
+    metadata = load_metadata(meta_path)
+    state = metadata.get("incremental")
+    if state is None:
+        raise ValueError(f"{meta_path} has no incremental state; run a full training first.")
+    check_not_applied(state, digest)
+
+    pipeline = joblib.load(registry.live_path(REGISTRY_DIR, "hardness", MODEL_PATH))
+    X, y = delta[HARDNESS_FEATURES], delta["Hardness"]
+
+    # -----------------------------
+    # Evaluate on the new rows, then absorb them
+    # -----------------------------
+    delta_metrics = compute_metrics(y, pipeline.predict(X))
+
+    state = update_linear_state(state, X, y, digest)
+    refit_linear(pipeline, state)
+    residuals = linear_residual_stats(pipeline, state)
+    setattr(pipeline.steps[-1][1], RESIDUALS_ATTR, residuals)
+
+    print("\n=============================")
+    print(" Hardness Incremental Update")
+    print("=============================")
+    print(f"Delta rows: {len(delta)} (total {state['n']})")
+    for k, v in delta_metrics.items():
+        print(f"{k} (delta, before update): {v:.4f}")
+
+    update = {
+        "delta_path": delta_path,
+        "delta_digest": digest,
+        "appended": append,
+        "delta_rows": len(delta),
+        "total_rows": state["n"],
+        "delta_metrics": delta_metrics,
+    }
+    extra = {
+        **{k: metadata[k] for k in ("search", "selection") if k in metadata},
+        "residuals": residuals,
+        "incremental": state,
+        "update": update,
+    }
+    metrics = metadata.get("metrics", {})
+
+    # Append first so data_hash covers the delta; undone if saving fails
+    if append:
+        size = append_csv(delta, DATA_PATH)
+        data_hash = file_digest(DATA_PATH)
+    else:
+        size = None
+        data_hash = chain_data_hash(metadata.get("data_hash"), digest)
+    try:
+        cost = _save_artifacts(pipeline, X, metrics, extra, data_hash)
+    except Exception:
+        if size is not None:
+            os.truncate(DATA_PATH, size)
+        raise
+
+    return {
+        "model_path": MODEL_PATH,
+        "meta_path": META_PATH,
+        "binary_path": BINARY_PATH,
+        "metrics": metrics,
+        "cost": cost,
+        "update": update,
+    }
+
+
+def _save_artifacts(
+    pipeline, X, metrics: Dict[str, float], extra: Dict[str, Any], data_hash: str
+) -> Dict[str, Any]:
+    """Save the pipeline and compiled export, then metadata with serving cost."""
+
     # -----------------------------
     # Save pipeline + metadata
     # -----------------------------
     save_model(pipeline, MODEL_PATH)
 
+    # -----------------------------
+    # Export compiled model
+    # -----------------------------
+    modelfile.save(pipeline, BINARY_PATH)
+
+    # -----------------------------
+    # Serving cost + metadata
+    # -----------------------------
+    cost = {
+        "sklearn": measure_cost(pipeline, X, path=MODEL_PATH),
+        "compiled": measure_cost(modelfile.load(BINARY_PATH), X, path=BINARY_PATH),
+    }
+
+    artifacts = {os.path.basename(p): p for p in (MODEL_PATH, BINARY_PATH)}
+    hashes = {n: file_digest(p) for n, p in artifacts.items()}
     save_metadata(
         META_PATH,
         "Hardness Model",
         HARDNESS_FEATURES,
         metrics,
+        extra={
+            k: v
+            for k, v in {"cost": cost, **extra, "artifacts": hashes, "data_hash": data_hash}.items()
+            if v is not None
+        },
     )
 
-    print(f"\nModel saved to {MODEL_PATH}")
-    print(f"Metadata saved to {META_PATH}\n")
+    # -----------------------------
+    # Register as the current version
+    # -----------------------------
+    artifacts[os.path.basename(META_PATH)] = META_PATH
+    record = registry.publish(REGISTRY_DIR, "hardness", artifacts, data_hash, metrics, hashes)
 
-    return {
-        "model_path": MODEL_PATH,
-        "meta_path": META_PATH,
-        "metrics": metrics,
-    }
+    print(f"\nModel saved to {MODEL_PATH}")
+    print(f"Metadata saved to {META_PATH}")
+    print(f"Compiled model saved to {BINARY_PATH}")
+    print(f"Registered as hardness version {record['version']}\n")
+    return cost
 
 
 if __name__ == "__main__":
-    train_hardness_model()
+    parser = argparse.ArgumentParser(description="Train the hardness model.")
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Cross-validated hyperparameter search (successive halving, all cores)",
+    )
+    parser.add_argument(
+        "--select-tolerance",
+        type=float,
+        default=None,
+        metavar="TOL",
+        help="Pick the cheapest pruned model within TOL relative RMSE of the best (e.g. 0.02)",
+    )
+    parser.add_argument(
+        "--delta",
+        default=None,
+        metavar="CSV",
+        help="Incremental update: absorb the rows of CSV into the saved model instead of retraining",
+    )
+    parser.add_argument(
+        "--no-append",
+        action="store_true",
+        help="With --delta, do not append the delta rows to the training CSV",
+    )
+    args = parser.parse_args()
+    if args.delta:
+        update_hardness_model(args.delta, append=not args.no_append)
+    else:
+        train_hardness_model(tune=args.tune, select_tolerance=args.select_tolerance)
@@ -4,15 +4,20 @@ Train the oxidation rate prediction model.
 Responsibilities:
 - Load training data
 - Validate required features
-- Train sklearn pipeline
+- Train sklearn pipeline (or tune it with --tune, see tuning.py)
 - Evaluate metrics
 - Save model + metadata
+- Exports the packed forest as a binary model file (served without sklearn)
+- Incremental updates: warm-started trees on a delta file (--delta, see incremental.py)
 """
 
 from __future__ import annotations
 
-from typing import Dict, Any
+import argparse
+import os
+from typing import Dict, Any, Optional
 
+import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import (
     mean_absolute_error,
@@ -24,8 +29,22 @@ from src.models.pipelines import (
     build_oxidation_pipeline,
     OXIDATION_FEATURES,
 )
+from src.inference import modelfile
+from src.inference import registry
+from src.inference.registry import file_digest
+from src.models.cost import measure_cost, select_cheapest
+from src.models.incremental import (
+    check_delta,
+    chain_data_hash,
+    check_not_applied,
+    forest_state,
+    grow_forest,
+)
+from src.models.tuning import OXIDATION_SEARCH_SPACE, tune_pipeline
 from src.models.utils import (
+    append_csv,
     load_csv,
+    load_metadata,
     save_model,
     save_metadata,
 )
@@ -34,6 +53,8 @@ from src.models.utils import (
 DATA_PATH = "data/oxidation.csv"
 MODEL_PATH = "models/oxidation_model.joblib"
 META_PATH = "models/oxidation_metadata.json"
+BINARY_PATH = "models/oxidation_model.bin"
+REGISTRY_DIR = registry.DEFAULT_ROOT
 
 
 def compute_metrics(y_true, y_pred) -> Dict[str, float]:
@@ -45,7 +66,9 @@ def compute_metrics(y_true, y_pred) -> Dict[str, float]:
     }
 
 
-def train_oxidation_model() -> Dict[str, Any]:
+def train_oxidation_model(
+    tune: bool = False, select_tolerance: Optional[float] = None
+) -> Dict[str, Any]:
     """
     Train the oxidation prediction model and return metadata.
 
@@ -58,6 +81,7 @@ def train_oxidation_model() -> Dict[str, Any]:
     # Load Dataset
     # -----------------------------
     df = load_csv(DATA_PATH)
+    data_hash = file_digest(DATA_PATH)
 
     missing = [f for f in OXIDATION_FEATURES if f not in df.columns]
     if missing:
@@ -88,8 +112,20 @@ def train_oxidation_model() -> Dict[str, Any]:
     # -----------------------------
     # Fit Model
     # -----------------------------
-    pipeline = build_oxidation_pipeline()
-    pipeline.fit(X_train, y_train)
+    search = None
+    if tune:
+        # k-fold successive-halving search on the training split only
+        pipeline, search = tune_pipeline(
+            build_oxidation_pipeline(), OXIDATION_SEARCH_SPACE, X_train, y_train
+        )
+    else:
+        pipeline = build_oxidation_pipeline()
+        pipeline.fit(X_train, y_train)
+
+    selection = None
+    if select_tolerance is not None:
+        # Cheapest pruned variant within the RMSE tolerance of the best one
+        pipeline, selection = select_cheapest(pipeline, X_train, y_train, select_tolerance)
 
     # -----------------------------
     # Evaluate
@@ -103,27 +139,195 @@ def train_oxidation_model() -> Dict[str, Any]:
     for k, v in metrics.items():
         print(f"{k}: {v:.6f}")
 
+    extra = {"search": search, "selection": selection, "incremental": forest_state(len(X_train))}
+    cost = _save_artifacts(pipeline, X, metrics, extra, data_hash)
+
+    return {
+        "model_path": MODEL_PATH,
+        "meta_path": META_PATH,
+        "binary_path": BINARY_PATH,
+        "metrics": metrics,
+        "cost": cost,
+    }
+
+
+def update_oxidation_model(
+    delta_path: str, append: bool = True, max_trees: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Incremental update: grow new trees on the rows of `delta_path` only and
+    add them to the saved forest (see incremental.py). The current model's
+    errors on the delta rows before the update (prequential) are stored
+    under update.delta_metrics; `metrics` stay those of the last full
+    training. With `append`, the delta rows are also appended to DATA_PATH;
+    without, data_hash chains the previous one with the delta's digest.
+    `max_trees` drops the oldest trees beyond that count. The
+    model updated is the registry's current version, so an update after
+    a rollback builds on the restored model.
+
+    Raises:
+        FileNotFoundError: When the delta CSV or saved model is missing.
+        KeyError: If required columns are missing.
+        ValueError: When the saved model has no incremental state or the
+            delta was already applied.
+    """
+
+    # -----------------------------
+    # Load delta + saved state
+    # -----------------------------
+    delta = load_csv(delta_path)
+    check_delta(delta, OXIDATION_FEATURES, "Oxidation_Rate")
+    digest = file_digest(delta_path)
+
+    # Build on the live version (after a rollback, not the flat files)
+    meta_path = registry.live_path(REGISTRY_DIR, "oxidation", META_PATH)
+    metadata = load_metadata(meta_path)
+    state = metadata.get("incremental")
+    if state is None:
+        raise ValueError(f"{meta_path} has no incremental state; run a full training first.")
+    check_not_applied(state, digest)
+
+    pipeline = joblib.load(registry.live_path(REGISTRY_DIR, "oxidation", MODEL_PATH))
+    X, y = delta[OXIDATION_FEATURES], delta["Oxidation_Rate"]
+
+    # -----------------------------
+    # Evaluate on the new rows, then grow trees on them
+    # -----------------------------
+    delta_metrics = compute_metrics(y, pipeline.predict(X))
+    state, trees_added = grow_forest(pipeline, X, y, state, digest, max_trees)
+
+    print("\n===============================")
+    print(" Oxidation Incremental Update")
+    print("===============================")
+    print(f"Delta rows: {len(delta)} (total {state['n']}), trees added: {trees_added}")
+    for k, v in delta_metrics.items():
+        print(f"{k} (delta, before update): {v:.6f}")
+
+    update = {
+        "delta_path": delta_path,
+        "delta_digest": digest,
+        "appended": append,
+        "delta_rows": len(delta),
+        "total_rows": state["n"],
+        "trees_added": trees_added,
+        "n_trees": len(pipeline.steps[-1][1].estimators_),
+        "delta_metrics": delta_metrics,
+    }
+    extra = {
+        **{k: metadata[k] for k in ("search", "selection") if k in metadata},
+        "incremental": state,
+        "update": update,
+    }
+    metrics = metadata.get("metrics", {})
+
+    # Append first so data_hash covers the delta; undone if saving fails
+    if append:
+        size = append_csv(delta, DATA_PATH)
+        data_hash = file_digest(DATA_PATH)
+    else:
+        size = None
+        data_hash = chain_data_hash(metadata.get("data_hash"), digest)
+    try:
+        cost = _save_artifacts(pipeline, X, metrics, extra, data_hash)
+    except Exception:
+        if size is not None:
+            os.truncate(DATA_PATH, size)
+        raise
+
+    return {
+        "model_path": MODEL_PATH,
+        "meta_path": META_PATH,
+        "binary_path": BINARY_PATH,
+        "metrics": metrics,
+        "cost": cost,
+        "update": update,
+    }
+
+
+def _save_artifacts(
+    pipeline, X, metrics: Dict[str, float], extra: Dict[str, Any], data_hash: str
+) -> Dict[str, Any]:
+    """Save the pipeline and packed forest, then metadata with serving cost."""
+
     # -----------------------------
     # Save Artifacts
     # -----------------------------
     save_model(pipeline, MODEL_PATH)
 
+    # -----------------------------
+    # Export compiled forest
+    # -----------------------------
+    modelfile.save(pipeline, BINARY_PATH)
+
+    # -----------------------------
+    # Serving cost + metadata
+    # -----------------------------
+    cost = {
+        "sklearn": measure_cost(pipeline, X, path=MODEL_PATH),
+        "compiled": measure_cost(modelfile.load(BINARY_PATH), X, path=BINARY_PATH),
+    }
+
+    artifacts = {os.path.basename(p): p for p in (MODEL_PATH, BINARY_PATH)}
+    hashes = {n: file_digest(p) for n, p in artifacts.items()}
     save_metadata(
         META_PATH,
         "Oxidation Model",
         OXIDATION_FEATURES,
         metrics,
+        extra={
+            k: v
+            for k, v in {"cost": cost, **extra, "artifacts": hashes, "data_hash": data_hash}.items()
+            if v is not None
+        },
     )
 
-    print(f"\nModel saved to {MODEL_PATH}")
-    print(f"Metadata saved to {META_PATH}\n")
+    # -----------------------------
+    # Register as the current version
+    # -----------------------------
+    artifacts[os.path.basename(META_PATH)] = META_PATH
+    record = registry.publish(REGISTRY_DIR, "oxidation", artifacts, data_hash, metrics, hashes)
 
-    return {
-        "model_path": MODEL_PATH,
-        "meta_path": META_PATH,
-        "metrics": metrics,
-    }
+    print(f"\nModel saved to {MODEL_PATH}")
+    print(f"Metadata saved to {META_PATH}")
+    print(f"Compiled forest saved to {BINARY_PATH}")
+    print(f"Registered as oxidation version {record['version']}\n")
+    return cost
 
 
 if __name__ == "__main__":
-    train_oxidation_model()
+    parser = argparse.ArgumentParser(description="Train the oxidation model.")
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Cross-validated hyperparameter search (successive halving, all cores)",
+    )
+    parser.add_argument(
+        "--select-tolerance",
+        type=float,
+        default=None,
+        metavar="TOL",
+        help="Pick the cheapest pruned model within TOL relative RMSE of the best (e.g. 0.02)",
+    )
+    parser.add_argument(
+        "--delta",
+        default=None,
+        metavar="CSV",
+        help="Incremental update: grow trees on the rows of CSV instead of retraining",
+    )
+    parser.add_argument(
+        "--no-append",
+        action="store_true",
+        help="With --delta, do not append the delta rows to the training CSV",
+    )
+    parser.add_argument(
+        "--max-trees",
+        type=int,
+        default=None,
+        metavar="N",
+        help="With --delta, drop the oldest trees once the forest exceeds N",
+    )
+    args = parser.parse_args()
+    if args.delta:
+        update_oxidation_model(args.delta, append=not args.no_append, max_trees=args.max_trees)
+    else:
+        train_oxidation_model(tune=args.tune, select_tolerance=args.select_tolerance)
@@ -0,0 +1,143 @@
+"""
+tuning.py
+Cross-validated hyperparameter search for the training scripts.
+
+- k-fold CV over several estimator families per task
+- successive halving (HalvingGridSearchCV): every candidate is first scored
+  on a small subset of the rows, only the best 1/factor move on
+- preprocessing output cached on disk (Pipeline memory), so the
+  ColumnTransformer is fitted once per fold/subset, not once per candidate
+- candidates evaluated in parallel across all cores
+
+Search spaces only contain estimators the compiled serving backends can
+export (linear models → FoldedLinearModel, tree ensembles → CompiledForest).
+"""
+
+from __future__ import annotations
+
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+from joblib import Memory
+from sklearn.base import BaseEstimator, clone
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import HalvingGridSearchCV, KFold
+from sklearn.pipeline import Pipeline
+
+
+# -------------------------------------------------------------------
+# Search spaces (param grids over the pipeline's "model" step)
+# -------------------------------------------------------------------
+
+HARDNESS_SEARCH_SPACE: List[Dict[str, list]] = [
+    {"model": [LinearRegression()]},
+    {"model": [Ridge()], "model__alpha": [0.01, 0.1, 1.0, 10.0]},
+    {"model": [Lasso(max_iter=10_000)], "model__alpha": [0.001, 0.01, 0.1, 1.0]},
+]
+
+_FOREST_GRID = {
+    "model__n_estimators": [100, 300],
+    "model__max_depth": [None, 8, 16],
+    "model__min_samples_leaf": [1, 2, 4],
+}
+
+OXIDATION_SEARCH_SPACE: List[Dict[str, list]] = [
+    {"model": [RandomForestRegressor(random_state=42)], **_FOREST_GRID},
+    {"model": [ExtraTreesRegressor(random_state=42)], **_FOREST_GRID},
+]
+
+
+# -------------------------------------------------------------------
+# Search
+# -------------------------------------------------------------------
+
+def _jsonable(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Estimator objects in param grids → class name, for the metadata JSON."""
+    return {
+        k: type(v).__name__ if isinstance(v, BaseEstimator) else v
+        for k, v in params.items()
+    }
+
+
+def summarize_search(search: HalvingGridSearchCV, wall_time: float) -> Dict[str, Any]:
+    """Compact, JSON-serializable record of a finished search."""
+    res = search.cv_results_
+    results = [
+        {
+            "iteration": int(res["iter"][i]),
+            "n_resources": int(res["n_resources"][i]),
+            "params": _jsonable(res["params"][i]),
+            "mean_test_score": float(res["mean_test_score"][i]),
+            "std_test_score": float(res["std_test_score"][i]),
+            "mean_fit_time": float(res["mean_fit_time"][i]),
+        }
+        for i in range(len(res["params"]))
+    ]
+    # Last (largest-resource) iteration first, best score first within it
+    results.sort(key=lambda r: (-r["iteration"], -r["mean_test_score"]))
+
+    return {
+        "strategy": "successive_halving",
+        "scoring": search.scoring,
+        "cv_folds": search.cv.get_n_splits(),
+        "factor": search.factor,
+        "n_candidates": int(search.n_candidates_[0]),
+        "n_iterations": int(search.n_iterations_),
+        "n_resources": [int(n) for n in search.n_resources_],
+        "wall_time_s": round(wall_time, 3),
+        "best_params": _jsonable(search.best_params_),
+        "best_cv_score": float(search.best_score_),
+        "results": results,
+    }
+
+
+def tune_pipeline(
+    pipeline: Pipeline,
+    search_space: List[Dict[str, list]],
+    X,
+    y,
+    cv: int = 5,
+    factor: int = 3,
+    scoring: str = "neg_root_mean_squared_error",
+    n_jobs: int = -1,
+    random_state: int = 42,
+) -> Tuple[Pipeline, Dict[str, Any]]:
+    """
+    Run the successive-halving CV search and refit the best pipeline on (X, y).
+
+    Returns:
+        best:    fitted Pipeline (no cache attached, ready to save)
+        summary: search record for the metadata JSON
+    """
+    cv = KFold(n_splits=min(cv, len(X)), shuffle=True, random_state=random_state)
+    cache_dir = tempfile.mkdtemp(prefix="tuning-cache-")
+
+    try:
+        search = HalvingGridSearchCV(
+            clone(pipeline).set_params(memory=Memory(cache_dir, verbose=0)),
+            search_space,
+            cv=cv,
+            factor=factor,
+            scoring=scoring,
+            n_jobs=n_jobs,
+            random_state=random_state,
+            refit=True,
+        )
+        start = time.perf_counter()
+        search.fit(X, y)
+        wall_time = time.perf_counter() - start
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    best = search.best_estimator_
+    best.set_params(memory=None)
+
+    summary = summarize_search(search, wall_time)
+    print(f"[INFO] Tuning: {summary['n_candidates']} candidates, "
+          f"{summary['n_iterations']} halving rounds in {wall_time:.1f}s; "
+          f"best {summary['best_params']} ({scoring}={summary['best_cv_score']:.6g})")
+    return best, summary
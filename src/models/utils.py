@@ -3,27 +3,55 @@ Utility functions for training pipelines.
 """
 
 import json
+import os
 from datetime import datetime
 import pandas as pd
 import joblib
 
+from src.inference.artifacts import atomic_path
+
 
 def load_csv(path):
     return pd.read_csv(path)
 
 
+def append_csv(df, path):
+    """
+    Append rows to an existing CSV (columns in the file's order, no header).
+    Returns the previous file size, to undo the append with os.truncate.
+    """
+    columns = pd.read_csv(path, nrows=0).columns
+    size = os.path.getsize(path)
+    with open(path, "rb+") as f:
+        f.seek(-1, 2)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+    df[list(columns)].to_csv(path, mode="a", header=False, index=False)
+    print(f"Appended {len(df)} rows to: {path}")
+    return size
+
+
 def save_model(model, path):
-    joblib.dump(model, path)
+    # Temp file + rename: a reloading worker never reads a torn pickle
+    with atomic_path(path) as tmp:
+        joblib.dump(model, tmp)
     print(f"Model saved to: {path}")
 
 
-def save_metadata(path, model_name, features, metrics):
+def load_metadata(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_metadata(path, model_name, features, metrics, extra=None):
     metadata = {
         "model_name": model_name,
         "trained_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "features": features,
         "metrics": metrics
     }
-    with open(path, "w") as f:
+    # Optional sections, e.g. {"search": ...} from tuning.py
+    metadata.update(extra or {})
+    with atomic_path(path) as tmp, open(tmp, "w") as f:
         json.dump(metadata, f, indent=4)
     print(f"Metadata saved to: {path}")
@@ -1,7 +1,9 @@
 # tests/test_app.py
 import json
+
 from src.app.app import create_app
 
+
 def test_index_route():
     app = create_app()
     client = app.test_client()
@@ -25,3 +27,44 @@ def test_api_predict_json():
     assert res.status_code == 200
     data = res.get_json()
     assert "hardness" in data and "oxidation" in data
+
+def test_api_predict_batch_json():
+    app = create_app()
+    client = app.test_client()
+    row = {
+        "Material": "EN-8",
+        "Current": 140,
+        "Heat_Input": 0.864,
+        "Soaking_Time": 10,
+        "Carbon": 0.37,
+        "Manganese": 0.8
+    }
+    rows = [row, dict(row, Current="abc")]
+    res = client.post("/api/v1/predict/batch", data=json.dumps({"rows": rows}),
+                      content_type="application/json")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["count"] == 2
+    assert data["results"][0]["hardness"] is not None
+    assert data["results"][1]["hardness_error"]
+
+def test_nan_numeric_gets_same_error_from_predict_and_batch():
+    client = create_app().test_client()
+    row = {
+        "Material": "EN-8",
+        "Current": float("nan"),
+        "Heat_Input": 0.864,
+        "Soaking_Time": " NaN ",
+        "Carbon": 0.37,
+        "Manganese": 0.8
+    }
+    # json.dumps writes the non-standard NaN literal, which the API accepts
+    single = client.post("/api/v1/predict", data=json.dumps(row),
+                         content_type="application/json").get_json()
+    batch = client.post("/api/v1/predict/batch", data=json.dumps({"rows": [row]}),
+                        content_type="application/json").get_json()["results"][0]
+
+    assert single["hardness"] is None and single["oxidation"] is None
+    assert single["hardness_error"] == batch["hardness_error"]
+    assert single["oxidation_error"] == batch["oxidation_error"]
+    assert "Missing required value for 'Current'" in single["oxidation_error"]
@@ -0,0 +1,162 @@
+# tests/test_asgi.py
+import asyncio
+import json
+
+import pytest
+
+from src.app.app import create_app
+from src.app.asgi import create_asgi_app
+from src.inference import metrics, predict
+from src.inference.batching import MicroBatcher
+from src.inference.predict import predict_all
+
+SAMPLE_PAYLOAD = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+
+async def _call(app, path, payload, query=b""):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "POST",
+        "path": path,
+        "query_string": query,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_micro_batcher_groups_concurrent_items():
+    calls = []
+
+    def batch_fn(items):
+        calls.append(len(items))
+        return [i * 2 for i in items]
+
+    async def run():
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, window_ms=50)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(10)]
+    assert calls == [4, 4, 2]
+
+
+def test_micro_batcher_holds_running_batches_until_done():
+    seen = []
+
+    async def run():
+        batcher = MicroBatcher(lambda items: seen.append(len(batcher._tasks)) or items, window_ms=1)
+        await batcher.submit(1)
+        await asyncio.sleep(0)
+        return len(batcher._tasks)
+
+    assert asyncio.run(run()) == 0
+    assert seen == [1]
+
+
+def test_asgi_predict_is_micro_batched():
+    app = create_asgi_app(max_batch_size=8, window_ms=20)
+    rows = [dict(SAMPLE_PAYLOAD, Current=120 + i) for i in range(8)] + [
+        dict(SAMPLE_PAYLOAD, Material="Brass")
+    ]
+
+    async def run():
+        return await asyncio.gather(*(_call(app, "/api/v1/predict", r) for r in rows))
+
+    responses = asyncio.run(run())
+
+    assert app.batcher.batches < len(rows)
+    for (status, body), row in zip(responses, rows):
+        expected = predict_all(row)
+        assert status == 200
+        expected_hardness = expected["hardness"].get("prediction")
+        if expected_hardness is None:
+            assert body["hardness"] is None
+        else:
+            assert body["hardness"] == pytest.approx(expected_hardness)
+        assert body["oxidation_error"] == expected["oxidation"].get("error")
+
+
+def test_asgi_predict_records_request_metrics():
+    metrics.reset()
+    app = create_asgi_app(window_ms=1)
+
+    asyncio.run(_call(app, "/api/v1/predict", SAMPLE_PAYLOAD))
+
+    text = metrics.render()
+    assert 'http_requests_total{endpoint="/api/v1/predict",method="POST",status="200"} 1' in text
+    assert 'http_request_duration_seconds_count{endpoint="/api/v1/predict"} 1' in text
+
+
+@pytest.mark.parametrize(
+    "query,status,batched",
+    [
+        (b"explain=false", 200, True),
+        (b"explain=0&uncertainty=", 200, False),
+        (b"explain", 200, False),
+        (b"uncertainty=2", 400, False),
+    ],
+)
+def test_asgi_query_flags_follow_flask_rules(query, status, batched):
+    app = create_asgi_app(window_ms=1)
+
+    got, _ = asyncio.run(_call(app, "/api/v1/predict", SAMPLE_PAYLOAD, query))
+
+    assert got == status
+    assert app.batcher.batches == int(batched)
+
+
+def test_asgi_and_flask_predict_give_the_same_answers():
+    payloads = [
+        SAMPLE_PAYLOAD,
+        dict(SAMPLE_PAYLOAD, Current="150", Material=" en-8 "),
+        dict(SAMPLE_PAYLOAD, Material="Brass"),
+        dict(SAMPLE_PAYLOAD, Carbon="abc"),
+        {"Material": "EN-8"},
+        [SAMPLE_PAYLOAD],
+        "EN-8",
+        7,
+        None,
+        b"{not json",
+        b"",
+    ]
+    app = create_asgi_app(window_ms=1)
+    client = create_app().test_client()
+
+    for payload in payloads:
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        res = client.post("/api/v1/predict", data=body, content_type="application/json")
+        status, got = asyncio.run(_call(app, "/api/v1/predict", payload))
+        assert (status, got) == (res.status_code, pytest.approx(res.get_json())), payload
+
+
+def test_asgi_predict_uses_the_prediction_cache(monkeypatch):
+    if predict._cache is None:
+        pytest.skip("prediction cache disabled")
+    predict._cache.clear()
+    app = create_asgi_app(window_ms=1)
+    row = dict(SAMPLE_PAYLOAD, Current=133)
+
+    asyncio.run(_call(app, "/api/v1/predict", row))
+    hits = predict._cache.hits
+    asyncio.run(_call(app, "/api/v1/predict", row))
+    assert predict._cache.hits == hits + 2
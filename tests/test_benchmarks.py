@@ -0,0 +1,116 @@
+# tests/test_benchmarks.py
+import json
+import threading
+from urllib.parse import parse_qs
+
+import pytest
+from werkzeug.serving import make_server
+
+from benchmarks.load import (
+    ENDPOINTS,
+    Sample,
+    build_requests,
+    load_payloads,
+    parse_mix,
+    run_load,
+    summarize,
+    synthetic_payloads,
+)
+from benchmarks.run import compare, machine_mismatch, slower_than_sklearn
+from src.app.app import create_app
+
+
+def test_compare_flags_regressions_by_direction():
+    baseline = {
+        "latency.hardness.sklearn.p50_ms": 2.0,
+        "throughput.hardness.sklearn.100.rows_per_s": 1000.0,
+        "flask.api_v1_predict.p50_ms": 10.0,
+        "latency.hardness.sklearn.p99_ms": 4.0,
+        "removed.metric_ms": 1.0,
+    }
+    current = {
+        "latency.hardness.sklearn.p50_ms": 3.0,                 # 50% slower
+        "throughput.hardness.sklearn.100.rows_per_s": 1500.0,   # faster
+        "flask.api_v1_predict.p50_ms": 11.0,                    # within threshold
+        "latency.hardness.sklearn.p99_ms": 40.0,               # tails are not gated
+        "new.metric_ms": 5.0,
+    }
+
+    regressions = compare(current, baseline, threshold=0.25)
+
+    assert [r["name"] for r in regressions] == ["latency.hardness.sklearn.p50_ms"]
+    assert regressions[0]["worse_by"] == 0.5
+
+
+def test_compare_throughput_drop_is_regression():
+    regressions = compare({"x.rows_per_s": 500.0}, {"x.rows_per_s": 1000.0}, threshold=0.25)
+    assert regressions and regressions[0]["worse_by"] == 0.5
+
+
+def test_fast_backends_slower_than_sklearn_are_flagged():
+    results = {
+        "throughput.oxidation.sklearn.10000.rows_per_s": 40000.0,
+        "throughput.oxidation.compiled.10000.rows_per_s": 20000.0,  # half sklearn's
+        "throughput.oxidation.numpy.10000.rows_per_s": 38000.0,     # within threshold
+        "throughput.oxidation.compiled.1.rows_per_s": 200.0,        # no sklearn figure
+        "latency.oxidation.compiled.p50_ms": 9.0,
+    }
+
+    slower = slower_than_sklearn(results, threshold=0.25)
+
+    assert [r["name"] for r in slower] == ["throughput.oxidation.compiled.10000.rows_per_s"]
+    assert slower[0]["worse_by"] == 0.5
+
+
+def test_machine_mismatch_names_differing_keys():
+    meta = {"machine": "x86_64", "cpu_count": 8, "python": "3.10.13", "numpy": "1.26.4",
+            "sklearn": "1.3.2", "timestamp": "2026-10-18 08:00:00"}
+
+    assert machine_mismatch(meta, dict(meta, timestamp="earlier")) == []
+    assert machine_mismatch(meta, dict(meta, cpu_count=1, sklearn="1.4.0")) == ["cpu_count", "sklearn"]
+
+
+def test_load_payloads_and_mix(tmp_path):
+    path = tmp_path / "recorded.jsonl"
+    path.write_text(
+        json.dumps({"endpoint": "/predict", "payload": {"Material": "EN-8", "Current": 140}}) + "\n\n"
+        + json.dumps({"Material": "EN-8", "Current": 150}) + "\n"
+    )
+    payloads = load_payloads(str(path))
+    assert payloads == [("/predict", {"Material": "EN-8", "Current": 140}), (None, {"Material": "EN-8", "Current": 150})]
+
+    requests = build_requests(payloads, parse_mix("form=0,json=1"))
+    assert [r.path for r in requests] == ["/predict", "/api/v1/predict"]
+    assert parse_qs(requests[0].body.decode()) == {"Material": ["EN-8"], "Current": ["140"]}
+    assert json.loads(requests[1].body) == {"Material": "EN-8", "Current": 150}
+
+    mixed = build_requests(synthetic_payloads(2000), parse_mix("form=1,json=3"))
+    share = sum(r.path == ENDPOINTS["form"] for r in mixed) / len(mixed)
+    assert 0.2 < share < 0.3
+    with pytest.raises(ValueError):
+        parse_mix("grpc=1")
+
+
+def test_summarize_counts_errors_and_percentiles():
+    samples = [Sample("/predict", 200, i / 1000.0) for i in range(1, 101)] + [Sample("/api/v1/predict", 0, 1.0)]
+    report = summarize(samples, elapsed_s=2.0)
+    assert report["/predict"]["p50_ms"] == pytest.approx(50.5)
+    assert report["/predict"]["error_rate"] == 0.0
+    assert report["/api/v1/predict"]["errors"] == 1
+    assert report["all"]["requests"] == 101 and report["all"]["throughput_per_s"] == 50.5
+
+
+@pytest.mark.parametrize("rate", [0.0, 40.0])
+def test_run_load_against_local_app(rate):
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        requests = build_requests(synthetic_payloads(20), parse_mix("form=1,json=1"))
+        samples = run_load(f"http://127.0.0.1:{server.server_port}", requests, duration=0.5, rate=rate, concurrency=2)
+    finally:
+        server.shutdown()
+
+    report = summarize(samples, 0.5)
+    assert set(report) == {"all", "/predict", "/api/v1/predict"}
+    assert report["all"]["errors"] == 0
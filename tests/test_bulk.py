@@ -0,0 +1,69 @@
+# tests/test_bulk.py
+import pandas as pd
+import pytest
+
+from src.inference import predict
+from src.inference.bulk import main, score_file, score_frame
+from src.inference.predict import predict_all_batch
+
+
+def _write_input(path):
+    df = pd.read_csv("data/oxidation.csv")
+    df["Current"] = df["Current"].astype(object)
+    df.loc[2, "Current"] = "abc"
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_score_file_in_process_matches_batch_api(tmp_path):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    df = _write_input(src)
+
+    rows = score_file(str(src), str(out), chunk_rows=4, workers=1)
+    scored = pd.read_csv(out)
+
+    assert rows == len(df) == len(scored)
+    assert list(scored["Material"]) == list(df["Material"])
+
+    expected = predict_all_batch(pd.read_csv(src).to_dict("records"))
+    for i, r in enumerate(expected):
+        if r["oxidation"]["ok"]:
+            assert scored["oxidation"][i] == pytest.approx(r["oxidation"]["prediction"])
+        else:
+            assert scored["oxidation_error"][i] == r["oxidation"]["error"]
+
+
+def test_process_pool_preserves_order(tmp_path):
+    src = tmp_path / "in.csv"
+    _write_input(src)
+
+    main([str(src), str(tmp_path / "one.csv"), "--workers", "1", "--chunk-rows", "3"])
+    main([str(src), str(tmp_path / "two.csv"), "--workers", "2", "--chunk-rows", "3"])
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(tmp_path / "one.csv"), pd.read_csv(tmp_path / "two.csv")
+    )
+
+
+def test_score_frame_reports_unavailable_model_per_row(monkeypatch):
+    chunk = pd.read_csv("data/oxidation.csv").head(3)
+    real = predict.get_model
+
+    def get_model(name, backend=None):
+        return (None, "corrupt file", "") if name == "hardness" else real(name, backend)
+
+    monkeypatch.setattr(predict, "get_model", get_model)
+    scored = score_frame(chunk)
+
+    assert scored["hardness"].isna().all()
+    assert set(scored["hardness_error"]) == {"Hardness model unavailable: corrupt file"}
+    assert scored["oxidation"].notna().all() and scored["oxidation_error"].isna().all()
+
+
+def test_input_with_prediction_columns_is_refused(tmp_path, capsys):
+    src, out = tmp_path / "in.csv", tmp_path / "out.csv"
+    pd.read_csv("data/oxidation.csv").assign(oxidation=1.0).to_csv(src, index=False)
+
+    assert main([str(src), str(out), "--workers", "1"]) == 1
+    assert "prediction column(s) ['oxidation']" in capsys.readouterr().out
+    assert not out.exists()
@@ -0,0 +1,88 @@
+# tests/test_cache.py
+import time
+
+from src.inference import predict
+from src.inference.cache import PredictionCache, SQLiteCacheBackend
+
+SAMPLE_PAYLOAD = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+
+def test_lru_eviction_and_counters():
+    cache = PredictionCache(maxsize=2, ttl=60)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    assert cache.get(("a",)) == 1      # "a" becomes most recent
+    cache.set(("c",), 3)               # evicts "b"
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("c",)) == 3
+    stats = cache.stats()
+    assert stats == {"hits": 2, "misses": 1, "evictions": 1, "expirations": 0, "size": 2}
+
+
+def test_ttl_expiry():
+    cache = PredictionCache(maxsize=10, ttl=0.01)
+    cache.set(("a",), 1)
+    time.sleep(0.02)
+    assert cache.get(("a",)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    writer = PredictionCache(maxsize=2, ttl=60, backend=SQLiteCacheBackend(path, 2))
+    reader = PredictionCache(maxsize=2, ttl=60, backend=SQLiteCacheBackend(path, 2))
+
+    writer.set(("hardness", "v1", "EN-8", 140.0), {"ok": True, "prediction": 1.5})
+    assert reader.get(("hardness", "v1", "EN-8", 140.0)) == {"ok": True, "prediction": 1.5}
+
+    writer.set(("b",), 2)
+    writer.set(("c",), 3)
+    assert writer.stats()["evictions"] == 1
+    assert len(reader.backend) == 2
+
+
+def test_sqlite_hits_skip_writes_and_size_is_checked_every_n_inserts(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite3"), maxsize=10, evict_every=5)
+    cache = PredictionCache(maxsize=10, ttl=60, backend=backend)
+
+    cache.set(("a",), 1)
+    conn = backend._conn()
+    writes = conn.total_changes
+    for _ in range(3):
+        assert cache.get(("a",)) == 1
+    assert conn.total_changes == writes  # recency is fresh: no UPDATE
+
+    backend.touch_interval = 0.0
+    cache.get(("a",))
+    assert conn.total_changes == writes + 1
+
+    for i in range(13):
+        cache.set((i,), i)
+    assert len(backend) == 14  # over maxsize until the next check
+    cache.set(("last",), 0)
+    assert len(backend) == 10 and cache.stats()["evictions"] == 5
+    assert cache.get(("last",)) == 0
+
+
+def test_predict_uses_cache_and_reload_invalidates():
+    predict.reload_models()
+    before = predict.cache_stats()
+
+    first = predict.predict_hardness(SAMPLE_PAYLOAD)
+    # Equivalent input after canonicalization hits the same entry
+    second = predict.predict_hardness(dict(SAMPLE_PAYLOAD, Material="en-8", Current="140"))
+
+    after = predict.cache_stats()
+    assert first == second
+    assert after["hits"] == before["hits"] + 1
+
+    predict.reload_models()
+    assert predict.cache_stats()["size"] == 0
@@ -0,0 +1,59 @@
+# tests/test_cost.py
+import json
+
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from src.models.cost import measure_cost, predict_work, select_cheapest
+from src.models.pipelines import (
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    build_hardness_pipeline,
+    build_oxidation_pipeline,
+)
+
+
+def _oxidation_forest(n_estimators=30):
+    df = pd.read_csv("data/oxidation.csv")
+    X, y = df[OXIDATION_FEATURES], df["Oxidation_Rate"]
+    pipeline = build_oxidation_pipeline()
+    pipeline.set_params(model=RandomForestRegressor(n_estimators=n_estimators, random_state=0))
+    return pipeline.fit(X, y), X, y
+
+
+def test_measure_cost_fields():
+    df = pd.read_csv("data/hardness.csv")
+    X, y = df[HARDNESS_FEATURES], df["Hardness"]
+    pipeline = build_hardness_pipeline().fit(X, y)
+
+    cost = measure_cost(pipeline, X, batch_rows=50, repeats=3)
+
+    assert cost["batch_rows"] == 50
+    assert cost["latency_single_ms"] > 0 and cost["latency_batch_ms"] > 0
+    assert cost["size_disk_bytes"] > 0 and cost["size_memory_bytes"] > 0
+    json.dumps(cost)
+
+
+def test_select_cheapest_respects_tolerance():
+    pipeline, X, y = _oxidation_forest()
+
+    # Exact: the most accurate variant wins
+    _, strict = select_cheapest(pipeline, X, y, tolerance=0.0)
+    assert strict["chosen"]["cv_rmse"] == strict["best_cv_rmse"]
+
+    # Loose: everything is eligible, so the cheapest variant wins
+    chosen, loose = select_cheapest(pipeline, X, y, tolerance=10.0)
+    cheapest = min(c["predict_work"] for c in loose["candidates"])
+    assert loose["chosen"]["predict_work"] == cheapest == predict_work(chosen)
+    assert predict_work(chosen) < predict_work(pipeline)
+    json.dumps(loose)
+
+
+def test_select_cheapest_keeps_linear_models():
+    df = pd.read_csv("data/hardness.csv")
+    X, y = df[HARDNESS_FEATURES], df["Hardness"]
+
+    chosen, record = select_cheapest(build_hardness_pipeline().fit(X, y), X, y)
+
+    assert len(record["candidates"]) == 1
+    assert type(chosen.named_steps["model"]).__name__ == "LinearRegression"
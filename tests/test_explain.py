@@ -0,0 +1,137 @@
+# tests/test_explain.py
+import copy
+from itertools import combinations
+from math import factorial
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.app import create_app
+from src.inference import modelfile
+from src.inference.explain import ExplanationUnavailable, TreeExplainer, explain
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference.forest import CompiledForest
+from src.inference.predict import (
+    HARDNESS_BINARY_PATH,
+    HARDNESS_MODEL_PATH,
+    OXIDATION_BINARY_PATH,
+    OXIDATION_MODEL_PATH,
+    get_model,
+    predict_all_batch,
+)
+from src.models.pipelines import HARDNESS_FEATURES, OXIDATION_FEATURES
+
+
+def _conditional_expectation(tree, x, groups, subset):
+    """Path-dependent E[f(x) | x_S]: follow x on features in S, else cover-weight both children."""
+    t = tree.tree_
+
+    def walk(node):
+        left, right = t.children_left[node], t.children_right[node]
+        if left == -1:
+            return t.value[node][0][0]
+        if groups[t.feature[node]] in subset:
+            return walk(left if x[t.feature[node]] <= t.threshold[node] else right)
+        cover = t.weighted_n_node_samples
+        return (cover[left] * walk(left) + cover[right] * walk(right)) / cover[node]
+
+    return walk(0)
+
+
+def _brute_force_shap(trees, x, groups, n_features):
+    phi = np.zeros(n_features)
+    for i in range(n_features):
+        others = [j for j in range(n_features) if j != i]
+        for size in range(n_features):
+            weight = factorial(size) * factorial(n_features - size - 1) / factorial(n_features)
+            for subset in combinations(others, size):
+                s = set(subset)
+                phi[i] += weight * np.mean([
+                    _conditional_expectation(t, x, groups, s | {i}) - _conditional_expectation(t, x, groups, s)
+                    for t in trees
+                ])
+    return phi
+
+
+def test_tree_shap_matches_brute_force_shapley():
+    pipeline = joblib.load(OXIDATION_MODEL_PATH)
+    pre = CompiledPreprocessor.from_column_transformer(dict(pipeline.steps)["preprocess"])
+    small = copy.copy(pipeline.steps[-1][1])
+    small.estimators_ = small.estimators_[:4]
+
+    explainer = TreeExplainer(CompiledForest.from_parts(pre, small))
+    df = pd.read_csv("data/oxidation.csv")[OXIDATION_FEATURES].sample(5, random_state=0)
+    X = np.asarray(pre.transform_frame(df), dtype=np.float32)
+
+    # One-hot material columns form one feature, then one per numeric input
+    groups = [0] * pre.n_categories + list(range(1, len(pre.numeric_features) + 1))
+    phi = explainer.shap_values(X)
+    for k in range(len(df)):
+        expected = _brute_force_shap(small.estimators_, X[k], groups, len(explainer.features))
+        np.testing.assert_allclose(phi[k], expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("backend", ["sklearn", "numpy", "compiled"])
+def test_attributions_sum_to_prediction(backend):
+    for name, features, path in (
+        ("hardness", HARDNESS_FEATURES, "data/hardness.csv"),
+        ("oxidation", OXIDATION_FEATURES, "data/oxidation.csv"),
+    ):
+        model, _, _ = get_model(name, backend)
+        df = pd.read_csv(path)[features]
+        base_value, names, values = explain(model, df)
+
+        assert names == features
+        np.testing.assert_allclose(base_value + values.sum(axis=1), model.predict(df), atol=1e-9)
+
+
+def test_linear_attributions_are_coefficient_times_deviation():
+    pipeline = joblib.load(HARDNESS_MODEL_PATH)
+    df = pd.read_csv("data/hardness.csv")[HARDNESS_FEATURES]
+    _, _, values = explain(pipeline, df)
+
+    # Baseline: training-split means stored with the model
+    stats = pipeline.steps[-1][1].residuals_
+    mean = np.asarray(stats["design_mean"])[len(stats["categories"]):]
+    scaler = dict(pipeline.steps)["preprocess"].named_transformers_["num"]
+    coef = pipeline.steps[-1][1].coef_[-len(mean):]
+
+    deviation = (df[stats["numeric_features"]].to_numpy() - mean) / scaler.scale_
+    np.testing.assert_allclose(values[:, 1:], coef * deviation, atol=1e-9)
+
+
+def test_missing_artifact_data_reports_unavailable():
+    forest = modelfile.load(OXIDATION_BINARY_PATH)
+    forest.cover = None
+    with pytest.raises(ExplanationUnavailable):
+        TreeExplainer(forest)
+
+    linear = modelfile.load(HARDNESS_BINARY_PATH)
+    linear.residuals_ = None
+    with pytest.raises(ExplanationUnavailable):
+        explain(linear, pd.read_csv("data/hardness.csv")[HARDNESS_FEATURES])
+
+
+def test_batch_and_api_explain():
+    rows = pd.read_csv("data/oxidation.csv").head(3).to_dict("records") + [{"Material": "X"}]
+    results = predict_all_batch(rows, explain=True)
+    for r in results[:-1]:
+        for name in ("hardness", "oxidation"):
+            total = r[name]["base_value"] + sum(r[name]["attributions"].values())
+            assert total == pytest.approx(r[name]["prediction"])
+    assert not results[-1]["oxidation"]["ok"]
+
+    client = create_app().test_client()
+    res = client.post("/api/v1/predict?explain", json=rows[0])
+    assert res.status_code == 200
+    body = res.get_json()
+    assert set(body["oxidation_attributions"]) == set(OXIDATION_FEATURES)
+    assert "hardness_base_value" in body
+
+    res = client.post("/api/v1/predict/batch?explain=true", json=rows[:2])
+    assert all("hardness_attributions" in r for r in res.get_json()["results"])
+
+    assert "oxidation_attributions" not in client.post("/api/v1/predict", json=rows[0]).get_json()
+    assert client.post("/api/v1/predict?explain=maybe", json=rows[0]).status_code == 400
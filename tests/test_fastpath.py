@@ -0,0 +1,116 @@
+# tests/test_fastpath.py
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from src.inference import modelfile
+from src.inference.fastpath import compile_pipeline
+from src.inference.forest import CompiledForest
+from src.inference.linear import FoldedLinearModel
+from src.inference.predict import (
+    HARDNESS_MODEL_PATH,
+    OXIDATION_MODEL_PATH,
+    predict_hardness,
+    predict_oxidation,
+)
+from src.models.pipelines import HARDNESS_FEATURES, OXIDATION_FEATURES
+
+SAMPLE_PAYLOAD = {
+    "Material": "Mild Steel",
+    "Current": 135,
+    "Heat_Input": 0.85,
+    "Soaking_Time": 15,
+    "Carbon": 0.2,
+    "Manganese": 0.6,
+}
+
+
+def _check_bit_identical(model_path, csv_path, features):
+    pipeline = joblib.load(model_path)
+    fast = compile_pipeline(pipeline)
+    df = pd.read_csv(csv_path)[features]
+
+    np.testing.assert_array_equal(fast.predict(df), pipeline.predict(df))
+    for record in df.head(5).to_dict("records"):
+        expected = float(pipeline.predict(pd.DataFrame([record], columns=features))[0])
+        assert fast.predict_record(record) == expected
+
+
+def test_fast_hardness_is_bit_identical():
+    _check_bit_identical(HARDNESS_MODEL_PATH, "data/hardness.csv", HARDNESS_FEATURES)
+
+
+def test_fast_oxidation_is_bit_identical():
+    _check_bit_identical(OXIDATION_MODEL_PATH, "data/oxidation.csv", OXIDATION_FEATURES)
+
+
+def test_numpy_backend_selectable_from_public_api():
+    assert predict_hardness(SAMPLE_PAYLOAD, backend="numpy") == predict_hardness(SAMPLE_PAYLOAD)
+    assert predict_oxidation(SAMPLE_PAYLOAD, backend="numpy") == predict_oxidation(SAMPLE_PAYLOAD)
+
+
+def test_folded_linear_matches_pipeline():
+    pipeline = joblib.load(HARDNESS_MODEL_PATH)
+    folded = FoldedLinearModel.from_pipeline(pipeline)
+    df = pd.read_csv("data/hardness.csv")[HARDNESS_FEATURES]
+
+    np.testing.assert_allclose(folded.predict(df), pipeline.predict(df), rtol=1e-9)
+    record = df.iloc[0].to_dict()
+    np.testing.assert_allclose(folded.predict_record(record), pipeline.predict(df.head(1))[0])
+
+
+def test_compiled_hardness_backend_skips_joblib():
+    result = predict_hardness(SAMPLE_PAYLOAD, backend="compiled")
+    assert result["ok"]
+    np.testing.assert_allclose(result["prediction"], predict_hardness(SAMPLE_PAYLOAD)["prediction"])
+
+
+def test_compiled_forest_matches_sklearn(tmp_path):
+    pipeline = joblib.load(OXIDATION_MODEL_PATH)
+    path = tmp_path / "forest.bin"
+    modelfile.save(CompiledForest.from_pipeline(pipeline), str(path))
+    forest = modelfile.load(str(path), mmap=False)
+
+    df = pd.read_csv("data/oxidation.csv")[OXIDATION_FEATURES]
+    np.testing.assert_allclose(forest.predict(df), pipeline.predict(df), rtol=1e-12)
+    np.testing.assert_allclose(
+        forest.predict_record(df.iloc[3].to_dict()), pipeline.predict(df.iloc[[3]])[0], rtol=1e-12
+    )
+
+
+def test_compiled_forest_leaf_tables_and_walk_fallback():
+    pre = CompiledForest.from_pipeline(joblib.load(OXIDATION_MODEL_PATH)).preprocessor
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 4)).astype(np.float32)
+    y = X[:, 0] * 2 + np.sin(X[:, 1]) + rng.normal(scale=0.1, size=600)
+
+    # max_depth=5 fits the 64-bit leaf masks; unlimited trees (~600 leaves) walk
+    for max_depth, tables in ((5, True), (None, False)):
+        forest = RandomForestRegressor(n_estimators=7, max_depth=max_depth, random_state=0).fit(X, y)
+        compiled = CompiledForest.from_parts(pre, forest)
+
+        assert (compiled.leaf_tables is not None) == tables
+        np.testing.assert_allclose(compiled.predict_transformed(X), forest.predict(X), rtol=1e-12)
+        np.testing.assert_array_equal(
+            compiled.predict_trees(X), np.stack([tree.predict(X) for tree in forest.estimators_])
+        )
+
+
+def test_compiled_forest_file_is_memory_mapped(tmp_path):
+    pipeline = joblib.load(OXIDATION_MODEL_PATH)
+    path = str(tmp_path / "forest.bin")
+    modelfile.save(CompiledForest.from_pipeline(pipeline), path)
+
+    forest = modelfile.load(path)
+    assert not forest.threshold.flags.owndata
+    assert not forest.threshold.flags.writeable
+
+    df = pd.read_csv("data/oxidation.csv")[OXIDATION_FEATURES]
+    np.testing.assert_allclose(forest.predict(df), pipeline.predict(df), rtol=1e-12)
+
+
+def test_compiled_oxidation_backend():
+    result = predict_oxidation(SAMPLE_PAYLOAD, backend="compiled")
+    assert result["ok"]
+    np.testing.assert_allclose(result["prediction"], predict_oxidation(SAMPLE_PAYLOAD)["prediction"])
@@ -0,0 +1,132 @@
+# tests/test_incremental.py
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Lasso, Ridge
+
+from src.inference import modelfile
+from src.inference.fastpath import CompiledPreprocessor
+from src.inference.forest import CompiledForest
+from src.inference.uncertainty import residual_stats
+from src.models import train_hardness, train_oxidation
+from src.models.incremental import (
+    forest_state,
+    grow_forest,
+    linear_residual_stats,
+    linear_state,
+    refit_linear,
+    update_linear_state,
+)
+from src.models.pipelines import (
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    build_hardness_pipeline,
+    build_oxidation_pipeline,
+)
+
+
+def _state_for(pipeline, X, y):
+    pre = CompiledPreprocessor.from_column_transformer(pipeline.named_steps["preprocess"])
+    return linear_state(X, y, pre.categorical_feature, pre.categories, pre.numeric_features), pre
+
+
+@pytest.mark.parametrize("estimator", [None, Ridge(alpha=1.0)])
+def test_linear_update_matches_full_refit(estimator):
+    df = pd.read_csv("data/hardness.csv")
+    X, y = df[HARDNESS_FEATURES], df["Hardness"]
+
+    def build():
+        pipeline = build_hardness_pipeline()
+        return pipeline if estimator is None else pipeline.set_params(model=estimator)
+
+    pipeline = build().fit(X.iloc[:10], y.iloc[:10])
+    state, pre = _state_for(pipeline, X.iloc[:10], y.iloc[:10])
+    state = update_linear_state(state, X.iloc[10:13], y.iloc[10:13], "a")
+    state = update_linear_state(state, X.iloc[13:], y.iloc[13:], "b")
+    refit_linear(pipeline, state)
+
+    full = build().fit(X, y)
+    np.testing.assert_allclose(pipeline.predict(X), full.predict(X), rtol=1e-10)
+    unknown = X.head(2).assign(Material="Unobtainium")
+    np.testing.assert_allclose(pipeline.predict(unknown), full.predict(unknown), rtol=1e-10)
+    assert state["n"] == len(df) and state["deltas"] == ["a", "b"]
+
+    expected = residual_stats(X, y, full.predict(X), pre.categorical_feature, pre.categories, pre.numeric_features)
+    stats = linear_residual_stats(pipeline, state)
+    assert stats["dof"] == expected["dof"]
+    assert stats["std"] == pytest.approx(expected["std"], rel=1e-8)
+    np.testing.assert_allclose(stats["xtx_inv"], expected["xtx_inv"], rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(stats["design_mean"], expected["design_mean"])
+
+
+def test_linear_update_rejects_what_it_cannot_absorb():
+    df = pd.read_csv("data/hardness.csv")
+    X, y = df[HARDNESS_FEATURES], df["Hardness"]
+    pipeline = build_hardness_pipeline().fit(X, y)
+    state, _ = _state_for(pipeline, X, y)
+
+    with pytest.raises(ValueError, match="unseen materials"):
+        update_linear_state(state, X.head(1).assign(Material="Unobtainium"), y.head(1))
+
+    lasso = build_hardness_pipeline().set_params(model=Lasso()).fit(X, y)
+    with pytest.raises(ValueError, match="full retrain"):
+        refit_linear(lasso, state)
+
+
+def test_grow_forest_adds_proportional_trees_on_delta_only():
+    df = pd.read_csv("data/oxidation.csv")
+    X, y = df[OXIDATION_FEATURES], df["Oxidation_Rate"]
+    pipeline = build_oxidation_pipeline().set_params(model__n_estimators=20).fit(X.iloc[:20], y.iloc[:20])
+    forest = pipeline.steps[-1][1]
+    old_trees = list(forest.estimators_)
+    scaler_mean = pipeline.named_steps["preprocess"].named_transformers_["num"].mean_.copy()
+
+    state, added = grow_forest(pipeline, X.iloc[20:], y.iloc[20:], forest_state(20), "d")
+
+    assert added == 10 and len(forest.estimators_) == 30
+    assert forest.estimators_[:20] == old_trees
+    assert all(t.tree_.n_node_samples[0] <= 10 for t in forest.estimators_[20:])
+    np.testing.assert_array_equal(
+        pipeline.named_steps["preprocess"].named_transformers_["num"].mean_, scaler_mean
+    )
+    assert state == {"n": 30, "deltas": ["d"]}
+    assert np.array_equal(CompiledForest.from_pipeline(pipeline).predict(X), pipeline.predict(X))
+
+    state, _ = grow_forest(pipeline, X.iloc[:5], y.iloc[:5], state, max_trees=25)
+    assert len(forest.estimators_) == forest.n_estimators == 25
+    assert forest.estimators_[0] is old_trees[10]  # 30 + 5 new trees, oldest 10 dropped
+
+
+def test_update_scripts_write_artifacts_and_refuse_repeats(tmp_path, monkeypatch):
+    for module, name, data in (
+        (train_hardness, "hardness", "data/hardness.csv"),
+        (train_oxidation, "oxidation", "data/oxidation.csv"),
+    ):
+        df = pd.read_csv(data)
+        base, delta = tmp_path / f"{name}.csv", tmp_path / f"{name}_delta.csv"
+        df.iloc[:-4].to_csv(base, index=False)
+        df.iloc[-4:].to_csv(delta, index=False)
+
+        monkeypatch.setattr(module, "DATA_PATH", str(base))
+        monkeypatch.setattr(module, "MODEL_PATH", str(tmp_path / f"{name}.joblib"))
+        monkeypatch.setattr(module, "META_PATH", str(tmp_path / f"{name}_metadata.json"))
+        monkeypatch.setattr(module, "REGISTRY_DIR", str(tmp_path / "registry"))
+        monkeypatch.setattr(module, "BINARY_PATH", str(tmp_path / f"{name}.bin"))
+
+    train_hardness.train_hardness_model()
+    result = train_hardness.update_hardness_model(str(tmp_path / "hardness_delta.csv"))
+    assert result["update"]["delta_rows"] == 4
+    assert set(result["update"]["delta_metrics"]) == {"MAE", "RMSE", "R2"}
+    assert len(pd.read_csv(tmp_path / "hardness.csv")) == len(pd.read_csv("data/hardness.csv"))
+    pipeline = joblib.load(tmp_path / "hardness.joblib")
+    assert pipeline.steps[-1][1].residuals_["n"] == result["update"]["total_rows"]
+    with pytest.raises(ValueError, match="already applied"):
+        train_hardness.update_hardness_model(str(tmp_path / "hardness_delta.csv"))
+
+    train_oxidation.train_oxidation_model()
+    result = train_oxidation.update_oxidation_model(str(tmp_path / "oxidation_delta.csv"), append=False)
+    assert result["update"]["n_trees"] == 300 + result["update"]["trees_added"]
+    forest = modelfile.load(str(tmp_path / "oxidation.bin"))
+    assert forest.n_trees == result["update"]["n_trees"]
+    assert len(pd.read_csv(tmp_path / "oxidation.csv")) == len(pd.read_csv("data/oxidation.csv")) - 4
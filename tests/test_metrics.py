@@ -0,0 +1,95 @@
+# tests/test_metrics.py
+import json
+
+from src.app.app import create_app
+from src.inference import metrics
+
+
+def test_counters_and_histograms_render():
+    metrics.reset()
+    metrics.inc("predictions_total", model="hardness", outcome="ok")
+    metrics.inc("predictions_total", 2, model="hardness", outcome="ok")
+    metrics.observe("inference_stage_duration_seconds", 0.0003, stage="validate", model="hardness")
+    metrics.observe("inference_stage_duration_seconds", 0.02, stage="validate", model="hardness")
+
+    text = metrics.render()
+
+    assert "# TYPE predictions_total counter" in text
+    assert 'predictions_total{model="hardness",outcome="ok"} 3' in text
+    labels = 'model="hardness",stage="validate"'
+    assert f'inference_stage_duration_seconds_bucket{{{labels},le="0.0005"}} 1' in text
+    assert f'inference_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"inference_stage_duration_seconds_count{{{labels}}} 2" in text
+
+
+def test_render_sums_other_worker_snapshots(tmp_path, monkeypatch):
+    metrics.reset()
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+    other = {
+        "counters": [["predictions_total", [["model", "hardness"], ["outcome", "ok"]], 5]],
+        "histograms": [],
+    }
+    (tmp_path / "metrics-999999.json").write_text(json.dumps(other))
+
+    metrics.inc("predictions_total", model="hardness", outcome="ok")
+    text = metrics.render()
+
+    assert 'predictions_total{model="hardness",outcome="ok"} 6' in text
+    # The scraped process publishes its own snapshot too
+    assert any(p.name != "metrics-999999.json" for p in tmp_path.glob("metrics-*.json"))
+
+
+def test_reused_pid_keeps_exited_worker_snapshot(tmp_path, monkeypatch):
+    metrics.reset()
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_process_id", metrics._process_id)
+    metrics.inc("predictions_total", 5, model="hardness", outcome="ok")
+    metrics.flush()
+
+    # A new process lifetime under the same pid (as after a fork that reuses it)
+    metrics._after_fork_in_child()
+    metrics.inc("predictions_total", model="hardness", outcome="ok")
+
+    assert 'predictions_total{model="hardness",outcome="ok"} 6' in metrics.render()
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 2
+
+
+def test_disabled_metrics_are_noops(monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(metrics, "ENABLED", False)
+
+    def clock():
+        raise AssertionError("disabled timers must not read the clock")
+
+    metrics.inc("predictions_total", model="hardness", outcome="ok")
+    with monkeypatch.context() as m:
+        m.setattr(metrics.time, "perf_counter", clock)
+        with metrics.stage("validate", "hardness"), metrics.timer("model_load_duration_seconds"):
+            pass
+
+    assert metrics.render() == "\n"
+    res = create_app().test_client().get("/metrics")
+    assert res.status_code == 404
+
+
+def test_metrics_endpoint_reports_requests_and_stages():
+    metrics.reset()
+    client = create_app().test_client()
+    payload = {
+        "Material": "EN-8",
+        "Current": 140,
+        "Heat_Input": 0.864,
+        "Soaking_Time": 10,
+        "Carbon": 0.37,
+        "Manganese": 0.8
+    }
+    client.post("/api/v1/predict", data=json.dumps(payload), content_type="application/json")
+    client.post("/api/v1/predict", data=json.dumps(dict(payload, Material="X")),
+                content_type="application/json")
+
+    res = client.get("/metrics")
+    assert res.status_code == 200
+    text = res.get_data(as_text=True)
+    assert 'http_requests_total{endpoint="/api/v1/predict",method="POST",status="200"} 2' in text
+    assert 'outcome="validation_error"' in text
+    assert 'stage="validate"' in text
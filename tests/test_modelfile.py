@@ -0,0 +1,108 @@
+# tests/test_modelfile.py
+import json
+import os
+import struct
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference import modelfile
+from src.inference.artifacts import BINARY_ALIGN, load_binary, save_binary
+from src.inference.forest import CompiledForest
+from src.inference.linear import FoldedLinearModel
+from src.inference.predict import (
+    HARDNESS_BINARY_PATH,
+    HARDNESS_MODEL_PATH,
+    OXIDATION_BINARY_PATH,
+    OXIDATION_MODEL_PATH,
+)
+from src.models.pipelines import HARDNESS_FEATURES, OXIDATION_FEATURES
+
+CASES = [
+    (HARDNESS_MODEL_PATH, "data/hardness.csv", HARDNESS_FEATURES, FoldedLinearModel),
+    (OXIDATION_MODEL_PATH, "data/oxidation.csv", OXIDATION_FEATURES, CompiledForest),
+]
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+@pytest.mark.parametrize("pipeline_path,data,features,cls", CASES)
+def test_binary_model_matches_sklearn(tmp_path, pipeline_path, data, features, cls, mmap):
+    pipeline = joblib.load(pipeline_path)
+    path = str(tmp_path / "model.bin")
+    modelfile.save(pipeline, path)
+    model = modelfile.load(path, mmap=mmap)
+
+    assert isinstance(model, cls)
+    df = pd.read_csv(data)[features]
+    np.testing.assert_allclose(model.predict(df), pipeline.predict(df), rtol=1e-12)
+    np.testing.assert_allclose(
+        model.predict_record(df.iloc[3].to_dict()), pipeline.predict(df.iloc[[3]])[0], rtol=1e-12
+    )
+    unknown = df.head(3).assign(Material="Unobtainium")
+    np.testing.assert_allclose(model.predict(unknown), pipeline.predict(unknown), rtol=1e-12)
+
+
+def test_shipped_binary_models_match_pipelines():
+    for binary, (pipeline_path, data, features, _) in zip(
+        (HARDNESS_BINARY_PATH, OXIDATION_BINARY_PATH), CASES
+    ):
+        df = pd.read_csv(data)[features]
+        np.testing.assert_allclose(
+            modelfile.load(binary).predict(df), joblib.load(pipeline_path).predict(df), rtol=1e-12
+        )
+
+
+def test_forest_arrays_are_aligned_views_of_the_mapped_file(tmp_path):
+    path = str(tmp_path / "forest.bin")
+    modelfile.save(joblib.load(OXIDATION_MODEL_PATH), path)
+
+    forest = modelfile.load(path)
+    for array in (forest.threshold, forest.children, forest.value, forest.cover):
+        assert not array.flags.owndata and not array.flags.writeable
+        assert array.ctypes.data % BINARY_ALIGN == 0
+
+    with open(path, "rb") as f:
+        magic, version, header_len = struct.unpack("<8sII", f.read(16))
+        header = json.loads(f.read(header_len))
+    assert (magic, version, header["kind"]) == (b"MHOMODEL", 1, "compiled-forest")
+    assert all(entry["offset"] % BINARY_ALIGN == 0 for entry in header["arrays"])
+    assert os.path.getsize(path) % BINARY_ALIGN == 0
+
+
+def test_container_round_trip_and_rejects_bad_files(tmp_path):
+    path = str(tmp_path / "x.bin")
+    arrays = {
+        "empty": np.zeros(0),
+        "names": np.array(["EN-8", "SS-304"]),
+        "grid": np.arange(12, dtype=np.int32).reshape(3, 4),
+    }
+    save_binary(path, "test", {"note": "ok"}, arrays)
+    kind, meta, loaded = load_binary(path)
+    assert (kind, meta) == ("test", {"note": "ok"})
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(loaded[name], array)
+        assert loaded[name].dtype == array.dtype
+
+    data = open(path, "rb").read()
+    for bad in (b"", b"NOTAMODEL" + data[9:], data[: len(data) - 2 * BINARY_ALIGN]):
+        with open(path, "wb") as f:
+            f.write(bad)
+        with pytest.raises(ValueError):
+            load_binary(path)
+
+    with pytest.raises(TypeError):
+        save_binary(path, "test", {}, {"objects": np.array([{}], dtype=object)})
+
+    save_binary(path, "folded-linear", {"version": 99}, {})
+    with pytest.raises(ValueError, match="Unsupported binary model"):
+        modelfile.load(path)
+    assert os.listdir(tmp_path) == ["x.bin"]
+
+
+def test_export_cli(tmp_path, capsys):
+    path = str(tmp_path / "hardness.bin")
+    assert modelfile.main([HARDNESS_MODEL_PATH, path]) == 0
+    assert "FoldedLinearModel" in capsys.readouterr().out
+    assert modelfile.load(path).residuals_ is not None
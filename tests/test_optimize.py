@@ -0,0 +1,69 @@
+# tests/test_optimize.py
+import pytest
+
+from src.app.app import create_app
+from src.inference.optimize import optimize, parse_problem
+from src.inference.predict import predict_all
+from src.inference.validator import ValidationError
+
+REQUEST = {
+    "fixed": {"Material": "EN-8", "Carbon": 0.37, "Manganese": 0.8},
+    "bounds": {"Current": [120, 160], "Heat_Input": [0.8, 0.912], "Soaking_Time": [5, 15]},
+    "objective": {"minimize": "oxidation"},
+    "constraints": {"hardness": {"min": 330}},
+    "population": 64,
+    "max_evaluations": 640,
+}
+
+
+@pytest.mark.parametrize("backend", ["sklearn", "compiled"])
+def test_optimize_meets_constraint_within_bounds(backend):
+    result = optimize(parse_problem(REQUEST), backend)
+
+    assert result["ok"] and result["feasible"]
+    assert result["evaluations"] <= 640
+    best = result["best"]
+    assert best["predictions"]["hardness"] >= 330
+    assert 120 <= best["inputs"]["Current"] <= 160
+    assert 5 <= best["inputs"]["Soaking_Time"] <= 15
+
+    # Reported predictions are what the single-row API gives for those inputs
+    single = predict_all(best["inputs"], backend)
+    assert best["predictions"]["oxidation"] == pytest.approx(single["oxidation"]["prediction"])
+    assert best["predictions"]["hardness"] == pytest.approx(single["hardness"]["prediction"])
+
+    # Top candidates are distinct and sorted by objective
+    oxidation = [c["predictions"]["oxidation"] for c in result["top"]]
+    assert oxidation == sorted(oxidation)
+    assert len({tuple(c["inputs"].values()) for c in result["top"]}) == len(result["top"])
+
+
+def test_optimize_is_reproducible_and_reports_infeasible():
+    first = optimize(parse_problem(REQUEST))
+    assert optimize(parse_problem(REQUEST))["best"] == first["best"]
+
+    result = optimize(parse_problem(dict(REQUEST, constraints={"hardness": {"min": 10_000}})))
+    assert result["ok"] and not result["feasible"]
+    assert result["best"]["violation"] > 0
+
+
+def test_parse_problem_rejects_bad_requests():
+    with pytest.raises(ValidationError):
+        parse_problem(dict(REQUEST, bounds={"Material": ["EN-8", "Mild Steel"]}))
+    with pytest.raises(ValidationError):
+        parse_problem(dict(REQUEST, objective={"minimize": "cost"}))
+    with pytest.raises(ValidationError, match="Carbon"):
+        parse_problem(dict(REQUEST, fixed={"Material": "EN-8", "Manganese": 0.8}))
+
+
+def test_api_optimize():
+    app = create_app()
+    client = app.test_client()
+
+    res = client.post("/api/v1/optimize", json=dict(REQUEST, top_k=3))
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body["feasible"] and len(body["top"]) <= 3
+
+    res = client.post("/api/v1/optimize", json=dict(REQUEST, bounds={}))
+    assert res.status_code == 400
@@ -1,5 +1,11 @@
 # tests/test_predict.py
-from src.inference.predict import predict_hardness, predict_oxidation
+from src.inference.predict import (
+    predict_hardness,
+    predict_oxidation,
+    predict_all,
+    predict_hardness_batch,
+    predict_oxidation_batch,
+)
 
 SAMPLE_PAYLOAD = {
     "Material": "EN-8",
@@ -21,3 +27,29 @@ def test_predict_oxidation_returns_number():
     r = predict_oxidation(SAMPLE_PAYLOAD)
     assert "error" not in r
     assert isinstance(r.get("prediction"), float)
+
+
+def test_predict_batch_matches_single_and_isolates_bad_rows():
+    bad = dict(SAMPLE_PAYLOAD, Material="Unobtainium")
+    rows = [SAMPLE_PAYLOAD, bad, dict(SAMPLE_PAYLOAD, Current=150)]
+
+    hardness = predict_hardness_batch(rows)
+    oxidation = predict_oxidation_batch(rows)
+
+    assert len(hardness) == len(oxidation) == 3
+    assert hardness[0]["prediction"] == predict_hardness(SAMPLE_PAYLOAD)["prediction"]
+    assert oxidation[0]["prediction"] == predict_oxidation(SAMPLE_PAYLOAD)["prediction"]
+    assert not hardness[1]["ok"] and "Invalid material" in hardness[1]["error"]
+    assert not oxidation[1]["ok"]
+    assert hardness[2]["ok"] and oxidation[2]["ok"]
+
+
+def test_predict_all_matches_individual_calls():
+    both = predict_all(SAMPLE_PAYLOAD)
+    assert both["hardness"] == predict_hardness(SAMPLE_PAYLOAD)
+    assert both["oxidation"] == predict_oxidation(SAMPLE_PAYLOAD)
+
+    partial = dict(SAMPLE_PAYLOAD, Soaking_Time="")
+    both = predict_all(partial)
+    assert both["hardness"]["ok"]
+    assert both["oxidation"] == predict_oxidation(partial)
@@ -0,0 +1,180 @@
+# tests/test_registry.py
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference import predict, registry, watcher
+from src.inference.artifacts import atomic_path, load_binary, save_binary
+from src.models import train_hardness
+from src.models.incremental import chain_data_hash
+
+SAMPLE_PAYLOAD = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+
+def _publish_copy(root, tmp_path, tag):
+    """Register a private copy of the hardness artifacts, with a marker in its metadata."""
+    src = tmp_path / f"src-{tag}"
+    src.mkdir()
+    shutil.copy(predict.HARDNESS_MODEL_PATH, src / "hardness_model.joblib")
+    shutil.copy(predict.HARDNESS_BINARY_PATH, src / "hardness_model.bin")
+    (src / "hardness_metadata.json").write_text(json.dumps({"tag": tag}))
+    artifacts = {p.name: str(p) for p in src.iterdir()}
+    return registry.publish(str(root), "hardness", artifacts, data_hash="d" * 64, metrics={"tag": tag})
+
+
+def test_publish_records_hashes_and_rollback_moves_current(tmp_path):
+    root = tmp_path / "registry"
+    first = _publish_copy(root, tmp_path, "a")
+    second = _publish_copy(root, tmp_path, "b")
+
+    assert first["version"] != second["version"]
+    assert registry.current(str(root), "hardness")["version"] == second["version"]
+    for name, digest in second["artifacts"].items():
+        assert registry.file_digest(os.path.join(second["path"], name)) == digest
+    assert [r["version"] for r in registry.versions(str(root), "hardness")] == [
+        first["version"], second["version"]
+    ]
+
+    restored = registry.rollback(str(root), "hardness")
+    assert restored["version"] == first["version"] and restored["metrics"] == {"tag": "a"}
+    with pytest.raises(registry.RegistryError):
+        registry.rollback(str(root), "hardness")
+    assert registry.rollback(str(root), "hardness", second["version"])["version"] == second["version"]
+    with pytest.raises(registry.RegistryError):
+        registry.rollback(str(root), "hardness", "no-such-version")
+
+    assert registry.main(["--root", str(root), "rollback", "hardness"]) == 0
+    assert registry.current(str(root), "hardness")["version"] == first["version"]
+    assert registry.main(["--root", str(root), "rollback", "oxidation"]) == 1
+    assert not [n for n in os.listdir(root) if ".tmp-" in n]
+
+
+def test_atomic_path_leaves_target_intact_on_failure(tmp_path):
+    target = tmp_path / "model.json"
+    target.write_text("old")
+    with pytest.raises(RuntimeError), atomic_path(str(target)) as tmp, open(tmp, "w") as f:
+        f.write("half")
+        raise RuntimeError("crash mid-write")
+    assert target.read_text() == "old"
+    assert os.listdir(tmp_path) == ["model.json"]
+
+
+def test_binary_replace_keeps_old_mappings_valid(tmp_path):
+    path = str(tmp_path / "forest.bin")
+    save_binary(path, "test", {}, {"value": np.arange(1000.0), "stale": np.zeros(3)})
+    _, _, mapped = load_binary(path)
+
+    save_binary(path, "test", {}, {"value": np.full(1000, 7.0)})
+
+    np.testing.assert_array_equal(mapped["value"], np.arange(1000.0))
+    _, _, fresh = load_binary(path)
+    assert set(fresh) == {"value"} and fresh["value"][0] == 7.0
+    assert sorted(os.listdir(tmp_path)) == ["forest.bin"]
+
+
+def test_serving_follows_registry_current_version(tmp_path, monkeypatch):
+    root = tmp_path / "registry"
+    first = _publish_copy(root, tmp_path, "a")
+    second = _publish_copy(root, tmp_path, "b")
+    monkeypatch.setattr(predict, "REGISTRY_DIR", str(root))
+    monkeypatch.setattr(predict, "_slots", {})
+
+    path, version = predict.slot_sources()["hardness_compiled"]
+    assert path == os.path.join(second["path"], "hardness_model.bin")
+    assert version == second["version"]
+
+    assert predict.predict_hardness(SAMPLE_PAYLOAD)["ok"]
+    assert predict.slot_version("hardness") == second["version"]
+    assert predict.readiness("sklearn")["versions"]["hardness"] == second["version"]
+
+    # Rollback is one index swap; the watcher picks it up like any other change
+    watcher.start_model_watcher(interval=0.05)
+    try:
+        registry.rollback(str(root), "hardness")
+        for _ in range(100):
+            if predict.slot_version("hardness") == first["version"]:
+                break
+            watcher._watcher._stop_event.wait(0.05)
+    finally:
+        watcher.stop_model_watcher()
+    assert predict.slot_version("hardness") == first["version"]
+    assert predict.predict_hardness(SAMPLE_PAYLOAD)["ok"]
+
+    # No registry entry for oxidation: flat paths, keyed by mtime + size
+    assert predict.slot_sources()["oxidation"][0] == predict.OXIDATION_MODEL_PATH
+    predict._slots = {}
+
+
+def test_training_registers_version_with_hashes(tmp_path, monkeypatch):
+    data = tmp_path / "hardness.csv"
+    shutil.copy("data/hardness.csv", data)
+    monkeypatch.setattr(train_hardness, "DATA_PATH", str(data))
+    monkeypatch.setattr(train_hardness, "MODEL_PATH", str(tmp_path / "hardness_model.joblib"))
+    monkeypatch.setattr(train_hardness, "BINARY_PATH", str(tmp_path / "hardness_model.bin"))
+    monkeypatch.setattr(train_hardness, "META_PATH", str(tmp_path / "hardness_metadata.json"))
+    monkeypatch.setattr(train_hardness, "REGISTRY_DIR", str(tmp_path / "registry"))
+
+    train_hardness.train_hardness_model()
+
+    with open(tmp_path / "hardness_metadata.json") as f:
+        metadata = json.load(f)
+    record = registry.current(str(tmp_path / "registry"), "hardness")
+    assert metadata["data_hash"] == registry.file_digest(str(data)) == record["data_hash"]
+    assert metadata["artifacts"]["hardness_model.joblib"] == registry.file_digest(
+        str(tmp_path / "hardness_model.joblib")
+    )
+    assert set(record["artifacts"]) == {
+        "hardness_model.joblib", "hardness_model.bin", "hardness_metadata.json"
+    }
+    assert record["metrics"] == metadata["metrics"]
+
+
+def test_delta_after_rollback_builds_on_restored_version(tmp_path, monkeypatch):
+    df = pd.read_csv("data/hardness.csv")
+    data = tmp_path / "hardness.csv"
+    df.iloc[:-4].to_csv(data, index=False)
+    df.iloc[-4:-2].to_csv(tmp_path / "delta_a.csv", index=False)
+    df.iloc[-2:].to_csv(tmp_path / "delta_b.csv", index=False)
+    root = str(tmp_path / "registry")
+    monkeypatch.setattr(train_hardness, "DATA_PATH", str(data))
+    monkeypatch.setattr(train_hardness, "MODEL_PATH", str(tmp_path / "hardness_model.joblib"))
+    monkeypatch.setattr(train_hardness, "BINARY_PATH", str(tmp_path / "hardness_model.bin"))
+    monkeypatch.setattr(train_hardness, "META_PATH", str(tmp_path / "hardness_metadata.json"))
+    monkeypatch.setattr(train_hardness, "REGISTRY_DIR", root)
+
+    train_hardness.train_hardness_model()
+    base = registry.current(root, "hardness")
+    train_hardness.update_hardness_model(str(tmp_path / "delta_a.csv"), append=False)
+    registry.rollback(root, "hardness")
+
+    # The flat files still hold the delta_a model; the update must not build on it
+    train_hardness.update_hardness_model(str(tmp_path / "delta_b.csv"), append=False)
+    with open(os.path.join(base["path"], "hardness_metadata.json")) as f:
+        base_meta = json.load(f)
+    with open(tmp_path / "hardness_metadata.json") as f:
+        metadata = json.load(f)
+    digest_b = registry.file_digest(str(tmp_path / "delta_b.csv"))
+    state = metadata["incremental"]
+    assert state["n"] == base_meta["incremental"]["n"] + 2
+    assert state["deltas"] == [digest_b]
+
+    # Not appended: the CSV hash would not cover delta_b, so the hash is chained.
+    # Prequential errors sit apart from the held-out metrics the registry compares
+    assert metadata["data_hash"] == chain_data_hash(base["data_hash"], digest_b)
+    assert metadata["data_hash"] == registry.current(root, "hardness")["data_hash"]
+    assert metadata["metrics"] == base_meta["metrics"] == registry.current(root, "hardness")["metrics"]
+    assert set(metadata["update"]["delta_metrics"]) == {"MAE", "RMSE", "R2"}
+    assert metadata["update"]["delta_digest"] == digest_b and not metadata["update"]["appended"]
+
+    # delta_a is not part of the restored lineage, so it may be applied again
+    train_hardness.update_hardness_model(str(tmp_path / "delta_a.csv"), append=False)
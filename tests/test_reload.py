@@ -0,0 +1,59 @@
+# tests/test_reload.py
+import os
+import shutil
+import time
+
+import pytest
+
+from src.inference import predict, watcher
+
+SAMPLE_PAYLOAD = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8,
+}
+
+
+@pytest.fixture
+def tmp_artifacts(tmp_path, monkeypatch):
+    """Serve the hardness slot from a private copy of its artifact."""
+    path = tmp_path / "hardness_model.joblib"
+    shutil.copy(predict.HARDNESS_MODEL_PATH, path)
+    monkeypatch.setitem(predict._SLOT_PATHS, "hardness", str(path))
+    monkeypatch.setattr(predict, "REGISTRY_DIR", None)
+    monkeypatch.setattr(predict, "_slots", {})
+    yield path
+    watcher.stop_model_watcher()
+    predict._slots = {}
+
+
+def test_failed_reload_keeps_previous_model(tmp_artifacts):
+    before = predict.predict_hardness(SAMPLE_PAYLOAD)
+    old_slot = predict._slots["hardness"]
+
+    tmp_artifacts.write_bytes(b"not a pickle")
+    status = predict.reload_models(["hardness"])
+
+    assert status["hardness"] is not None
+    assert predict._slots["hardness"] is old_slot
+    assert predict.predict_hardness(SAMPLE_PAYLOAD) == before
+
+
+def test_watcher_swaps_changed_artifact(tmp_artifacts):
+    predict.predict_hardness(SAMPLE_PAYLOAD)
+    old_slot = predict._slots["hardness"]
+
+    watcher.start_model_watcher(interval=0.05)
+    os.utime(tmp_artifacts, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+    deadline = time.time() + 5
+    while predict._slots["hardness"] is old_slot and time.time() < deadline:
+        time.sleep(0.05)
+
+    new_slot = predict._slots["hardness"]
+    assert new_slot is not old_slot
+    assert new_slot.version != old_slot.version
+    assert predict.predict_hardness(SAMPLE_PAYLOAD)["ok"]
@@ -0,0 +1,46 @@
+# tests/test_startup.py
+import subprocess
+import sys
+
+from src.app.app import create_app
+from src.inference import predict
+
+
+def test_app_import_defers_pandas_and_sklearn():
+    code = (
+        "import sys, src.app.app; "
+        "print(sorted(m for m in ('pandas', 'sklearn', 'joblib') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_background_warmup_flips_readiness(monkeypatch):
+    monkeypatch.setattr(predict, "_slots", {})
+    client = create_app().test_client()
+
+    res = client.get("/readyz")
+    assert res.status_code == 503
+    assert set(res.get_json()["models"].values()) == {"not_loaded"}
+
+    thread = predict.warm_up("background")
+    assert thread is not None
+    thread.join(timeout=60)
+
+    res = client.get("/readyz")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["ready"] and data["warmup"]["state"] == "ready"
+    assert set(data["models"].values()) == {"loaded"}
+
+    # Already loaded: nothing to do
+    assert predict.warm_up("background") is None
+
+
+def test_lazy_warmup_loads_nothing(monkeypatch):
+    monkeypatch.setattr(predict, "_slots", {})
+
+    assert predict.warm_up("lazy") is None
+    assert predict._slots == {}
+    assert predict.readiness()["ready"] is False
+    assert create_app().test_client().get("/healthz").status_code == 200
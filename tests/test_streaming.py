@@ -0,0 +1,73 @@
+# tests/test_streaming.py
+import csv
+import io
+import json
+
+import pandas as pd
+
+from src.app.app import create_app
+from src.inference.streaming import stream_csv, stream_ndjson
+
+ROW = {
+    "Material": "EN-8",
+    "Current": 140,
+    "Heat_Input": 0.864,
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8
+}
+
+
+def test_stream_ndjson_chunks_keep_order():
+    rows = [dict(ROW, Current=100 + i) for i in range(7)]
+    lines = [json.dumps(r) + "\n" for r in rows]
+    lines.insert(3, "not json\n")
+
+    chunks = list(stream_ndjson(lines, chunk_size=3))
+    out = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert len(chunks) == 3
+    assert [o["row"] for o in out] == list(range(8))
+    assert out[3]["hardness"] is None and out[3]["hardness_error"]
+    assert all(o["hardness"] is not None for i, o in enumerate(out) if i != 3)
+
+
+def test_stream_csv_matches_input_rows():
+    df = pd.read_csv("data/oxidation.csv")
+    text = df.to_csv(index=False)
+
+    body = "".join(stream_csv(io.StringIO(text), chunk_size=4))
+    out = list(csv.DictReader(io.StringIO(body)))
+
+    assert len(out) == len(df)
+    assert list(out[0])[: len(df.columns)] == list(df.columns)
+    assert [r["Material"] for r in out] == list(df["Material"])
+
+
+def test_api_predict_stream_csv():
+    app = create_app()
+    client = app.test_client()
+    text = "Material,Current,Heat_Input,Soaking_Time,Carbon,Manganese\n" \
+           "EN-8,140,0.864,10,0.37,0.8\nEN-8,abc,0.864,10,0.37,0.8\n"
+
+    res = client.post("/api/v1/predict/stream", data=text, content_type="text/csv")
+    assert res.status_code == 200
+    assert res.mimetype == "text/csv"
+    out = list(csv.DictReader(io.StringIO(res.get_data(as_text=True))))
+    assert len(out) == 2
+    assert out[0]["hardness"] and not out[0]["hardness_error"]
+    assert out[1]["hardness_error"]
+
+
+def test_api_predict_stream_ndjson():
+    app = create_app()
+    client = app.test_client()
+    data = "\n".join(json.dumps(ROW) for _ in range(3))
+
+    res = client.post("/api/v1/predict/stream?format=ndjson", data=data)
+    assert res.status_code == 200
+    out = [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+    assert [o["row"] for o in out] == [0, 1, 2]
+
+    res = client.post("/api/v1/predict/stream?format=xml", data=data)
+    assert res.status_code == 400
@@ -0,0 +1,100 @@
+# tests/test_sweep.py
+import json
+
+import numpy as np
+import pytest
+
+from src.app.app import create_app
+from src.inference.predict import predict_all
+from src.inference.sweep import SweepTooLarge, parse_sweep, run_sweep, stream_sweep
+from src.inference.validator import ValidationError
+
+FIXED = {
+    "Material": "EN-8",
+    "Soaking_Time": 10,
+    "Carbon": 0.37,
+    "Manganese": 0.8
+}
+
+AXES = {
+    "Current": {"min": 100, "max": 180, "steps": 5},
+    "Heat_Input": [0.5, 0.864, 1.2],
+}
+
+
+@pytest.mark.parametrize("backend", ["sklearn", "numpy", "compiled"])
+def test_sweep_matches_single_predictions(backend):
+    result = run_sweep(parse_sweep({"fixed": FIXED, "axes": AXES}), backend=backend)
+
+    assert result["shape"] == [5, 3] and not result["downsampled"]
+    currents, heat_inputs = (a["values"] for a in result["axes"])
+    for i, current in enumerate(currents):
+        for j, heat_input in enumerate(heat_inputs):
+            single = predict_all(dict(FIXED, Current=current, Heat_Input=heat_input), backend)
+            assert result["hardness"][i][j] == pytest.approx(single["hardness"]["prediction"])
+            assert result["oxidation"][i][j] == pytest.approx(single["oxidation"]["prediction"])
+
+
+def test_sweep_broadcasts_unused_axis_and_reports_missing_inputs():
+    fixed = {k: v for k, v in FIXED.items() if k != "Soaking_Time"}
+    axes = {"Current": [120, 160], "Heat_Input": [0.864], "Material": ["en-8", "Mild Steel"]}
+    result = run_sweep(parse_sweep({"fixed": fixed, "axes": axes}))
+
+    assert [a["name"] for a in result["axes"]] == ["Material", "Current", "Heat_Input"]
+    assert np.array(result["hardness"]).shape == (2, 2, 1)
+    assert result["oxidation"] is None
+    assert result["oxidation_error"] == "Missing required value for 'Soaking_Time'."
+
+    # Hardness ignores Soaking_Time: sweeping it gives identical planes
+    result = run_sweep(parse_sweep({"fixed": FIXED, "axes": dict(AXES, Soaking_Time=[5, 20])}))
+    hardness = np.array(result["hardness"])
+    assert np.array_equal(hardness[:, :, 0], hardness[:, :, 1])
+
+
+def test_sweep_downsamples_large_grids():
+    axes = {"Current": {"min": 100, "max": 180, "steps": 1000},
+            "Heat_Input": {"min": 0.5, "max": 1.2, "steps": 1000}}
+    result = run_sweep(parse_sweep({"fixed": FIXED, "axes": axes}), max_points=2500)
+
+    assert result["downsampled"] and result["requested_shape"] == [1000, 1000]
+    assert np.prod(result["shape"]) <= 2500
+    currents = result["axes"][0]["values"]
+    assert currents[0] == 100 and currents[-1] == 180
+
+
+def test_parse_sweep_rejects_bad_requests():
+    with pytest.raises(ValidationError):
+        parse_sweep({"fixed": FIXED, "axes": {"Voltage": [1, 2]}})
+    with pytest.raises(ValidationError):
+        parse_sweep({"fixed": FIXED, "axes": {"Current": {"min": 1, "max": 2}}})
+    with pytest.raises(SweepTooLarge):
+        parse_sweep({"fixed": FIXED, "axes": AXES}, max_points=10)
+
+
+def test_stream_sweep_covers_every_point():
+    spec = parse_sweep({"fixed": FIXED, "axes": AXES})
+    lines = "".join(stream_sweep(spec, chunk_size=4)).splitlines()
+    rows = [json.loads(line) for line in lines]
+    dense = run_sweep(spec)
+
+    assert [r["point"] for r in rows] == list(range(15))
+    assert rows[4]["Current"] == 120 and rows[4]["Heat_Input"] == 0.864
+    assert rows[4]["hardness"] == pytest.approx(dense["hardness"][1][1])
+    assert rows[4]["oxidation"] == pytest.approx(dense["oxidation"][1][1])
+
+
+def test_api_sweep():
+    app = create_app()
+    client = app.test_client()
+
+    res = client.post("/api/v1/sweep", json={"fixed": FIXED, "axes": AXES, "max_points": 6})
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body["downsampled"] and np.prod(body["shape"]) <= 6
+
+    res = client.post("/api/v1/sweep/stream", json={"fixed": FIXED, "axes": AXES})
+    assert res.status_code == 200
+    assert len(res.get_data(as_text=True).splitlines()) == 15
+
+    res = client.post("/api/v1/sweep", json={"fixed": FIXED, "axes": {"Current": "lots"}})
+    assert res.status_code == 400
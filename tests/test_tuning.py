@@ -0,0 +1,53 @@
+# tests/test_tuning.py
+import json
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+
+from src.inference.forest import CompiledForest
+from src.inference.linear import FoldedLinearModel
+from src.models.pipelines import (
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    build_hardness_pipeline,
+    build_oxidation_pipeline,
+)
+from src.models.tuning import HARDNESS_SEARCH_SPACE, tune_pipeline
+
+
+def test_tune_hardness_records_search():
+    df = pd.read_csv("data/hardness.csv")
+    X, y = df[HARDNESS_FEATURES], df["Hardness"]
+
+    best, summary = tune_pipeline(build_hardness_pipeline(), HARDNESS_SEARCH_SPACE, X, y, n_jobs=1)
+
+    assert best.memory is None
+    assert summary["n_candidates"] == 9
+    assert summary["best_params"]["model"] in ("LinearRegression", "Ridge", "Lasso")
+    assert len(summary["results"]) >= summary["n_candidates"]
+    json.dumps(summary)
+
+    # Whatever wins must still export to the compiled backend
+    folded = FoldedLinearModel.from_pipeline(best)
+    np.testing.assert_allclose(folded.predict(X), best.predict(X), rtol=1e-9)
+
+
+def test_successive_halving_eliminates_forest_candidates():
+    df = pd.read_csv("data/oxidation.csv")
+    X, y = df[OXIDATION_FEATURES], df["Oxidation_Rate"]
+    space = [
+        {"model": [RandomForestRegressor(n_estimators=5, random_state=0)],
+         "model__min_samples_leaf": [1, 2, 4]},
+        {"model": [ExtraTreesRegressor(n_estimators=5, random_state=0)],
+         "model__min_samples_leaf": [1, 2, 4]},
+    ]
+
+    best, summary = tune_pipeline(build_oxidation_pipeline(), space, X, y, n_jobs=1)
+
+    assert summary["n_iterations"] >= 2
+    last = [r for r in summary["results"] if r["iteration"] == summary["n_iterations"] - 1]
+    assert len(last) < summary["n_candidates"]
+
+    compiled = CompiledForest.from_pipeline(best)
+    assert np.array_equal(compiled.predict(X), best.predict(X))
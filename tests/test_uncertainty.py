@@ -0,0 +1,103 @@
+# tests/test_uncertainty.py
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.app import create_app
+from src.inference import modelfile
+from src.inference.predict import (
+    HARDNESS_BINARY_PATH,
+    HARDNESS_MODEL_PATH,
+    OXIDATION_MODEL_PATH,
+    predict_all_batch,
+)
+from src.inference.uncertainty import (
+    UncertaintyUnavailable,
+    predict_interval,
+    t_quantile,
+)
+from src.models.pipelines import HARDNESS_FEATURES, OXIDATION_FEATURES
+
+
+def test_forest_interval_matches_per_tree_reference():
+    pipeline = joblib.load(OXIDATION_MODEL_PATH)
+    df = pd.read_csv("data/oxidation.csv")[OXIDATION_FEATURES]
+
+    stats = predict_interval(pipeline, df, level=0.8)
+
+    X = pipeline[:-1].transform(df)
+    per_tree = np.stack([t.predict(X) for t in pipeline.steps[-1][1].estimators_])
+    np.testing.assert_array_equal(stats["prediction"], pipeline.predict(df))
+    np.testing.assert_allclose(stats["std"], per_tree.std(axis=0))
+    np.testing.assert_allclose(stats["lower"], np.quantile(per_tree, 0.1, axis=0))
+    np.testing.assert_allclose(stats["upper"], np.quantile(per_tree, 0.9, axis=0))
+
+
+def test_linear_interval_is_ols_prediction_interval():
+    pipeline = joblib.load(HARDNESS_MODEL_PATH)
+    df = pd.read_csv("data/hardness.csv")[HARDNESS_FEATURES]
+
+    stats = predict_interval(pipeline, df, level=0.95)
+    half = stats["upper"] - stats["prediction"]
+
+    np.testing.assert_allclose(stats["prediction"] - stats["lower"], half)
+    np.testing.assert_allclose(half, t_quantile(0.975, pipeline.steps[-1][1].residuals_["dof"]) * stats["std"])
+    assert np.all(stats["std"] >= pipeline.steps[-1][1].residuals_["std"])
+
+    # Extrapolating far outside the training range widens the interval
+    far = df.head(1).assign(Current=1000.0)
+    assert predict_interval(pipeline, far)["std"][0] > 3 * stats["std"].max()
+
+    # The compiled artifact carries the same statistics
+    compiled = predict_interval(modelfile.load(HARDNESS_BINARY_PATH), df, level=0.95)
+    np.testing.assert_allclose(compiled["upper"], stats["upper"])
+
+
+def test_t_quantile_matches_tables():
+    assert t_quantile(0.975, 8) == pytest.approx(2.306, abs=1e-3)
+    assert t_quantile(0.95, 30) == pytest.approx(1.697, abs=1e-3)
+    assert t_quantile(0.975, 10_000) == pytest.approx(1.960, abs=1e-3)
+
+
+def test_model_without_residuals_reports_unavailable():
+    model = modelfile.load(HARDNESS_BINARY_PATH)
+    model.residuals_ = None
+    df = pd.read_csv("data/hardness.csv")[HARDNESS_FEATURES]
+
+    with pytest.raises(UncertaintyUnavailable):
+        predict_interval(model, df)
+
+
+@pytest.mark.parametrize("backend", ["sklearn", "numpy", "compiled"])
+def test_batch_intervals_on_every_backend(backend):
+    rows = pd.read_csv("data/oxidation.csv").head(5).to_dict("records") + [{"Material": "X"}]
+    plain = predict_all_batch(rows, backend)
+    results = predict_all_batch(rows, backend, level=0.9)
+
+    for p, r in zip(plain[:-1], results[:-1]):
+        for name in ("hardness", "oxidation"):
+            lower, upper = r[name]["interval"]
+            assert r[name]["prediction"] == pytest.approx(p[name]["prediction"])
+            assert lower <= r[name]["prediction"] <= upper
+            assert r[name]["std"] >= 0
+    assert not results[-1]["hardness"]["ok"]
+
+
+def test_api_predict_uncertainty():
+    app = create_app()
+    client = app.test_client()
+    row = pd.read_csv("data/oxidation.csv").head(1).to_dict("records")[0]
+
+    res = client.post("/api/v1/predict?uncertainty=0.8", json=row)
+    assert res.status_code == 200
+    body = res.get_json()
+    assert body["hardness_interval"][0] < body["hardness"] < body["hardness_interval"][1]
+    assert body["oxidation_std"] >= 0
+
+    res = client.post("/api/v1/predict/batch?uncertainty", json=[row, row])
+    assert res.status_code == 200
+    assert all("oxidation_interval" in r for r in res.get_json()["results"])
+
+    assert "hardness_interval" not in client.post("/api/v1/predict", json=row).get_json()
+    assert client.post("/api/v1/predict?uncertainty=1.5", json=row).status_code == 400
@@ -0,0 +1,93 @@
+# tests/test_validator.py
+import numpy as np
+import pandas as pd
+
+from src.inference.validator import (
+    HARDNESS_FEATURES,
+    OXIDATION_FEATURES,
+    ValidationError,
+    validate_columns,
+    validate_numeric,
+    validate_oxidation_input,
+)
+
+
+def _scalar_error(row):
+    try:
+        validate_oxidation_input(row)
+    except ValidationError as ve:
+        return str(ve)
+    return None
+
+
+def test_validate_columns_matches_scalar_validator():
+    rows = [
+        {"Material": " en-8 ", "Current": "140", "Heat_Input": 0.864,
+         "Soaking_Time": 10, "Carbon": 0.37, "Manganese": 0.8},
+        {"Material": "Brass", "Current": 140, "Heat_Input": 0.864,
+         "Soaking_Time": 10, "Carbon": 0.37, "Manganese": 0.8},
+        {"Material": "Mild Steel", "Current": "abc", "Heat_Input": 0.864,
+         "Soaking_Time": "", "Carbon": 0.37, "Manganese": 0.8},
+        {"Material": "", "Current": 140},
+        {"Material": "EN-8", "Current": float("nan"), "Heat_Input": 0.864,
+         "Soaking_Time": 10, "Carbon": 0.37, "Manganese": 0.8},
+        {"Material": "EN-8", "Current": 140, "Heat_Input": "nan",
+         "Soaking_Time": 10, "Carbon": 0.37, "Manganese": 0.8},
+    ]
+    frame, mask, errors = validate_columns(rows, OXIDATION_FEATURES)
+
+    assert list(frame.columns) == OXIDATION_FEATURES
+    assert mask.tolist() == [False, True, True, True, True, True]
+    assert errors == [_scalar_error(r) for r in rows]
+    assert frame.loc[0, "Material"] == "EN-8"
+    assert frame.loc[0, "Current"] == 140.0
+
+
+def test_validate_columns_accepts_dict_of_lists_and_structured_array():
+    columns = {
+        "Material": ["EN-8", "mild steel"],
+        "Current": [120.0, 130.0],
+        "Heat_Input": [0.8, 0.83],
+        "Carbon": [0.37, 0.2],
+        "Manganese": [0.8, 0.6],
+    }
+    frame, mask, _ = validate_columns(columns, HARDNESS_FEATURES)
+    assert not mask.any()
+    assert frame["Material"].tolist() == ["EN-8", "Mild Steel"]
+
+    structured = pd.DataFrame(columns).to_records(index=False)
+    frame2, mask2, _ = validate_columns(np.asarray(structured), HARDNESS_FEATURES)
+    assert not mask2.any()
+    pd.testing.assert_frame_equal(frame, frame2)
+
+
+def test_feature_lists_match_pipelines():
+    from src.models import pipelines
+
+    assert HARDNESS_FEATURES == pipelines.HARDNESS_FEATURES
+    assert OXIDATION_FEATURES == pipelines.OXIDATION_FEATURES
+
+
+def test_scalar_and_columnar_numeric_rules_agree():
+    values = [
+        "1_000", "\u0661\u0662", " 10 ", "1e3", "-inf", "0x10", "abc", "", " NaN ",
+        float("nan"), None, True, 7, 2.5, complex(1, 2), np.complex128(3 + 0j), "1+2j",
+    ]
+
+    def scalar(value):
+        try:
+            return validate_numeric("Current", value), None
+        except ValidationError as ve:
+            return None, str(ve)
+
+    frame, mask, errors = validate_columns({"Current": values}, ["Current"])
+    for i, value in enumerate(values):
+        expected, error = scalar(value)
+        assert errors[i] == error, value
+        assert mask[i] == (error is not None)
+        if error is None:
+            assert frame["Current"][i] == expected, value
+
+    # All-complex columns (complex dtype) are rejected the same way
+    _, mask, errors = validate_columns({"Current": np.array([1 + 2j])}, ["Current"])
+    assert errors == [scalar(np.complex128(1 + 2j))[1]] and mask.all()